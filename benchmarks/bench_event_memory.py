@@ -0,0 +1,88 @@
+"""Memory benchmark: resident bytes per parsed event, before and after slotted events.
+
+"before" replays the previous event layout (a frozen dataclass with a per-instance
+``__dict__`` that always keeps ``raw``). Run with
+``python benchmarks/bench_event_memory.py [--lines N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator
+
+from triage_toolkit.parser import ParseOptions, parse_lines_with_summary
+
+
+@dataclass(frozen=True)
+class _DictLogEvent:
+    timestamp: datetime
+    level: str
+    component: str
+    message: str
+    correlation_id: str | None
+    raw: str
+    source_timestamp: str | None = None
+    source_offset: str | None = None
+
+
+def _lines(count: int) -> Iterator[str]:
+    # Generated lazily, like lines read from a file, so only what events retain is counted.
+    for index in range(count):
+        yield (
+            f"2025-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z ERROR api: "
+            f"request {index} failed upstream=payments cid=c-{index}"
+        )
+
+
+def _as_legacy(count: int) -> list[_DictLogEvent]:
+    events, _ = parse_lines_with_summary(_lines(count), ParseOptions(keep_raw=True))
+    return [
+        _DictLogEvent(
+            event.timestamp,
+            event.level,
+            event.component,
+            event.message,
+            event.correlation_id,
+            event.raw or "",
+            event.source_timestamp,
+            event.source_offset,
+        )
+        for event in events
+    ]
+
+
+def _bytes_per_event(build: Callable[[], list], count: int) -> float:
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    events = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(events) == count
+    return (current - baseline) / count
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=100_000)
+    args = argparser.parse_args()
+
+    def _parse(keep_raw: bool) -> Callable[[], list]:
+        options = ParseOptions(keep_raw=keep_raw)
+        return lambda: parse_lines_with_summary(_lines(args.lines), options)[0]
+
+    results = {
+        "before (dict, raw)": _bytes_per_event(lambda: _as_legacy(args.lines), args.lines),
+        "slots, --keep-raw": _bytes_per_event(_parse(True), args.lines),
+        "slots, --no-keep-raw": _bytes_per_event(_parse(False), args.lines),
+    }
+    before = results["before (dict, raw)"]
+    print(f"{'layout':<22} {'bytes/event':>12} {'vs before':>10}")
+    for name, value in results.items():
+        print(f"{name:<22} {value:>12,.0f} {value / before:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
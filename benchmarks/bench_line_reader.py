@@ -0,0 +1,49 @@
+"""Macro-benchmark: parse throughput of the text-mode and mmap line readers.
+
+Run with ``python benchmarks/bench_line_reader.py [--lines N]``. The "blank-heavy" input
+shows the mmap reader counting blank lines at the byte level instead of parsing them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from triage_toolkit.parser import ParseOptions, parse_file_with_summary
+
+
+def _write_log(path: Path, count: int, blank_lines: int) -> None:
+    padding = "\n" * blank_lines
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(count):
+            handle.write(
+                f"2025-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z INFO api: "
+                f"request {index} done cid=c-{index}\n{padding}"
+            )
+
+
+def _seconds(path: Path, reader: str) -> float:
+    started = time.perf_counter()
+    parse_file_with_summary(path, options=ParseOptions(reader=reader))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=200_000)
+    args = argparser.parse_args()
+
+    print(f"{'input':<12} {'text s':>8} {'mmap s':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, blank_lines in (("dense", 0), ("blank-heavy", 4)):
+            path = Path(tmp) / f"{name}.log"
+            _write_log(path, args.lines, blank_lines)
+            text = _seconds(path, "text")
+            mapped = _seconds(path, "mmap")
+            print(f"{name:<12} {text:>8.2f} {mapped:>8.2f} {text / mapped:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Micro-benchmark: timestamp parsing throughput, cascade vs per-source sniffed parser.
+
+Run with ``python benchmarks/bench_timestamps.py [--lines N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from triage_toolkit.utils import TimestampParser, parse_timestamp
+
+_SHAPES: dict[str, Callable[[datetime], str]] = {
+    "iso-z": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    "iso-millis-offset": lambda dt: (
+        dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}+02:00"
+    ),
+    "space-micros": lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S.%f"),
+    "space-naive": lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S"),
+}
+
+
+def _values(shape: Callable[[datetime], str], count: int) -> list[str]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [shape(start + timedelta(microseconds=index * 1_337)) for index in range(count)]
+
+
+def _lines_per_second(parse: Callable[[str], datetime | None], values: list[str]) -> float:
+    started = time.perf_counter()
+    for value in values:
+        parse(value)
+    return len(values) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=200_000)
+    args = argparser.parse_args()
+
+    print(f"{'shape':<20} {'cascade/s':>12} {'sniffed/s':>12} {'speedup':>8}")
+    for name, shape in _SHAPES.items():
+        values = _values(shape, args.lines)
+        before = _lines_per_second(parse_timestamp, values)
+        after = _lines_per_second(TimestampParser(), values)
+        print(f"{name:<20} {before:>12,.0f} {after:>12,.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
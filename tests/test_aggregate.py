@@ -0,0 +1,93 @@
+from triage_toolkit.aggregate import IncidentAggregator
+from triage_toolkit.batch import EventBatch
+from triage_toolkit.parser import parse_line
+
+LINES = [
+    "2025-01-01T00:00:05Z ERROR api: timeout after 30s cid=a-1",
+    "2025-01-01T00:00:01Z INFO api: started cid=a-2",
+    "2025-01-01T00:00:05Z CRITICAL db: pool exhausted",
+    "2025-01-01T00:00:03Z WARN worker: saw error in job 7",
+    "2025-01-01T00:00:09Z ERROR api: timeout after 12s",
+    "2025-01-01T00:00:02Z ERROR db: pool exhausted",
+]
+
+
+def _state(aggregator):
+    return (
+        aggregator.event_count,
+        aggregator.error_count,
+        aggregator.level_error_count,
+        aggregator.correlated_count,
+        aggregator.start_us,
+        aggregator.end_us,
+        dict(aggregator.component_counts),
+        dict(aggregator.error_message_counts),
+        aggregator.error_signatures(),
+        aggregator.top_error_components(5),
+    )
+
+
+def test_add_and_add_batch_agree_for_any_arrival_order():
+    events = [parse_line(line) for line in LINES]
+    from_batch = IncidentAggregator()
+    from_batch.add_batch(EventBatch.from_events(events))
+
+    reversed_order = IncidentAggregator()
+    for index in reversed(range(len(events))):
+        reversed_order.add(events[index], 0, index)
+
+    assert _state(reversed_order) == _state(from_batch)
+    assert from_batch.error_count == 5
+    assert from_batch.level_error_count == 3
+    assert from_batch.correlated_count == 2
+    # Equal counts rank by first occurrence in timeline order.
+    assert [signature for signature, *_ in from_batch.error_signatures()] == [
+        "pool exhausted",
+        "saw error in job #",
+        "timeout after #s cid=<id>",
+        "timeout after #s",
+    ]
+    # db and api both have two errors; db's first error (00:00:02) comes first.
+    assert from_batch.top_error_components(2) == [("db", 2), ("api", 2)]
+
+
+def test_window_spans_earliest_and_latest_events():
+    aggregator = IncidentAggregator()
+    aggregator.add_batch(EventBatch.from_events([parse_line(line) for line in LINES]))
+
+    first = parse_line("2025-01-01T00:00:01Z INFO api: x")
+    last = parse_line("2025-01-01T00:00:09Z INFO api: x")
+    assert (aggregator.start_us, aggregator.end_us) == (
+        EventBatch.from_events([first]).timestamps[0],
+        EventBatch.from_events([last]).timestamps[0],
+    )
+
+
+def test_approx_bounds_signature_and_component_groups():
+    lines = [
+        f"2025-01-01T00:00:{second:02d}Z ERROR svc{second}: failure {chr(97 + second)}"
+        for second in range(10)
+    ]
+    lines += ["2025-01-01T00:00:30Z ERROR api: timeout"] * 5
+    batch = EventBatch.from_events([parse_line(line) for line in lines])
+    aggregator = IncidentAggregator(approx_capacity=3)
+    aggregator.add_batch(batch)
+
+    assert len(aggregator._signatures) == len(aggregator._error_components) == 3
+    assert aggregator.signature_counts.evictions == 8
+    text, count, first_us, last_us = aggregator.error_signatures()[0]
+    assert text == "timeout"
+    assert 5 <= count <= 5 + aggregator.signature_counts.max_error
+    assert first_us == last_us == batch.timestamps[-1]
+    assert aggregator.top_error_components(1)[0][0] == "api"
+
+
+def test_without_error_grouping_only_summary_counts_are_kept():
+    aggregator = IncidentAggregator(group_errors=False)
+    aggregator.add_batch(EventBatch.from_events([parse_line(line) for line in LINES]))
+    aggregator.add(parse_line(LINES[0]))
+
+    assert aggregator.level_error_count == 4
+    assert aggregator.error_count == 0
+    assert aggregator.error_signatures() == []
+    assert aggregator.normalizer.cache_stats()["misses"] == 0
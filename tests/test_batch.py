@@ -0,0 +1,108 @@
+import io
+import pickle
+from pathlib import Path
+
+import pytest
+
+from triage_toolkit.batch import EventBatch
+from triage_toolkit.parser import parse_line
+from triage_toolkit.runbook import build_runbook
+from triage_toolkit.timeline import build_timeline, error_mask, is_error
+
+GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
+
+
+def _golden_events():
+    lines = (GOLDEN_DIR / "mixed_input.log").read_text(encoding="utf-8").splitlines()
+    return [event for event in (parse_line(line) for line in lines) if event]
+
+
+def test_batch_round_trips_events_and_survives_pickling():
+    events = _golden_events()
+    batch = EventBatch.from_events(events)
+
+    assert len(batch) == len(events)
+    assert list(batch) == events
+    assert list(pickle.loads(pickle.dumps(batch))) == events
+    assert len(batch.components) < len(events)
+
+
+def test_batch_consumers_match_list_consumers():
+    events = _golden_events()
+    batch = EventBatch.from_events(events)
+
+    assert build_timeline(batch) == build_timeline(events)
+    assert build_runbook(batch, "Incident: Golden") == build_runbook(events, "Incident: Golden")
+
+
+def test_error_mask_matches_is_error_including_length_changing_lowercase():
+    lines = [
+        "2025-01-01T00:00:01Z INFO api: İstanbul ok",
+        "2025-01-01T00:00:02Z INFO api: upstream ERROR",
+        "2025-01-01T00:00:03Z fatal db: down",
+        "2025-01-01T00:00:04Z INFO web: err",
+        "2025-01-01T00:00:05Z INFO web: or spanning",
+    ]
+    events = [parse_line(line) for line in lines]
+    batch = EventBatch.from_events(events)
+
+    assert list(error_mask(batch)) == [int(is_error(event)) for event in events]
+    ascii_only = EventBatch.from_events(events[1:])
+    assert list(error_mask(ascii_only)) == [int(is_error(event)) for event in events[1:]]
+
+
+def test_batch_sorted_indices_and_component_counts_keep_first_seen_order():
+    lines = [
+        "2025-01-01T00:00:03Z ERROR db: c",
+        "2025-01-01T00:00:01Z ERROR api: a",
+        "2025-01-01T00:00:01Z ERROR db: b",
+    ]
+    batch = EventBatch.from_events(parse_line(line) for line in lines)
+
+    order = batch.sorted_indices()
+
+    assert order == [1, 2, 0]
+    assert list(batch.component_counts(order).items()) == [("api", 1), ("db", 2)]
+    assert batch.message(2) == "b"
+
+
+def test_batch_dump_and_load_round_trip_binary_columns():
+    events = _golden_events()
+    batch = EventBatch.from_events(events)
+    buffer = io.BytesIO()
+
+    batch.dump(buffer)
+    buffer.seek(0)
+    loaded = EventBatch.load(buffer)
+
+    assert list(loaded) == events
+    assert loaded.components == batch.components
+    with pytest.raises(ValueError):
+        EventBatch.load(io.BytesIO(buffer.getvalue()[:-3]))
+    with pytest.raises(ValueError):
+        EventBatch.load(io.BytesIO(b"not a batch"))
+
+
+def test_extend_batch_matches_appending_events():
+    events = _golden_events()
+    half = len(events) // 2
+    batch = EventBatch.from_events(events[half:])
+
+    combined = EventBatch.from_events(events[:half])
+    combined.extend_batch(batch)
+
+    assert list(combined) == events
+    assert combined.components == EventBatch.from_events(events).components
+
+
+@pytest.mark.parametrize("level_count", [3, 300])
+def test_rows_with_levels_with_few_and_many_distinct_levels(level_count):
+    levels = [f"L{index}" for index in range(level_count - 1)] + ["error"]
+    events = [
+        parse_line(f"2025-01-01T00:00:01Z {levels[index % level_count]} api: m{index}")
+        for index in range(level_count * 2)
+    ]
+    batch = EventBatch.from_events(events)
+
+    expected = [int(event.level.upper() == "ERROR") for event in events]
+    assert list(batch.rows_with_levels({"ERROR"})) == expected
@@ -0,0 +1,124 @@
+import os
+
+from triage_toolkit.batch import EventBatch
+import triage_toolkit.cache as cache_module
+from triage_toolkit.cache import (
+    CachedParseWriter,
+    evict_cached_parses,
+    iter_cached_parse,
+    load_cached_correlation_index,
+    load_cached_parse,
+    parse_cache_dir,
+    parse_cache_key,
+    store_cached_correlation_index,
+    store_cached_parse,
+)
+from triage_toolkit.correlation import CorrelationIndex
+from triage_toolkit.parser import ParseOptions, parse_file_with_summary
+
+
+def _store(path, options=None):
+    options = options or ParseOptions()
+    key = parse_cache_key(path, options, "1.0.0")
+    events, summary = parse_file_with_summary(path, options=options)
+    store_cached_parse(key, EventBatch.from_events(events), summary)
+    return key, events, summary
+
+
+def test_cached_parse_round_trips_events_and_summary(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z ERROR api: boom cid=c-1\nnoise\n", encoding="utf-8")
+
+    key, events, summary = _store(sample)
+
+    batch, cached_summary = load_cached_parse(parse_cache_key(sample, ParseOptions(), "1.0.0"))
+    assert list(batch) == events
+    assert cached_summary == summary
+    assert parse_cache_key(sample, ParseOptions(), "2.0.0").name != key.name
+    assert parse_cache_key(sample, ParseOptions(keep_raw=False), "1.0.0").name != key.name
+    assert parse_cache_key(sample, ParseOptions(verbose_stats=True), "1.0.0") is None
+    windowed = ParseOptions(since=events[0].timestamp)
+    assert parse_cache_key(sample, windowed, "1.0.0").name != key.name
+
+
+def test_cache_misses_after_content_changes(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n", encoding="utf-8")
+    key, _, _ = _store(sample)
+    stat = sample.stat()
+
+    # Same size and mtime, different bytes: the sampled digests tell.
+    sample.write_text("2025-01-01T00:00:01Z INFO api: two\n", encoding="utf-8")
+    os.utime(sample, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    changed = parse_cache_key(sample, ParseOptions(), "1.0.0")
+    assert changed.name != key.name
+    assert load_cached_parse(changed) is None
+
+
+def test_corrupt_entries_are_discarded(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n", encoding="utf-8")
+    key, _, _ = _store(sample)
+    entry = next(parse_cache_dir().iterdir())
+    entry.write_bytes(entry.read_bytes()[:-3])
+
+    assert load_cached_parse(key) is None
+    assert not entry.exists()
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path):
+    keys = []
+    for index in range(3):
+        sample = tmp_path / f"app{index}.log"
+        sample.write_text(f"2025-01-01T00:00:0{index}Z INFO api: {index}\n", encoding="utf-8")
+        keys.append(_store(sample)[0])
+    entries = sorted(parse_cache_dir().iterdir())
+    for age, entry in enumerate(entries):
+        os.utime(entry, ns=(0, age * 10**9))
+    # Loading an entry marks it as recently used.
+    oldest = min(keys, key=lambda key: (parse_cache_dir() / f"{key.name}.parse").stat().st_mtime_ns)
+    assert load_cached_parse(oldest) is not None
+
+    evict_cached_parses(max(entry.stat().st_size for entry in entries))
+
+    assert [entry.name for entry in parse_cache_dir().iterdir()] == [f"{oldest.name}.parse"]
+
+
+def test_correlation_index_is_stored_and_evicted_with_its_entry(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z ERROR api: boom cid=c-1\n", encoding="utf-8")
+    key, events, _ = _store(sample)
+    assert load_cached_correlation_index(key) is None
+
+    store_cached_correlation_index(key, CorrelationIndex.from_batch(EventBatch.from_events(events)))
+
+    assert load_cached_correlation_index(key).errors == {"c-1": 1}
+    evict_cached_parses(0)
+    assert list(parse_cache_dir().iterdir()) == []
+
+
+def test_streamed_entries_are_written_and_read_in_segments(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "".join(f"2025-01-01T00:00:0{index}Z INFO api: line {index}\n" for index in range(5)),
+        encoding="utf-8",
+    )
+    events, summary = parse_file_with_summary(sample, options=ParseOptions())
+    monkeypatch.setattr(cache_module, "_SEGMENT_ROWS", 2)
+    key = parse_cache_key(sample, ParseOptions(), "1.0.0")
+
+    aborted = CachedParseWriter(key)
+    aborted.append(events[0])
+    aborted.abort()
+    assert list(parse_cache_dir().iterdir()) == []
+    writer = CachedParseWriter(key)
+    for event in events:
+        writer.append(event)
+    writer.finish(summary)
+
+    batch, cached_summary = load_cached_parse(key)
+    streamed, streamed_summary = iter_cached_parse(key)
+    assert list(batch) == list(streamed) == events
+    assert cached_summary == streamed_summary == summary
+    assert [entry.suffix for entry in parse_cache_dir().iterdir()] == [".parse"]
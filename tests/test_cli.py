@@ -1,3 +1,4 @@
+import gzip
 import json
 from importlib.metadata import PackageNotFoundError, version as package_version
 from pathlib import Path
@@ -7,7 +8,9 @@ from typer.testing import CliRunner
 
 import triage_toolkit.cli as cli_module
 from triage_toolkit import __version__
+from triage_toolkit.cache import parse_cache_dir
 from triage_toolkit.cli import app
+from triage_toolkit.utils import cache_dir
 
 runner = CliRunner()
 GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
@@ -166,10 +169,10 @@ def test_parse_utf8_decode_error(tmp_path):
 def test_parse_permission_error(monkeypatch, tmp_path):
     sample = tmp_path / "sample.log"
 
-    def _raise_permission(_path):
+    def _raise_permission(_path, _summary, _options=None):
         raise PermissionError("denied")
 
-    monkeypatch.setattr(cli_module, "parse_file_with_summary", _raise_permission)
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", _raise_permission)
 
     result = runner.invoke(app, ["parse", str(sample), "--out", "-"])
 
@@ -180,10 +183,10 @@ def test_parse_permission_error(monkeypatch, tmp_path):
 def test_parse_generic_read_os_error(monkeypatch, tmp_path):
     sample = tmp_path / "sample.log"
 
-    def _raise_os_error(_path):
+    def _raise_os_error(_path, _summary, _options=None):
         raise OSError("i/o exploded")
 
-    monkeypatch.setattr(cli_module, "parse_file_with_summary", _raise_os_error)
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", _raise_os_error)
 
     result = runner.invoke(app, ["parse", str(sample), "--out", "-"])
 
@@ -624,3 +627,667 @@ def test_version_flag():
 
     assert result.exit_code == 0
     assert result.stdout.strip() == _expected_version()
+
+
+def test_parse_falls_back_to_full_sort_for_heavily_disordered_source(monkeypatch, tmp_path):
+    sample = tmp_path / "shuffled.log"
+    sample.write_text(
+        "\n".join(
+            [
+                "2025-01-01T00:00:09Z INFO api: late",
+                "2025-01-01T00:00:08Z INFO api: mid",
+                "2025-01-01T00:00:01Z INFO api: early",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    bounded = cli_module.merge_event_streams
+    monkeypatch.setattr(
+        cli_module,
+        "merge_event_streams",
+        lambda streams: bounded(streams, reorder_window=1),
+    )
+
+    parsed = []
+    original = cli_module.iter_file_events_with_summary
+
+    def _counting(*args, **kwargs):
+        parsed.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", _counting)
+
+    result = runner.invoke(app, ["parse", str(sample), "--out", "-"])
+
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout)
+    assert [event["message"] for event in payload["events"]] == ["early", "mid", "late"]
+    assert payload["parse_summary"]["total_lines"] == 3
+    # The restarted sort reads the cache entry the first pass finished.
+    assert parsed == [sample]
+
+    timeline = runner.invoke(app, ["timeline", str(sample), "--out", "-", "--no-cache"])
+    assert timeline.exit_code == 0
+    assert timeline.stdout.count("# Incident Timeline") == 1
+    rows = [line for line in timeline.stdout.splitlines() if "| api |" in line]
+    assert [row.split(" | ")[-1] for row in rows] == ["early |", "mid |", "late |"]
+
+
+def test_parse_with_jobs_matches_serial_output(tmp_path):
+    source_a = tmp_path / "a.log"
+    source_b = tmp_path / "b.log"
+    source_a.write_text(
+        "2025-01-01T00:00:02Z INFO api: a-1\nbad-a\n2025-01-01T00:00:03Z ERROR api: a-2\n",
+        encoding="utf-8",
+    )
+    source_b.write_text(
+        '{"timestamp":"2025-01-01T00:00:02Z","component":"db","message":"b-1"}\n\n',
+        encoding="utf-8",
+    )
+    args = ["parse", str(source_a), str(source_b), "--out", "-"]
+
+    serial = runner.invoke(app, args)
+    parallel = runner.invoke(app, [*args, "--jobs", "2"])
+
+    assert serial.exit_code == 0
+    assert parallel.exit_code == 0
+    assert parallel.stdout == serial.stdout
+
+
+def test_parse_with_jobs_reports_missing_input(tmp_path):
+    sample = tmp_path / "a.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: ok\n", encoding="utf-8")
+
+    result = runner.invoke(
+        app, ["parse", str(sample), "missing-file.log", "--out", "-", "--jobs", "2"]
+    )
+
+    assert result.exit_code == 2
+    assert "Input file not found: missing-file.log" in result.output
+
+
+def test_parse_verbose_stats_reports_timestamp_cache_counters(tmp_path):
+    source_a = tmp_path / "a.log"
+    source_b = tmp_path / "b.log"
+    source_a.write_text(
+        "2025-01-01T00:00:01Z INFO api: a-1\n2025-01-01T00:00:01Z INFO api: a-2\n",
+        encoding="utf-8",
+    )
+    source_b.write_text('{"timestamp":"2025-01-01T00:00:01Z","message":"b-1"}\n', encoding="utf-8")
+
+    result = runner.invoke(
+        app, ["parse", str(source_a), str(source_b), "--out", "-", "--verbose-stats"]
+    )
+
+    assert result.exit_code == 0
+    summary = json.loads(result.stdout)["parse_summary"]
+    assert summary["stats"] == {
+        "timestamp_cache": {"hits": 1, "misses": 2, "hit_ratio": 0.333333}
+    }
+    assert summary["per_source"][0]["stats"]["timestamp_cache"]["hits"] == 1
+
+
+def test_summary_omits_stats_unless_requested(tmp_path):
+    sample = tmp_path / "sample.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: ok\n", encoding="utf-8")
+
+    plain = runner.invoke(app, ["summary", str(sample), "--out", "-"])
+    verbose = runner.invoke(app, ["summary", str(sample), "--out", "-", "--verbose-stats"])
+
+    assert "stats" not in json.loads(plain.stdout)["parse_summary"]
+    assert json.loads(verbose.stdout)["parse_summary"]["stats"]["timestamp_cache"]["misses"] == 1
+
+
+def test_parse_strict_failure_leaves_no_output_file(tmp_path):
+    sample = tmp_path / "sample.log"
+    sample.write_text("not a log line\n", encoding="utf-8")
+    output = tmp_path / "out" / "parsed.json"
+
+    result = runner.invoke(app, ["parse", str(sample), "--out", str(output), "--strict"])
+
+    assert result.exit_code == 2
+    assert list(output.parent.iterdir()) == []
+
+
+def test_parse_output_file_matches_golden_bytes(tmp_path):
+    output = tmp_path / "parsed.json"
+
+    result = runner.invoke(
+        app, ["parse", str(GOLDEN_DIR / "mixed_input.log"), "--out", str(output)]
+    )
+
+    assert result.exit_code == 0
+    assert output.read_bytes() == (GOLDEN_DIR / "parse_output.json").read_bytes()
+
+
+def test_parse_ndjson_streams_events_then_summary_record(tmp_path):
+    sample = GOLDEN_DIR / "mixed_input.log"
+    expected = json.loads((GOLDEN_DIR / "parse_output.json").read_text(encoding="utf-8"))
+
+    result = runner.invoke(app, ["parse", str(sample), "--out", "-", "--format", "ndjson"])
+
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert records[:-1] == expected["events"]
+    assert records[-1] == {
+        "schema_version": expected["schema_version"],
+        "parse_summary": expected["parse_summary"],
+    }
+
+
+def test_parse_ndjson_to_stdout_rejects_disorder_it_cannot_stream(monkeypatch, tmp_path):
+    sample = tmp_path / "shuffled.log"
+    sample.write_text(
+        "2025-01-01T00:00:09Z INFO api: late\n"
+        "2025-01-01T00:00:08Z INFO api: mid\n"
+        "2025-01-01T00:00:01Z INFO api: early\n",
+        encoding="utf-8",
+    )
+    bounded = cli_module.merge_event_streams
+    monkeypatch.setattr(
+        cli_module,
+        "merge_event_streams",
+        lambda streams: bounded(streams, reorder_window=1),
+    )
+    output = tmp_path / "parsed.ndjson"
+
+    streamed = runner.invoke(app, ["parse", str(sample), "--out", "-", "--format", "ndjson"])
+    staged = runner.invoke(
+        app, ["parse", str(sample), "--out", str(output), "--format", "ndjson"]
+    )
+
+    assert streamed.exit_code == 2
+    assert f"Input file is too far out of order to stream: {sample}" in streamed.output
+    assert staged.exit_code == 0
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["message"] for record in records[:-1]] == ["early", "mid", "late"]
+
+
+def test_timeline_incremental_matches_full_parse_after_append(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: started\n", encoding="utf-8")
+    args = ["timeline", str(sample), "--out", "-"]
+
+    first = runner.invoke(app, [*args, "--incremental"])
+    with sample.open("a", encoding="utf-8") as handle:
+        handle.write("2025-01-01T00:00:02Z ERROR db: query error cid=q-1\n")
+    second = runner.invoke(app, [*args, "--incremental"])
+    full = runner.invoke(app, args)
+
+    assert first.exit_code == 0
+    assert second.exit_code == 0
+    assert second.stdout == full.stdout
+    assert "query error" in second.stdout
+
+
+def test_follow_outputs_match_timeline_and_summary(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: start cid=c-1\n"
+        "2025-01-01T00:00:02Z ERROR db: pool exhausted\n"
+        "garbage\n"
+        "2025-01-01T00:00:04Z ERROR api: timeout after 30s\n",
+        encoding="utf-8",
+    )
+    timeline_out = tmp_path / "follow.md"
+    summary_out = tmp_path / "follow.json"
+
+    result = runner.invoke(
+        app,
+        [
+            "follow",
+            str(sample),
+            "--timeline-out",
+            str(timeline_out),
+            "--summary-out",
+            str(summary_out),
+            "--max-refreshes",
+            "1",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Followed 3 events" in result.stdout
+
+    timeline = runner.invoke(app, ["timeline", str(sample), "--out", "-"])
+    summary = runner.invoke(app, ["summary", str(sample), "--out", "-"])
+    assert timeline_out.read_text(encoding="utf-8") == timeline.stdout
+    assert json.loads(summary_out.read_text(encoding="utf-8")) == json.loads(summary.stdout)
+
+
+def test_follow_requires_a_file_output(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("", encoding="utf-8")
+
+    assert runner.invoke(app, ["follow", str(sample)]).exit_code == 2
+    result = runner.invoke(app, ["follow", str(sample), "--timeline-out", "-"])
+    assert result.exit_code == 2
+
+
+def test_second_command_reuses_cached_parse(monkeypatch, tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: start\n2025-01-01T00:00:02Z ERROR db: down\n",
+        encoding="utf-8",
+    )
+    first = runner.invoke(app, ["summary", str(sample), "--out", "-"])
+    assert first.exit_code == 0
+
+    def _no_parsing(*_args, **_kwargs):
+        raise AssertionError("input was parsed again")
+
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", _no_parsing)
+    for command in (["timeline"], ["runbook"], ["summary"], ["parse", "--jobs", "2"]):
+        result = runner.invoke(app, [*command, str(sample), "--out", "-"])
+        assert result.exit_code == 0, result.output
+    assert result.stdout and json.loads(result.stdout)["events"]
+
+    uncached = runner.invoke(app, ["summary", str(sample), "--out", "-", "--no-cache"])
+    assert uncached.exit_code != 0
+
+
+def test_no_cache_leaves_the_cache_dir_empty(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: start\n2025-01-01T00:00:02Z ERROR db: down\n",
+        encoding="utf-8",
+    )
+    window = ["--since", "2025-01-01T00:00:02Z"]
+
+    for command in (
+        ["parse"],
+        ["parse", "--jobs", "2"],
+        ["summary"],
+        ["timeline", "--signatures", "drain"],
+        ["runbook"],
+    ):
+        result = runner.invoke(app, [*command, str(sample), "--out", "-", *window, "--no-cache"])
+        assert result.exit_code == 0, result.output
+    traced = runner.invoke(app, ["trace", "c-1", "--log", str(sample), "--no-cache"])
+    assert traced.exit_code == 0, traced.output
+
+    assert not [path for path in cache_dir().rglob("*") if path.is_file()]
+    cached = runner.invoke(app, ["summary", str(sample), "--out", "-", *window])
+    assert cached.exit_code == 0
+    assert list((cache_dir() / "index").iterdir())
+
+
+def test_report_writes_all_outputs_from_one_parse(monkeypatch, tmp_path):
+    sample = GOLDEN_DIR / "mixed_input.log"
+    out_dir = tmp_path / "report"
+    calls = []
+    original = cli_module.iter_file_events_with_summary
+
+    def _counting(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", _counting)
+    result = runner.invoke(
+        app,
+        [
+            "report",
+            str(sample),
+            "--out-dir",
+            str(out_dir),
+            "--title",
+            "Incident: Golden",
+            "--no-cache",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert calls == [sample]
+    assert (out_dir / "parsed.json").read_bytes() == (GOLDEN_DIR / "parse_output.json").read_bytes()
+    for name in ("timeline_output.md", "runbook_output.md"):
+        expected = (GOLDEN_DIR / name).read_text(encoding="utf-8")
+        assert (out_dir / name.replace("_output", "")).read_text(encoding="utf-8") == expected
+    summary = json.loads((out_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["parse_summary"] == json.loads(
+        (GOLDEN_DIR / "parse_output.json").read_text(encoding="utf-8")
+    )["parse_summary"]
+    parsed = json.loads((out_dir / "parsed.json").read_text())
+    assert summary["event_count"] == len(parsed["events"])
+
+
+def test_report_strict_failure_writes_nothing(tmp_path):
+    sample = tmp_path / "sample.log"
+    sample.write_text("not a log line\n", encoding="utf-8")
+    out_dir = tmp_path / "report"
+
+    result = runner.invoke(app, ["report", str(sample), "--out-dir", str(out_dir), "--strict"])
+
+    assert result.exit_code == 2
+    assert not any(out_dir.iterdir())
+
+
+def test_summary_window_spans_out_of_order_input(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:05Z INFO api: late\n"
+        "2025-01-01T00:00:01Z ERROR api: early\n"
+        "2025-01-01T00:00:03Z INFO api: middle\n",
+        encoding="utf-8",
+    )
+
+    result = runner.invoke(app, ["summary", str(sample), "--out", "-"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["incident_window"] == {
+        "start": "2025-01-01T00:00:01+00:00",
+        "end": "2025-01-01T00:00:05+00:00",
+    }
+
+
+def test_summary_verbose_stats_skips_signature_grouping(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z ERROR api: boom 1\n2025-01-01T00:00:02Z ERROR api: boom 2\n",
+        encoding="utf-8",
+    )
+
+    plain = json.loads(runner.invoke(app, ["summary", str(sample), "--out", "-"]).stdout)
+    verbose = runner.invoke(app, ["summary", str(sample), "--out", "-", "--verbose-stats"])
+
+    assert "stats" not in plain
+    payload = json.loads(verbose.stdout)
+    assert "stats" not in payload
+    assert "timestamp_cache" in payload["parse_summary"]["stats"]
+    assert payload["error_count"] == 2
+
+
+def test_timeline_and_report_verbose_stats_report_signature_cache(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z ERROR api: boom 1\n"
+        "2025-01-01T00:00:02Z ERROR api: boom 1\n"
+        "2025-01-01T00:00:03Z ERROR db: boom 2\n",
+        encoding="utf-8",
+    )
+    expected = {"signature_cache": {"hits": 0, "misses": 2, "hit_ratio": 0.0}}
+
+    plain = runner.invoke(app, ["timeline", str(sample), "--out", "-"])
+    verbose = runner.invoke(app, ["timeline", str(sample), "--out", "-", "--verbose-stats"])
+    out_dir = tmp_path / "report"
+    report = runner.invoke(
+        app, ["report", str(sample), "--out-dir", str(out_dir), "--verbose-stats"]
+    )
+
+    assert plain.stderr == ""
+    assert verbose.stdout == plain.stdout
+    assert json.loads(verbose.stderr) == expected
+    assert report.exit_code == 0
+    summary = json.loads((out_dir / "summary.json").read_text())
+    assert summary["stats"] == expected
+    assert "timestamp_cache" in summary["parse_summary"]["stats"]
+
+
+def test_timeline_drain_signatures_group_ids_and_persist_templates(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z ERROR api: user 5f0c1a2b-1234-4abc-9def-0123456789ab not found\n"
+        "2025-01-01T00:00:02Z ERROR api: user 5a0c1a2b-1234-4abc-9def-0123456789ab not found\n",
+        encoding="utf-8",
+    )
+
+    default = runner.invoke(app, ["timeline", str(sample), "--out", "-"])
+    drain = runner.invoke(app, ["timeline", str(sample), "--out", "-", "--signatures", "drain"])
+
+    assert default.exit_code == drain.exit_code == 0
+    assert default.stdout.count("(count: 1,") == 2
+    assert "- user <*> not found (count: 2," in drain.stdout
+    learned = cli_module.TemplateMiner.load().to_dict()["clusters"]
+    assert [cluster["tokens"] for cluster in learned] == [["user", "<*>", "not", "found"]]
+
+
+def test_summary_approx_reports_error_bounds(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "".join(
+            f"2025-01-01T00:00:0{second}Z ERROR {component}: {message}\n"
+            for second, component, message in [
+                (1, "api", "timeout"),
+                (2, "api", "timeout"),
+                (3, "db", "disk full"),
+                (4, "api", "timeout"),
+                (5, "cache", "evicted 1"),
+                (6, "worker", "evicted 2"),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    exact = json.loads(runner.invoke(app, ["summary", str(sample), "--out", "-"]).stdout)
+    approx_args = ["summary", str(sample), "--out", "-", "--approx"]
+    approx = json.loads(runner.invoke(app, approx_args).stdout)
+
+    assert "approximation" not in exact
+    assert [{**item, "error": 0} for item in exact["top_components"]] == approx["top_components"]
+    assert approx["approximation"]["top_error_signatures"] == {"total": 6, "max_unlisted_count": 0}
+
+    monkeypatch.setattr(cli_module, "DEFAULT_SKETCH_CAPACITY", 2)
+    bounded = json.loads(runner.invoke(app, approx_args).stdout)
+
+    assert bounded["top_error_signatures"][0] == {"name": "timeout", "count": 3, "error": 0}
+    assert bounded["approximation"]["capacity"] == 2
+    assert bounded["approximation"]["top_components"]["total"] == 6
+    for item in bounded["top_error_signatures"][1:]:
+        assert item["error"] > 0
+
+
+def test_timeline_approx_bounds_notable_errors(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "".join(
+            f"2025-01-01T00:00:0{second}Z ERROR {component}: {message}\n"
+            for second, component, message in [
+                (1, "api", "timeout"),
+                (2, "db", "disk full"),
+                (3, "api", "timeout"),
+                (4, "cache", "stale entry"),
+                (5, "api", "timeout"),
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    exact = runner.invoke(app, ["timeline", str(sample), "--out", "-"]).stdout
+    assert runner.invoke(app, ["timeline", str(sample), "--out", "-", "--approx"]).stdout == exact
+
+    monkeypatch.setattr(cli_module, "DEFAULT_SKETCH_CAPACITY", 2)
+    bounded = runner.invoke(app, ["timeline", str(sample), "--out", "-", "--approx"]).stdout
+    notable = bounded.split("## Notable Errors\n")[1].split("\n\n")[0].splitlines()
+
+    assert notable[0].startswith(
+        "- Approximate (Space-Saving, capacity 2): counts may overstate by up to 2,"
+    )
+    assert notable[1].startswith("- timeout (count: 3,")
+    assert len(notable) == 3
+    assert "- api (errors: 3)" in bounded
+
+
+def test_timeline_since_until_offsets_are_relative_to_first_error(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:00Z INFO api: boot\n"
+        "2025-01-01T00:20:00Z WARN db: slow query\n"
+        "2025-01-01T00:21:00Z ERROR db: connection refused\n"
+        "garbage line\n"
+        "2025-01-01T00:22:00Z INFO api: retry ok\n"
+        "2025-01-01T01:00:00Z INFO api: later\n",
+        encoding="utf-8",
+    )
+
+    relative = runner.invoke(
+        app, ["timeline", str(sample), "--out", "-", "--since", "-1m", "--until=+1m"]
+    )
+    absolute = runner.invoke(
+        app,
+        [
+            "timeline",
+            str(sample),
+            "--out",
+            "-",
+            "--since",
+            "2025-01-01T00:20:00Z",
+            "--until",
+            "2025-01-01 00:22:00",
+        ],
+    )
+    strict = runner.invoke(
+        app,
+        [
+            "summary",
+            str(sample),
+            "--out",
+            "-",
+            "--since",
+            "-1m",
+            "--strict",
+            "--max-drop-ratio",
+            "0.25",
+        ],
+    )
+
+    assert relative.exit_code == absolute.exit_code == strict.exit_code == 0
+    assert relative.stdout == absolute.stdout
+    assert "boot" not in relative.stdout and "later" not in relative.stdout
+    assert relative.stdout.count("| 2025-01-01T00:2") == 3
+    assert json.loads(strict.stdout)["parse_summary"]["skipped_lines"] == 1
+    assert json.loads(strict.stdout)["parse_summary"]["drop_ratio"] == 0.2
+
+
+def test_event_filters_select_events_for_parse_and_timeline(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:00Z INFO api: boot cid=c-1\n"
+        "2025-01-01T00:00:01Z ERROR db: connection refused cid=c-1\n"
+        "2025-01-01T00:00:02Z ERROR db-replica: replication lag cid=c-2\n"
+        "2025-01-01T00:00:03Z WARN api: slow response cid=c-1\n",
+        encoding="utf-8",
+    )
+
+    parsed = runner.invoke(
+        app, ["parse", str(sample), "--out", "-", "--component", "db*", "--cid", "c-1"]
+    )
+    timeline = runner.invoke(
+        app, ["timeline", str(sample), "--out", "-", "--level", "warn", "--grep", "refused|slow"]
+    )
+    invalid = runner.invoke(app, ["parse", str(sample), "--out", "-", "--level", "loud"])
+
+    assert parsed.exit_code == timeline.exit_code == 0
+    payload = json.loads(parsed.stdout)
+    assert [event["message"] for event in payload["events"]] == ["connection refused cid=c-1"]
+    assert payload["parse_summary"]["skipped_lines"] == 3
+    assert payload["parse_summary"]["drop_ratio"] == 0.0
+    assert "connection refused" in timeline.stdout and "slow response" in timeline.stdout
+    assert "boot" not in timeline.stdout and "replication lag" not in timeline.stdout
+    assert invalid.exit_code == 2
+    assert "Unknown level 'loud'" in invalid.stderr
+
+
+def test_trace_reconstructs_cross_source_chains_from_the_cache(tmp_path, monkeypatch):
+    api = tmp_path / "api.log"
+    api.write_text(
+        "2025-01-01T00:00:01Z INFO api: start cid=c-1\n"
+        "2025-01-01T00:00:03Z ERROR api: failed cid=c-1\n"
+        "2025-01-01T00:00:05Z ERROR api: timeout cid=c-2\n",
+        encoding="utf-8",
+    )
+    db = tmp_path / "db.jsonl"
+    db.write_text(
+        '{"ts":"2025-01-01T00:00:02Z","level":"error","component":"db",'
+        '"msg":"refused","correlation_id":"c-1"}\n',
+        encoding="utf-8",
+    )
+    args = ["trace", "c-1", "c-3", "--log", str(api), "-l", str(db), "--top-errors", "2"]
+
+    parsed = runner.invoke(app, ["parse", str(api), str(db), "--out", str(tmp_path / "out.json")])
+    cache_entries = sorted(parse_cache_dir().glob("*.parse"))
+    first = runner.invoke(app, args)
+    # trace reuses the entries the other commands store instead of writing its own.
+    assert parsed.exit_code == 0 and len(cache_entries) == 2
+    assert sorted(parse_cache_dir().glob("*.parse")) == cache_entries
+    # The second run answers from the cached parses and correlation indexes.
+    monkeypatch.setattr(cli_module, "iter_file_events_with_summary", None)
+    monkeypatch.setattr(cli_module.CorrelationIndex, "from_batch", None)
+    second = runner.invoke(app, args)
+    missing = runner.invoke(app, ["trace", "--log", str(api)])
+
+    assert first.exit_code == second.exit_code == 0
+    assert first.stdout == second.stdout
+    payload = json.loads(first.stdout)
+    c1, c3 = payload["traces"]
+    assert [(event["message"], Path(event["source"]).name) for event in c1["events"]] == [
+        ("start cid=c-1", "api.log"),
+        ("refused", "db.jsonl"),
+        ("failed cid=c-1", "api.log"),
+    ]
+    assert (c1["event_count"], c1["error_count"]) == (3, 2)
+    assert c3 == {"correlation_id": "c-3", "event_count": 0, "error_count": 0, "events": []}
+    assert payload["top_error_correlation_ids"] == [
+        {"correlation_id": "c-1", "error_count": 2, "event_count": 3},
+        {"correlation_id": "c-2", "error_count": 1, "event_count": 1},
+    ]
+    assert missing.exit_code == 2
+    assert "at least one correlation ID" in missing.stderr
+
+
+def test_timeline_rate_view_uses_the_requested_bucket_width(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:00Z INFO api: boot\n"
+        "2025-01-01T00:00:40Z ERROR db: refused\n"
+        "2025-01-01T00:00:50Z ERROR db: refused\n"
+        "2025-01-01T00:00:55Z ERROR db: refused\n",
+        encoding="utf-8",
+    )
+
+    rates = runner.invoke(
+        app, ["timeline", str(sample), "--out", "-", "--view", "rates", "--bucket", "30s"]
+    )
+    invalid = runner.invoke(app, ["timeline", str(sample), "--out", "-", "--bucket", "0s"])
+
+    assert rates.exit_code == 0
+    assert "Bucket width: 30s" in rates.stdout
+    assert "Probable start: `2025-01-01T00:00:30+00:00`" in rates.stdout
+    assert "| 2025-01-01T00:00:30+00:00 | 3 | 3 | 3 | 0 |" in rates.stdout
+    assert "| Time (UTC) |" not in rates.stdout
+    assert invalid.exit_code == 2
+    assert "--bucket must be a positive duration" in invalid.stderr
+
+
+def test_relative_window_requires_an_error_event(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:00Z INFO api: boot\n", encoding="utf-8")
+
+    missing = runner.invoke(app, ["parse", str(sample), "--out", "-", "--since", "-5m"])
+    invalid = runner.invoke(app, ["parse", str(sample), "--out", "-", "--until", "soon"])
+    reversed_window = runner.invoke(
+        app, ["parse", str(sample), "--out", "-", "--since", "2025-01-02", "--until", "2025-01-01"]
+    )
+
+    assert missing.exit_code == invalid.exit_code == reversed_window.exit_code == 2
+    assert "no error was found" in missing.stderr
+    assert "--until must be a timestamp" in invalid.stderr
+    assert "--since must not be later than --until" in reversed_window.stderr
+
+
+def test_index_command_prebuilds_time_index(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: one\n2025-01-01T00:00:02Z ERROR api: two\n",
+        encoding="utf-8",
+    )
+    packed = tmp_path / "app.log.gz"
+    packed.write_bytes(gzip.compress(sample.read_bytes()))
+
+    built = runner.invoke(app, ["index", str(sample)])
+    windowed = runner.invoke(app, ["parse", str(sample), "--out", "-", "--since", "-0s"])
+    rejected = runner.invoke(app, ["index", str(packed)])
+
+    assert built.exit_code == 0
+    assert built.stdout == f"Indexed {sample}: 1 block(s)\n"
+    assert [event["message"] for event in json.loads(windowed.stdout)["events"]] == ["two"]
+    assert rejected.exit_code == 2
+    assert "Compressed inputs cannot be indexed" in rejected.stderr
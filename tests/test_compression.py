@@ -0,0 +1,64 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+import triage_toolkit.compression as compression_module
+from triage_toolkit.compression import DecompressedInput, detect_compression
+
+TEXT = "".join(f"2025-01-01T00:00:{second:02d}Z INFO api: line {second}\n" for second in range(60))
+
+
+@pytest.mark.parametrize(
+    ("name", "compress"),
+    [("gzip", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)],
+)
+def test_decompressed_input_streams_text_and_counts_bytes(tmp_path, name, compress):
+    path = tmp_path / "app.log.z"
+    data = compress(TEXT.encode("utf-8"))
+    path.write_bytes(data)
+
+    assert detect_compression(path) == name
+    with DecompressedInput(path, name, buffer_bytes=64) as source:
+        assert source.text.read() == TEXT
+
+    assert source.compressed_bytes == len(data)
+    assert source.uncompressed_bytes == len(TEXT)
+
+
+def test_detect_compression_returns_none_for_plain_text(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(TEXT, encoding="utf-8")
+
+    assert detect_compression(path) is None
+
+
+def test_truncated_stream_raises_os_error(tmp_path):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress(TEXT.encode("utf-8"))[:40])
+
+    with DecompressedInput(path, "gzip") as source:
+        with pytest.raises(OSError, match="Could not decompress gzip input"):
+            source.text.read()
+
+
+def test_closing_early_stops_the_decompression_thread(tmp_path):
+    path = tmp_path / "app.log.gz"
+    path.write_bytes(gzip.compress((TEXT * 200).encode("utf-8")))
+
+    source = DecompressedInput(path, "gzip", buffer_bytes=16)
+    source.text.readline()
+    source.close()
+
+    assert not source._thread.is_alive()
+
+
+def test_zstd_without_optional_package_raises_os_error(tmp_path, monkeypatch):
+    path = tmp_path / "app.log.zst"
+    path.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 8)
+    monkeypatch.setattr(compression_module, "zstandard", None)
+
+    with DecompressedInput(path, "zstd") as source:
+        with pytest.raises(OSError, match="zstandard"):
+            source.text.read()
@@ -0,0 +1,89 @@
+import pytest
+
+from triage_toolkit.batch import EventBatch
+from triage_toolkit.correlation import (
+    CorrelationIndex,
+    top_error_correlation_ids,
+    trace_events,
+)
+from triage_toolkit.parser import parse_lines_with_summary
+
+
+def _batch(*lines):
+    events, _ = parse_lines_with_summary(lines)
+    return EventBatch.from_events(events)
+
+
+def test_index_maps_correlation_ids_to_rows_and_error_counts():
+    batch = _batch(
+        "2025-01-01T00:00:01Z INFO api: start cid=c-1",
+        "2025-01-01T00:00:02Z INFO api: no id here",
+        "2025-01-01T00:00:03Z ERROR db: refused cid=c-1",
+        "2025-01-01T00:00:04Z WARN db: error budget low cid=c-2",
+    )
+
+    index = CorrelationIndex.from_batch(batch)
+
+    assert {key: rows.tolist() for key, rows in index.rows.items()} == {"c-1": [0, 2], "c-2": [3]}
+    assert index.errors == {"c-1": 1, "c-2": 1}
+    restored = CorrelationIndex.from_dict(index.to_dict())
+    assert restored.rows == index.rows and restored.errors == index.errors
+
+
+def test_trace_events_merge_sources_in_timeline_order():
+    api = _batch(
+        "2025-01-01T00:00:01Z INFO api: start cid=c-1",
+        "2025-01-01T00:00:03Z ERROR api: failed cid=c-1",
+    )
+    db = _batch(
+        "2025-01-01T00:00:03Z ERROR db: refused cid=c-1",
+        "2025-01-01T00:00:02Z INFO db: query cid=c-1",
+        "2025-01-01T00:00:02Z INFO db: other cid=c-2",
+    )
+    batches = [api, db]
+    indexes = [CorrelationIndex.from_batch(batch) for batch in batches]
+
+    chain = trace_events(batches, indexes, "c-1")
+
+    assert [(source, event.message) for source, event in chain] == [
+        (0, "start cid=c-1"),
+        (1, "query cid=c-1"),
+        (0, "failed cid=c-1"),
+        (1, "refused cid=c-1"),
+    ]
+    assert trace_events(batches, indexes, "missing") == []
+    assert top_error_correlation_ids(indexes, 5) == [("c-1", 2, 4)]
+
+
+def test_top_error_ids_break_ties_by_event_count_then_id():
+    index = CorrelationIndex.from_batch(
+        _batch(
+            "2025-01-01T00:00:01Z ERROR api: a cid=c-3",
+            "2025-01-01T00:00:02Z ERROR api: b cid=c-2",
+            "2025-01-01T00:00:03Z INFO api: c cid=c-2",
+            "2025-01-01T00:00:04Z ERROR api: d cid=c-1",
+        )
+    )
+
+    assert top_error_correlation_ids([index], 2) == [("c-2", 1, 2), ("c-1", 1, 1)]
+
+
+def test_from_dict_rejects_other_versions():
+    state = CorrelationIndex().to_dict()
+
+    with pytest.raises(ValueError, match="unsupported"):
+        CorrelationIndex.from_dict({**state, "version": 0})
+    with pytest.raises(ValueError, match="malformed"):
+        CorrelationIndex.from_dict({**state, "rows": {"c-1": ["x"]}})
+
+
+def test_numeric_correlation_ids_are_keyed_as_text():
+    batch = _batch(
+        '{"ts":"2025-01-01T00:00:01Z","level":"error","msg":"boom","correlation_id":42}',
+    )
+
+    index = CorrelationIndex.from_batch(batch)
+    restored = CorrelationIndex.from_dict(index.to_dict())
+
+    assert [event.message for _, event in trace_events([batch], [index], "42")] == ["boom"]
+    assert restored.rows == index.rows and restored.errors == index.errors == {"42": 1}
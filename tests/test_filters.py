@@ -0,0 +1,45 @@
+import pytest
+
+from triage_toolkit.filters import EventFilter
+
+
+def test_level_keeps_events_at_or_above_severity():
+    warn = EventFilter(min_level="warn")
+
+    assert warn.accepts_source("WARNING", "db")
+    assert warn.accepts_source("FATAL", "db")
+    assert not warn.accepts_source("INFO", "db")
+    assert not warn.accepts_source("VERBOSE", "db")
+
+
+def test_components_match_names_and_star_prefixes():
+    selected = EventFilter(components=("api", "db*"))
+
+    assert selected.accepts_source("INFO", "api")
+    assert selected.accepts_source("INFO", "db-replica")
+    assert not selected.accepts_source("INFO", "api-gateway")
+    assert EventFilter().accepts_source("DEBUG", "anything")
+
+
+def test_message_predicates_combine_correlation_id_and_grep():
+    selected = EventFilter(correlation_ids=("c-1",), pattern=r"time(d )?out")
+
+    assert selected.accepts_message("request timed out", "c-1")
+    assert not selected.accepts_message("request timed out", "c-2")
+    assert not selected.accepts_message("request ok", "c-1")
+    assert not selected.accepts_message("request timed out", None)
+
+
+def test_invalid_predicates_raise_value_error():
+    with pytest.raises(ValueError, match="Unknown level"):
+        EventFilter(min_level="loud")
+    with pytest.raises(ValueError, match="Invalid --grep pattern"):
+        EventFilter(pattern="(")
+
+
+def test_identity_ignores_predicate_order():
+    first = EventFilter("error", ("db", "api"), ("c-2", "c-1"))
+    second = EventFilter("ERROR", ("api", "db"), ("c-1", "c-2"))
+
+    assert first.identity() == second.identity()
+    assert first.identity() != EventFilter("error").identity()
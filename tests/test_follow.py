@@ -0,0 +1,45 @@
+import os
+
+from triage_toolkit.follow import SourceTailer
+from triage_toolkit.parser import parse_file_with_summary
+
+
+def _append(path, text):
+    with path.open("a", encoding="utf-8", newline="") as handle:
+        handle.write(text)
+
+
+def test_tailer_returns_only_complete_new_lines(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n\n", encoding="utf-8")
+
+    with SourceTailer(sample) as tailer:
+        assert [event.message for _, event in tailer.poll()] == ["one"]
+        assert tailer.poll() == []
+
+        _append(sample, "2025-01-01T00:00:02Z ERROR api: two\r\n2025-01-01T00:00:03Z INFO api: th")
+        assert [(index, event.message) for index, event in tailer.poll()] == [(1, "two")]
+
+        _append(sample, "ree\n")
+        assert [(index, event.message) for index, event in tailer.poll()] == [(2, "three")]
+        _, expected_summary = parse_file_with_summary(sample)
+        assert tailer.summary() == expected_summary
+
+
+def test_tailer_follows_rotation_and_truncation(tmp_path):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: one\n2025-01-01T00:00:02Z INFO api: two", encoding="utf-8"
+    )
+
+    with SourceTailer(sample) as tailer:
+        assert [event.message for _, event in tailer.poll()] == ["one"]
+
+        os.replace(sample, tmp_path / "app.log.1")
+        sample.write_text("2025-01-01T00:00:03Z INFO api: three\n", encoding="utf-8")
+        # The rotated file's unterminated last line is complete once the file is replaced.
+        assert [event.message for _, event in tailer.poll()] == ["two", "three"]
+
+        sample.write_text("2025-01-01T00:00:04Z INFO api: four\n", encoding="utf-8")
+        assert [(index, event.message) for index, event in tailer.poll()] == [(3, "four")]
+        assert tailer.summary()["total_lines"] == 4
@@ -0,0 +1,98 @@
+import os
+from datetime import datetime, timezone
+
+import triage_toolkit.incremental as incremental_module
+from triage_toolkit.incremental import parse_file_incremental
+from triage_toolkit.parser import ParseOptions, parse_file_with_summary
+
+
+def _assert_matches_full_parse(path, options=None):
+    batch, summary = parse_file_incremental(path, options)
+    expected_events, expected_summary = parse_file_with_summary(path, options=options)
+    assert list(batch) == expected_events
+    assert summary == expected_summary
+    return batch, summary
+
+
+def _count_parsed_bytes(monkeypatch):
+    parsed: list[tuple[int, int]] = []
+    original = incremental_module.parse_byte_range
+
+    def _recording(path, start, end, options=None):
+        parsed.append((start, end))
+        return original(path, start, end, options)
+
+    monkeypatch.setattr(incremental_module, "parse_byte_range", _recording)
+    return parsed
+
+
+def test_incremental_parses_only_appended_complete_lines(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    first = "2025-01-01T00:00:01Z INFO api: one\nnot a log line\n"
+    sample.write_text(first, encoding="utf-8")
+    parsed = _count_parsed_bytes(monkeypatch)
+
+    _assert_matches_full_parse(sample)
+    with sample.open("a", encoding="utf-8") as handle:
+        handle.write("2025-01-01T00:00:02Z ERROR db: two\n2025-01-01T00:00:03Z INFO api: par")
+    _, summary = _assert_matches_full_parse(sample)
+
+    complete = len(first) + len("2025-01-01T00:00:02Z ERROR db: two\n")
+    assert parsed == [(0, len(first)), (len(first), complete), (complete, sample.stat().st_size)]
+    assert summary["total_lines"] == 4
+
+    with sample.open("a", encoding="utf-8") as handle:
+        handle.write("tial\n")
+    batch, _ = _assert_matches_full_parse(sample)
+    assert parsed[-1] == (complete, sample.stat().st_size)
+    assert batch.message(len(batch) - 1) == "partial"
+
+
+def test_incremental_without_new_bytes_reuses_checkpoint(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n", encoding="utf-8")
+    parse_file_incremental(sample)
+    parsed = _count_parsed_bytes(monkeypatch)
+
+    _assert_matches_full_parse(sample)
+
+    assert parsed == []
+
+
+def test_incremental_falls_back_after_truncation_or_rotation(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: one\n2025-01-01T00:00:02Z INFO api: two\n",
+        encoding="utf-8",
+    )
+    parse_file_incremental(sample)
+    parsed = _count_parsed_bytes(monkeypatch)
+
+    sample.write_text("2025-01-01T00:00:05Z WARN api: truncated\n", encoding="utf-8")
+    _assert_matches_full_parse(sample)
+
+    rotated = tmp_path / "rotated.log"
+    rotated.write_text(
+        "2025-01-01T00:00:09Z ERROR api: rotated\n2025-01-01T00:00:10Z INFO api: again\n",
+        encoding="utf-8",
+    )
+    os.replace(rotated, sample)
+    _assert_matches_full_parse(sample)
+
+    assert [start for start, _ in parsed] == [0, 0]
+
+
+def test_incremental_falls_back_when_options_or_content_change(tmp_path, monkeypatch):
+    sample = tmp_path / "app.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n", encoding="utf-8")
+    parse_file_incremental(sample, ParseOptions(keep_raw=False))
+    parsed = _count_parsed_bytes(monkeypatch)
+
+    _assert_matches_full_parse(sample, ParseOptions(keep_raw=True))
+    sample.write_text("2025-01-01T00:00:01Z INFO api: ONE\n", encoding="utf-8")
+    _assert_matches_full_parse(sample, ParseOptions(keep_raw=True))
+    windowed = ParseOptions(since=datetime(2025, 1, 1, 0, 0, 2, tzinfo=timezone.utc))
+    _, summary = _assert_matches_full_parse(sample, windowed)
+
+    assert [start for start, _ in parsed] == [0, 0, 0]
+    assert summary["skipped_lines"] == 1
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+import triage_toolkit.parser as parser_module
+from triage_toolkit.filters import EventFilter
+from triage_toolkit.index import TimeIndex, load_time_index
+from triage_toolkit.parser import ParseOptions, build_time_index, parse_file_with_summary
+
+
+def _utc(minute, second=0):
+    return datetime(2025, 1, 1, 0, minute, second, tzinfo=timezone.utc)
+
+
+def _write_day(path):
+    lines = []
+    for minute in range(30):
+        lines.append(f"2025-01-01T00:{minute:02d}:00Z INFO api: tick {minute}")
+        lines.append(f"2025-01-01T00:{minute:02d}:30Z ERROR db: slow {minute}")
+        if minute % 7 == 0:
+            lines.extend(["", "not a log line"])
+    lines.append("2025-01-01T00:31:00Z INFO api: done")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _count_parsed_lines(monkeypatch):
+    seen: list[str] = []
+    parse = parser_module.parse_line_with_reason
+    monkeypatch.setattr(
+        parser_module,
+        "parse_line_with_reason",
+        lambda line, context=None: (seen.append(line), parse(line, context))[1],
+    )
+    return seen
+
+
+def test_windowed_parse_builds_index_then_reads_only_the_window(tmp_path, monkeypatch):
+    sample = tmp_path / "day.log"
+    _write_day(sample)
+    monkeypatch.setattr(parser_module, "_SCAN_BLOCK_BYTES", 256)
+    window = {"since": _utc(12), "until": _utc(14, 30)}
+    expected = parse_file_with_summary(sample, options=ParseOptions(reader="text", **window))
+    seen = _count_parsed_lines(monkeypatch)
+
+    first = parse_file_with_summary(sample, options=ParseOptions(**window))
+    first_reads = len(seen)
+    index = load_time_index(sample)
+    second = parse_file_with_summary(sample, options=ParseOptions(**window))
+    second_reads = len(seen) - first_reads
+    pooled = parse_file_with_summary(
+        sample, workers=2, chunk_bytes=64, options=ParseOptions(**window)
+    )
+
+    assert first == second == expected
+    assert pooled == expected
+    assert [event.message for event in expected[0]][:2] == ["tick 12", "slow 12"]
+    assert expected[1]["skipped_lines"] > 0
+    assert index is not None and len(index) > 4
+    assert first_reads == 66
+    assert second_reads < 20
+
+
+def test_filtered_windowed_summaries_do_not_depend_on_an_index(tmp_path, monkeypatch):
+    sample = tmp_path / "day.log"
+    lines = []
+    for minute in range(30):
+        lines.append(f"2025-01-01T00:{minute:02d}:00Z INFO api: tick {minute}")
+        lines.append(f"2025-01-01T00:{minute:02d}:30Z ERROR db: slow {minute}")
+        if minute % 5 == 0:
+            lines.append(f"2025-01-01T99:{minute:02d}:00Z WARN api: bad clock {minute}")
+    sample.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.setattr(parser_module, "_SCAN_BLOCK_BYTES", 256)
+    options = ParseOptions(
+        since=_utc(12), until=_utc(14, 30), event_filter=EventFilter(components=("db",))
+    )
+
+    without_index = parse_file_with_summary(sample, options=options)
+    build_time_index(sample)
+    with_index = parse_file_with_summary(sample, options=options)
+    pooled = parse_file_with_summary(sample, workers=2, chunk_bytes=64, options=options)
+
+    assert with_index == pooled == without_index
+    assert [event.message for event in without_index[0]] == ["slow 12", "slow 13", "slow 14"]
+    assert without_index[1]["drop_ratio"] == 0.0
+
+
+def test_index_is_invalidated_when_the_file_changes(tmp_path):
+    sample = tmp_path / "day.log"
+    _write_day(sample)
+
+    assert len(build_time_index(sample)) == 1
+    assert load_time_index(sample) is not None
+    with sample.open("a", encoding="utf-8") as handle:
+        handle.write("2025-01-01T00:32:00Z INFO api: appended\n")
+
+    assert load_time_index(sample) is None
+
+
+def test_window_blocks_tolerate_out_of_order_blocks():
+    index = TimeIndex(size=400, mtime_ns=0)
+    index.add_block(0, 10, 10, 20, {})
+    index.add_block(100, 10, 30, 90, {})  # a straggler at 90 keeps later blocks in range
+    index.add_block(200, 2, None, None, {"unrecognized_text": 2})
+    index.add_block(300, 10, 40, 50, {"blank_line": 1})
+
+    assert index.window_blocks(60, None) == (1, 4)
+    assert index.window_blocks(None, 25) == (0, 1)
+    assert index.window_blocks(45, 48) == (1, 4)
+    assert index.window_blocks(95, 99) == (4, 4)
+    assert index.outside_counts(1, 4) == (10, {})
+    assert index.outside_counts(0, 1) == (19, {"unrecognized_text": 2, "blank_line": 1})
+    assert TimeIndex.from_dict(index.to_dict()).to_dict() == index.to_dict()
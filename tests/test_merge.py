@@ -0,0 +1,59 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from triage_toolkit.merge import MergeOrderError, merge_event_streams, sort_event_streams
+from triage_toolkit.models import LogEvent
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(second: int, message: str) -> LogEvent:
+    return LogEvent(
+        timestamp=BASE + timedelta(seconds=second),
+        level="INFO",
+        component="api",
+        message=message,
+        correlation_id=None,
+        raw=message,
+    )
+
+
+def test_merge_matches_full_sort_for_nearly_ordered_sources():
+    rng = random.Random(7)
+    sources = []
+    for source_index in range(4):
+        seconds = sorted(rng.randrange(0, 50) for _ in range(200))
+        # Locally shuffle neighbours so every source is only slightly out of order.
+        for index in range(0, len(seconds) - 1, 3):
+            seconds[index], seconds[index + 1] = seconds[index + 1], seconds[index]
+        sources.append([_event(second, f"{source_index}-{i}") for i, second in enumerate(seconds)])
+
+    merged = list(merge_event_streams(sources, reorder_window=4))
+
+    assert merged == sort_event_streams(sources)
+
+
+def test_merge_keeps_source_then_line_tiebreak():
+    source_a = [_event(1, "a-1"), _event(1, "a-2")]
+    source_b = [_event(0, "b-1"), _event(1, "b-2")]
+
+    merged = merge_event_streams([source_a, source_b], reorder_window=0)
+
+    assert [event.message for event in merged] == ["b-1", "a-1", "a-2", "b-2"]
+
+
+def test_merge_raises_when_source_exceeds_reorder_window():
+    source = [_event(5, "late"), _event(4, "x"), _event(3, "y"), _event(1, "early")]
+
+    with pytest.raises(MergeOrderError) as exc_info:
+        list(merge_event_streams([source], reorder_window=1))
+
+    assert exc_info.value.source_index == 0
+    assert exc_info.value.event_index == 2
+
+
+def test_merge_rejects_negative_window():
+    with pytest.raises(ValueError):
+        list(merge_event_streams([[]], reorder_window=-1))
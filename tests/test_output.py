@@ -0,0 +1,74 @@
+import io
+import json
+from datetime import datetime, timezone
+
+from triage_toolkit.models import LogEvent
+from triage_toolkit.output import JsonParseWriter, NdjsonParseWriter
+
+
+def _event(second: int, message: str) -> LogEvent:
+    return LogEvent(
+        timestamp=datetime(2025, 1, 1, 0, 0, second, tzinfo=timezone.utc),
+        level="INFO",
+        component="api",
+        message=message,
+        correlation_id=None,
+    )
+
+
+def _expected(events: list[LogEvent], summary: dict) -> str:
+    payload = {
+        "schema_version": "1.0.0",
+        "events": [event.to_dict() for event in events],
+        "parse_summary": summary,
+    }
+    return json.dumps(payload, indent=2)
+
+
+def test_json_parse_writer_matches_json_dumps():
+    events = [_event(1, 'quote " and \\ and\nnewline'), _event(2, "héllo")]
+    summary = {"total_lines": 2, "dropped_reasons": {}, "per_source": [{"path": "a.log"}]}
+    stream = io.StringIO()
+
+    writer = JsonParseWriter(stream, "1.0.0")
+    assert writer.write_events(iter(events)) == 2
+    writer.write_summary(summary)
+
+    assert stream.getvalue() == _expected(events, summary)
+
+
+def test_json_parse_writer_matches_json_dumps_without_events():
+    stream = io.StringIO()
+
+    writer = JsonParseWriter(stream, "1.0.0")
+    writer.write_events([])
+    writer.write_summary({"total_lines": 0})
+
+    assert stream.getvalue() == _expected([], {"total_lines": 0})
+
+
+def test_json_parse_writer_restarts_from_scratch():
+    stream = io.StringIO()
+    writer = JsonParseWriter(stream, "1.0.0")
+
+    writer.write_events([_event(1, "partial"), _event(2, "partial")])
+    writer.write_events([_event(3, "final")])
+    writer.write_summary({})
+
+    assert stream.getvalue() == _expected([_event(3, "final")], {})
+
+
+def test_ndjson_parse_writer_emits_one_compact_object_per_line():
+    events = [_event(1, "first\nline"), _event(2, "second")]
+    stream = io.StringIO()
+
+    writer = NdjsonParseWriter(stream, "1.0.0")
+    writer.write_events([_event(9, "discarded")])
+    writer.write_events(events)
+    writer.write_summary({"total_lines": 2})
+
+    lines = stream.getvalue().split("\n")
+    assert lines[-1] == ""
+    assert [json.loads(line) for line in lines[:2]] == [event.to_dict() for event in events]
+    assert json.loads(lines[2]) == {"schema_version": "1.0.0", "parse_summary": {"total_lines": 2}}
+    assert " " not in lines[2]
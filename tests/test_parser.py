@@ -1,11 +1,23 @@
+import gzip
+from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
+
 import triage_toolkit.parser as parser_module
+from triage_toolkit.filters import EventFilter
 from triage_toolkit.parser import (
+    JsonKeyResolver,
+    ParseContext,
+    ParseOptions,
+    first_error_timestamp,
+    merge_parse_summaries,
     parse_file_with_summary,
+    parse_files_with_summary,
     parse_json_line,
     parse_line,
     parse_line_with_reason,
+    parse_lines_with_summary,
     parse_text_line,
 )
 
@@ -80,7 +92,9 @@ def test_parse_text_line_invalid_timestamp_reason():
 
 
 def test_parse_line_with_reason_uses_unknown_fallback(monkeypatch):
-    monkeypatch.setattr(parser_module, "_parse_text_line_with_reason", lambda _line: (None, None))
+    monkeypatch.setattr(
+        parser_module, "_parse_text_line_with_reason", lambda _line, _context=None: (None, None)
+    )
 
     event, reason = parse_line_with_reason("2025-01-01T00:00:01Z INFO api: hello")
 
@@ -198,3 +212,264 @@ def test_parse_file_stream_large_input_summary(tmp_path):
         "drop_ratio": 0.5,
         "dropped_reasons": {"unrecognized_text": 5_000},
     }
+
+
+def test_parse_files_with_summary_in_pool_matches_serial(tmp_path):
+    paths = []
+    for index in range(3):
+        sample = tmp_path / f"s{index}.log"
+        sample.write_text(
+            f"2025-01-01T00:00:0{index}Z INFO api: hello-{index} cid=c-{index}\nnoise\n",
+            encoding="utf-8",
+        )
+        paths.append(sample)
+
+    serial = [parse_file_with_summary(path) for path in paths]
+    pooled = list(parse_files_with_summary(paths, jobs=3))
+
+    assert pooled == serial
+
+
+def test_parse_file_with_workers_splits_into_chunks_and_matches_serial(tmp_path):
+    sample = tmp_path / "chunked.log"
+    lines = []
+    for index in range(300):
+        lines.append(f"2025-01-01T00:{index // 60:02d}:{index % 60:02d}Z INFO api: café #{index}")
+        if index % 7 == 0:
+            lines.append("")
+        if index % 11 == 0:
+            lines.append('{"timestamp":"bad"}')
+    sample.write_bytes(("\r\n".join(lines)).encode("utf-8"))
+
+    serial = parse_file_with_summary(sample)
+    chunked = parse_file_with_summary(sample, workers=3, chunk_bytes=512)
+
+    assert len(parser_module._plan_byte_ranges(sample, 512)) > 3
+    assert chunked == serial
+
+
+def test_plan_byte_ranges_align_to_newlines(tmp_path):
+    sample = tmp_path / "ranges.log"
+    sample.write_bytes(b"aaaa\nbb\ncccccc\nd")
+
+    ranges = parser_module._plan_byte_ranges(sample, 3)
+
+    assert ranges == [(0, 5), (5, 8), (8, 15), (15, 16)]
+
+
+def test_parse_options_can_drop_raw_line(tmp_path):
+    sample = tmp_path / "sample.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: ok\n"
+        '{"timestamp":"2025-01-01T00:00:02Z","message":"json"}\n',
+        encoding="utf-8",
+    )
+
+    kept, _ = parse_file_with_summary(sample)
+    dropped, _ = parse_file_with_summary(sample, options=ParseOptions(keep_raw=False))
+
+    assert [event.raw for event in kept] == [
+        "2025-01-01T00:00:01Z INFO api: ok",
+        '{"timestamp":"2025-01-01T00:00:02Z","message":"json"}',
+    ]
+    assert [event.raw for event in dropped] == [None, None]
+    assert [event.to_dict() for event in dropped] == [event.to_dict() for event in kept]
+    assert not hasattr(dropped[0], "__dict__")
+
+
+def test_json_decoders_agree_on_values_orjson_rejects_or_widens(monkeypatch):
+    lines = [
+        '{"ts":"2025-01-01T00:00:01Z","msg":123456789012345678901234567890}',
+        '{"ts":"2025-01-01T00:00:02Z","msg":NaN}',
+        '{"ts":"2025-01-01T00:00:03Z","msg":1e400}',
+        '{"ts":"2025-01-01T00:00:04Z","msg":"\\ud800"}',
+        "{bad",
+    ]
+    monkeypatch.setattr(parser_module, "_json_loads", parser_module.json.loads)
+    expected_events, expected_summary = parse_lines_with_summary(lines)
+
+    if parser_module.orjson is not None:
+        monkeypatch.setattr(parser_module, "_json_loads", parser_module._orjson_loads)
+    events, summary = parse_lines_with_summary(lines)
+
+    assert [event.to_dict() for event in events] == [
+        event.to_dict() for event in expected_events
+    ]
+    assert summary == expected_summary
+    assert events[0].message == "123456789012345678901234567890"
+
+
+def test_json_key_resolver_keeps_priority_after_learning():
+    lines = ['{"ts":"2025-01-01T00:00:00Z","severity":"warn","msg":"m"}'] * 4
+    lines.append(
+        '{"timestamp":"2025-01-01T00:00:09Z","ts":"2025-01-01T00:00:01Z",'
+        '"level":"error","severity":"warn","msg":"late"}'
+    )
+    lines.append('{"ts":"2025-01-01T00:00:02Z","severity":"","level":"debug","msg":"empty"}')
+    context = ParseContext(json_keys=JsonKeyResolver(learn_after=2))
+
+    events = [parse_line_with_reason(line, context)[0] for line in lines]
+
+    assert events[4].timestamp.isoformat() == "2025-01-01T00:00:09+00:00"
+    assert events[4].level == "ERROR"
+    assert events[5].level == "DEBUG"
+    assert events[0].component == "unknown"
+
+
+def test_parse_file_with_summary_reads_compressed_input(tmp_path):
+    text = "2025-01-01T00:00:01Z INFO api: one\n\n2025-01-01T00:00:02Z ERROR db: two\n"
+    plain = tmp_path / "app.log"
+    plain.write_text(text, encoding="utf-8")
+    packed = tmp_path / "app.log.gz"
+    packed.write_bytes(gzip.compress(text.encode("utf-8")))
+
+    expected_events, expected_summary = parse_file_with_summary(plain)
+    events, summary = parse_file_with_summary(packed)
+    pooled_events, pooled_summary = parse_file_with_summary(packed, workers=2)
+
+    assert events == expected_events == pooled_events
+    assert summary.pop("compression") == {
+        "format": "gzip",
+        "compressed_bytes": packed.stat().st_size,
+        "uncompressed_bytes": len(text),
+    }
+    assert summary == expected_summary
+    assert pooled_summary.pop("compression")["uncompressed_bytes"] == len(text)
+    assert pooled_summary == expected_summary
+
+
+@pytest.mark.parametrize("block_bytes", [1, 16, 1024 * 1024])
+def test_mmap_reader_matches_text_reader(tmp_path, monkeypatch, block_bytes):
+    sample = tmp_path / "mixed.log"
+    sample.write_bytes(
+        b"2025-01-01T00:00:01Z INFO api: one\n"
+        b"\n   \n\t\n"
+        b'{"ts":"2025-01-01T00:00:02Z","msg":"caf\xc3\xa9"}\r\n'
+        b"\xc2\xa0\n"
+        b"2025-01-01T00:00:03Z WARN db: lone\rnot a log line\n"
+        b"  "
+    )
+    monkeypatch.setattr(parser_module, "_SCAN_BLOCK_BYTES", block_bytes)
+
+    expected = parse_file_with_summary(sample, options=ParseOptions(reader="text"))
+    mapped = parse_file_with_summary(sample, options=ParseOptions(reader="mmap"))
+
+    assert mapped == expected
+    assert expected[1]["total_lines"] == 9
+    assert expected[1]["dropped_reasons"]["blank_line"] == 5
+
+
+def test_mmap_reader_counts_blank_lines_without_parsing_them(tmp_path, monkeypatch):
+    sample = tmp_path / "blank.log"
+    sample.write_text("2025-01-01T00:00:01Z INFO api: one\n\n \n\n", encoding="utf-8")
+    seen: list[str] = []
+    parse = parser_module.parse_line_with_reason
+    monkeypatch.setattr(
+        parser_module,
+        "parse_line_with_reason",
+        lambda line, context=None: (seen.append(line), parse(line, context))[1],
+    )
+
+    _, summary = parse_file_with_summary(sample, options=ParseOptions(reader="mmap"))
+
+    assert seen == ["2025-01-01T00:00:01Z INFO api: one"]
+    assert summary["total_lines"] == 4
+    assert summary["dropped_reasons"] == {"blank_line": 3}
+
+
+def test_parse_options_rejects_unknown_reader():
+    with pytest.raises(ValueError, match="reader must be one of"):
+        ParseOptions(reader="fast")
+
+
+def test_time_window_skips_lines_before_building_events(tmp_path, monkeypatch):
+    sample = tmp_path / "window.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z INFO api: before\n"
+        '{"ts":"2025-01-01T00:00:02Z","level":"error","msg":"inside"}\n'
+        "not a log line\n"
+        "2025-01-01T00:00:03Z WARN db: inside too\n"
+        '{"ts":"2025-01-01T00:00:09Z","msg":"after"}\n',
+        encoding="utf-8",
+    )
+    options = ParseOptions(
+        since=datetime(2025, 1, 1, 0, 0, 2, tzinfo=timezone.utc),
+        until=datetime(2025, 1, 1, 0, 0, 3, tzinfo=timezone.utc),
+    )
+    built: list[str] = []
+    monkeypatch.setattr(
+        parser_module, "extract_correlation_id", lambda message: built.append(message)
+    )
+
+    events, summary = parse_file_with_summary(sample, options=options)
+    _, pooled_summary = parse_file_with_summary(
+        sample, workers=2, chunk_bytes=16, options=options
+    )
+
+    assert [event.message for event in events] == built == ["inside", "inside too"]
+    assert summary == pooled_summary == {
+        "total_lines": 5,
+        "parsed_lines": 2,
+        "skipped_lines": 2,
+        "dropped_lines": 1,
+        "drop_ratio": round(1 / 3, 6),
+        "dropped_reasons": {"unrecognized_text": 1},
+    }
+    assert merge_parse_summaries([summary, summary])["skipped_lines"] == 4
+    assert "skipped_lines" not in parse_file_with_summary(sample)[1]
+
+
+def test_event_filter_skips_lines_before_parsing_timestamps(tmp_path, monkeypatch):
+    sample = tmp_path / "filtered.log"
+    sample.write_text(
+        "2025-01-01T00:00:01Z DEBUG db: cache warm\n"
+        "2025-01-01T00:00:02Z ERROR db-replica: lag cid=c-1\n"
+        '{"ts":"2025-01-01T00:00:03Z","level":"error","component":"api","msg":"timeout"}\n'
+        "2025-01-01T00:00:04Z WARN db: slow query\n"
+        "not a log line\n"
+        '{"ts":"2025-01-01T00:00:09Z","level":"fatal","component":"db","msg":"down"}\n',
+        encoding="utf-8",
+    )
+    options = ParseOptions(event_filter=EventFilter(min_level="warn", components=("db*",)))
+    parsed: list[str] = []
+    original = parser_module._source_timestamp_provenance
+    monkeypatch.setattr(
+        parser_module,
+        "_source_timestamp_provenance",
+        lambda value: parsed.append(value) or original(value),
+    )
+
+    events, summary = parse_file_with_summary(sample, options=options)
+    _, pooled_summary = parse_file_with_summary(
+        sample, workers=2, chunk_bytes=16, options=options
+    )
+
+    assert [event.message for event in events] == ["lag cid=c-1", "slow query", "down"]
+    assert "2025-01-01T00:00:01Z" not in parsed and "2025-01-01T00:00:02Z" in parsed
+    assert "2025-01-01T00:00:03Z" not in parsed
+    assert summary == pooled_summary == {
+        "total_lines": 6,
+        "parsed_lines": 3,
+        "skipped_lines": 2,
+        "dropped_lines": 1,
+        "drop_ratio": 0.25,
+        "dropped_reasons": {"unrecognized_text": 1},
+    }
+
+
+def test_parse_options_rejects_naive_window():
+    with pytest.raises(ValueError, match="timezone-aware"):
+        ParseOptions(since=datetime(2025, 1, 1))
+
+
+def test_first_error_timestamp_only_counts_error_events(tmp_path):
+    sample = tmp_path / "errors.log"
+    sample.write_text(
+        "2025-01-01T00:00:05Z CRITICAL db: pool exhausted\n"
+        "2025-01-01T00:00:01Z INFO api: errors=0 in cache\n"
+        "2025-01-01T00:00:03Z WARN worker: saw Error in job\n"
+        "2025-01-01T00:00:00Z INFO api: fine\n",
+        encoding="utf-8",
+    )
+
+    assert first_error_timestamp(sample) == datetime(2025, 1, 1, 0, 0, 1, tzinfo=timezone.utc)
@@ -0,0 +1,76 @@
+import pytest
+
+import triage_toolkit.rates as rates_module
+from triage_toolkit.batch import EventBatch
+from triage_toolkit.parser import parse_lines_with_summary
+from triage_toolkit.rates import MAX_BUCKETS, detect_bursts, rate_histogram
+
+
+def _batch(*lines):
+    events, _ = parse_lines_with_summary(lines)
+    return EventBatch.from_events(events)
+
+
+def test_rate_histogram_counts_by_bucket_level_and_component(monkeypatch):
+    batch = _batch(
+        "2025-01-01T00:00:59Z INFO api: ok",
+        "2025-01-01T00:02:10Z ERROR db: refused",
+        "2025-01-01T00:00:05Z WARN api: slow",
+        "2025-01-01T00:02:59Z INFO db: error budget low",
+    )
+
+    histogram = rate_histogram(batch, 60_000_000)
+    monkeypatch.setattr(rates_module, "numpy", None)
+    fallback = rate_histogram(batch, 60_000_000)
+
+    assert histogram == fallback
+    assert histogram.bucket_start_us(0) == batch.timestamps[2] - 5_000_000
+    assert histogram.totals == [2, 0, 2]
+    assert histogram.errors == [0, 0, 2]
+    assert histogram.levels == {"INFO": [1, 0, 1], "ERROR": [0, 0, 1], "WARN": [1, 0, 0]}
+    assert histogram.components == {"api": [2, 0, 0], "db": [0, 0, 2]}
+
+
+def test_long_spans_widen_buckets_to_the_row_limit():
+    batch = _batch("2025-01-01T00:00:00Z INFO api: start", "2025-01-03T00:00:00Z INFO api: end")
+
+    histogram = rate_histogram(batch, 1_000_000)
+
+    assert len(histogram) <= MAX_BUCKETS
+    assert histogram.bucket_us % 1_000_000 == 0
+    assert sum(histogram.totals) == 2
+    with pytest.raises(ValueError, match="bucket width"):
+        rate_histogram(batch, 0)
+
+
+def test_bursts_mark_jumps_above_the_ewma_baseline():
+    steady = [1, 0, 2, 1, 1, 0, 1]
+    bursts = detect_bursts([*steady, 12, 15, 9, 1, 1, 0, 1, 2, 14])
+
+    assert [(burst.first, burst.last, burst.errors, burst.peak_errors) for burst in bursts] == [
+        (7, 9, 36, 15),
+        (15, 15, 14, 14),
+    ]
+    assert bursts[0].baseline < 2 and bursts[0].z_score > 3
+    assert detect_bursts(steady) == []
+    # A jump from silence is a burst, but not one below the minimum count.
+    assert detect_bursts([0, 0, 3])[0].first == 2
+    assert detect_bursts([0, 0, 2]) == []
+
+
+def test_background_errors_seed_the_baseline_before_a_spike():
+    # Five errors a minute for an hour, with a spike at minutes 30-32.
+    counts = [5] * 30 + [50, 50, 50] + [5] * 27
+    bursts = detect_bursts(counts)
+
+    assert [(burst.first, burst.last, burst.errors) for burst in bursts] == [(30, 32, 150)]
+    assert bursts[0].baseline == 5.0
+    assert detect_bursts([5] * 60) == []
+
+
+def test_long_bursts_feed_the_baseline_until_it_catches_up():
+    bursts = detect_bursts([1] * 10 + [20] * 40)
+
+    assert len(bursts) == 1
+    assert bursts[0].first == 10
+    assert bursts[0].last < 20
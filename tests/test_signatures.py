@@ -0,0 +1,36 @@
+import re
+
+from triage_toolkit.signatures import SignatureNormalizer, normalize_message
+
+_DIGIT_RE = re.compile(r"\d+")
+_CORR_RE = re.compile(r"(?:correlation_id|cid)=[A-Za-z0-9-]+", re.IGNORECASE)
+
+
+def _two_pass(message):
+    text = message.lower().strip()
+    return _DIGIT_RE.sub("#", _CORR_RE.sub("cid=<id>", text))
+
+
+def test_single_pass_matches_two_substitutions():
+    messages = [
+        "  Timeout after 30s cid=AB-12 retry 3  ",
+        "correlation_id=x9 failed; acid=7 and cid= empty",
+        "Kelvin K cid=K1 and ß ſid=5",
+        "no digits here",
+        "id=12 port 8080",
+        "",
+    ]
+    for message in messages:
+        assert normalize_message(message) == _two_pass(message)
+
+
+def test_normalizer_memoizes_in_bounded_lru():
+    normalizer = SignatureNormalizer(cache_size=2)
+
+    assert normalizer("Error 1") == "error #"
+    assert normalizer("Error 1") == "error #"
+    normalizer("Error 2")
+    normalizer("Error 3")  # evicts "Error 1"
+    normalizer("Error 1")
+
+    assert normalizer.cache_stats() == {"hits": 1, "misses": 4, "hit_ratio": 0.2}
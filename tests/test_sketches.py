@@ -0,0 +1,50 @@
+import random
+from collections import Counter
+
+import pytest
+
+from triage_toolkit.sketches import SpaceSaving
+
+
+def test_counts_are_exact_within_capacity():
+    sketch = SpaceSaving(capacity=4)
+    sketch.update(["a", "b", "a", "c"])
+    sketch.update({"b": 2, "d": 1})
+
+    assert sketch.top(3) == [("b", 3, 0), ("a", 2, 0), ("c", 1, 0)]
+    assert sketch.total == 7
+    assert sketch.max_error == 0
+
+
+def test_error_bounds_bracket_true_counts():
+    rng = random.Random(7)
+    stream = [f"msg-{min(int(rng.paretovariate(1.2)), 500)}" for _ in range(20_000)]
+    exact = Counter(stream)
+    sketch = SpaceSaving(capacity=50)
+    sketch.update(stream)
+
+    assert len(sketch) == 50
+    assert sketch.total == len(stream)
+    for item, count, error in sketch.top(50):
+        assert count - error <= exact[item] <= count
+    monitored = {item for item, _, _ in sketch.top(50)}
+    assert all(exact[item] <= sketch.max_error for item in exact if item not in monitored)
+    assert sketch.max_error <= len(stream) // 50
+    heavy = {item for item, count in exact.items() if count > len(stream) / 50}
+    assert heavy <= monitored
+    assert [item for item, _, _ in sketch.top(3)] == [item for item, _ in exact.most_common(3)]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=0)
+
+
+def test_add_reports_the_evicted_item():
+    sketch = SpaceSaving(capacity=2)
+
+    assert sketch.add("a", 3) is None
+    assert sketch.add("b") is None
+    assert sketch.add("c") == "b"
+    assert sketch.estimate("c") == (2, 1)
+    assert sketch.estimate("b") == (0, 0)
@@ -0,0 +1,86 @@
+from triage_toolkit.aggregate import IncidentAggregator
+from triage_toolkit.parser import parse_line
+from triage_toolkit.templates import TemplateMiner, mask_message, template_state_path
+
+
+def test_mask_message_hides_ids_addresses_paths_and_durations():
+    tokens = mask_message(
+        "Timeout after 250ms for 5f0c1a2b-1234-4abc-9def-0123456789ab at 10.0.0.12:8080 "
+        "reading /var/data/blk_7.bin block 0xdeadbeef cid=ab-1"
+    )
+
+    assert tokens == [
+        "timeout", "after", "<*>", "for", "<*>", "at", "<*>",
+        "reading", "<*>", "block", "<*>", "cid=<*>",
+    ]  # fmt: skip
+
+
+def test_miner_clusters_variants_and_generalizes_templates():
+    miner = TemplateMiner()
+    first = miner("connection refused by upstream alpha")
+    second = miner("connection refused by upstream beta")
+    other = miner("connection reset by peer")
+
+    assert first == second != other
+    assert miner.signature(first) == "connection refused by upstream <*>"
+    assert miner.signature(other) == "connection reset by peer"
+    assert miner("connection refused by upstream alpha") == first
+    assert miner.cache_stats()["hits"] == 1
+
+
+def test_miner_state_round_trips_and_is_reused(tmp_path):
+    miner = TemplateMiner()
+    messages = ("disk full on sda", "disk full on sdb", "queue stalled")
+    ids = [miner(message) for message in messages]
+    assert ids[0] == ids[1] != ids[2]
+    miner.save()
+
+    restored = TemplateMiner.load()
+    assert [restored.add(message) for message in ("disk full on sdc", "queue stalled")] == [
+        ids[0],
+        ids[2],
+    ]
+    assert restored.signature(ids[0]) == "disk full on <*>"
+
+    template_state_path().write_text("{not json", encoding="utf-8")
+    assert len(TemplateMiner.load()) == 0
+
+
+def test_aggregator_groups_errors_by_template():
+    lines = [
+        "2025-01-01T00:00:01Z ERROR api: user 5f0c1a2b-1234-4abc-9def-0123456789ab not found",
+        "2025-01-01T00:00:02Z ERROR api: user 6f0c1a2b-1234-4abc-9def-0123456789ab not found",
+        "2025-01-01T00:00:03Z ERROR db: lock wait on /var/lib/db/table_9",
+    ]
+    aggregator = IncidentAggregator(TemplateMiner())
+    for index, line in enumerate(lines):
+        aggregator.add(parse_line(line), 0, index)
+
+    assert [(text, count) for text, count, *_ in aggregator.error_signatures()] == [
+        ("user <*> not found", 2),
+        ("lock wait on <*>", 1),
+    ]
+
+
+def test_saved_state_keeps_the_most_recently_used_clusters():
+    miner = TemplateMiner(max_clusters=2)
+    for message in ("disk full", "queue stalled", "lock timeout", "disk full"):
+        miner(message)
+
+    assert len(miner) == 3
+    saved = [cluster["tokens"] for cluster in miner.to_dict()["clusters"]]
+    assert saved == [["lock", "timeout"], ["disk", "full"]]
+    restored = TemplateMiner.from_dict(miner.to_dict())
+    restored.add("lock timeout")
+    assert [cluster["tokens"] for cluster in restored.to_dict()["clusters"]][-1] == [
+        "lock",
+        "timeout",
+    ]
+
+
+def test_wildcard_child_counts_toward_max_children():
+    miner = TemplateMiner(max_children=3)
+    for first in ("alpha", "beta", "gamma", "delta"):
+        miner(f"{first} failed")
+
+    assert sorted(miner._root["2"]) == ["<*>", "alpha", "beta"]
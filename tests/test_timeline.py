@@ -1,7 +1,16 @@
-﻿from pathlib import Path
+﻿from io import StringIO
+from pathlib import Path
 
+import triage_toolkit.aggregate as aggregate_module
 from triage_toolkit.parser import parse_line
-from triage_toolkit.timeline import build_timeline
+from triage_toolkit.merge import sort_event_streams
+from triage_toolkit.timeline import (
+    TimelineAccumulator,
+    TimelineWriter,
+    analyze_incident,
+    build_timeline,
+    render_rate_timeline,
+)
 
 GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
 
@@ -49,3 +58,76 @@ def test_timeline_golden_output_is_deterministic():
     actual = build_timeline([event for event in events if event])
 
     assert actual == expected
+
+
+def test_timeline_accumulator_matches_build_timeline_for_out_of_order_sources():
+    sources = [
+        [
+            "2025-01-01T00:00:05Z ERROR api: timeout after 30s cid=a-1",
+            "2025-01-01T00:00:01Z INFO api: started",
+            "2025-01-01T00:00:05Z ERROR db: pool exhausted",
+        ],
+        [
+            "2025-01-01T00:00:05Z ERROR db: pool exhausted",
+            "2025-01-01T00:00:03Z WARN api: timeout after 12s cid=b-2 | retrying",
+            "2025-01-01T00:00:02Z INFO worker: saw error in job 7",
+        ],
+    ]
+    streams = [[parse_line(line) for line in lines] for lines in sources]
+    accumulator = TimelineAccumulator()
+    assert accumulator.render() == build_timeline([])
+
+    # Interleave sources the way polling does; render() must not depend on arrival order.
+    for event_index in range(3):
+        for source_index, events in enumerate(streams):
+            accumulator.add(events[event_index], source_index, event_index)
+
+    assert len(accumulator) == 6
+    assert accumulator.render() == build_timeline(list(sort_event_streams(streams)))
+
+
+def test_timeline_writer_streams_build_timeline_output(monkeypatch):
+    monkeypatch.setattr(aggregate_module, "_STREAM_CHUNK_ROWS", 2)
+    lines = [
+        "2025-01-01T00:00:01Z INFO api: started",
+        "2025-01-01T00:00:02Z ERROR db: pool exhausted",
+        "2025-01-01T00:00:02Z ERROR api: timeout after 12s",
+        "2025-01-01T00:00:03Z WARN worker: saw error in job 7",
+        "2025-01-01T00:00:05Z ERROR db: pool exhausted",
+    ]
+    events = [parse_line(line) for line in lines]
+    stream = StringIO()
+    writer = TimelineWriter(stream)
+
+    assert writer.write_events(events[:2]) == 2
+    # A second call rewinds, as a merge restart does.
+    assert writer.write_events(events) == 5
+    assert stream.getvalue() == build_timeline(events)
+    assert writer.aggregator.error_signatures() == analyze_incident(
+        events
+    ).aggregator.error_signatures()
+
+    empty = StringIO()
+    TimelineWriter(empty).write_events([])
+    assert empty.getvalue() == build_timeline([])
+
+
+def test_rate_timeline_size_does_not_grow_with_event_count():
+    def incident(per_minute):
+        lines = []
+        for minute in range(10):
+            for second in range(per_minute):
+                lines.append(f"2025-01-01T00:{minute:02d}:{second:02d}Z INFO api: ok")
+            if minute >= 6:
+                for second in range(per_minute):
+                    lines.append(f"2025-01-01T00:{minute:02d}:{second:02d}Z ERROR db: refused")
+        return [parse_line(line) for line in lines]
+
+    small = render_rate_timeline(analyze_incident(incident(5)))
+    large = render_rate_timeline(analyze_incident(incident(50)))
+
+    assert small.count("\n") == large.count("\n")
+    assert "Probable start: `2025-01-01T00:06:00+00:00`" in large
+    assert "| 2025-01-01T00:06:00+00:00 | 100 | 50 | 50 | 50 |" in large
+    assert "| Bucket (UTC) | api | db |" in large
+    assert "## Notable Errors\n- refused (count: 200" in large
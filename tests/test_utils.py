@@ -1,4 +1,4 @@
-from triage_toolkit.utils import parse_timestamp
+from triage_toolkit.utils import TimestampParser, parse_timestamp
 
 
 def test_parse_timestamp_empty_value_returns_none():
@@ -26,3 +26,44 @@ def test_parse_timestamp_invalid_z_value_returns_none():
 
 def test_parse_timestamp_invalid_value_returns_none():
     assert parse_timestamp("not-a-timestamp") is None
+
+
+def test_timestamp_parser_matches_cascade_for_sniffed_iso_source():
+    parser = TimestampParser()
+    values = [
+        "2025-01-01T05:04:05+02:00",
+        "2025-01-01T05:04:05.123-05:30",
+        "2025-01-01 03:04:05",
+        "2025-99-99T03:04:05Z",
+        "not-a-timestamp",
+        "  2025-01-01T03:04:05Z  ",
+    ]
+
+    assert [parser(value) for value in values] == [parse_timestamp(value) for value in values]
+
+
+def test_timestamp_parser_caches_strptime_format_and_falls_back_on_miss():
+    parser = TimestampParser()
+
+    first = parser("2025-1-2 03:04:05")
+    fallback = parser("2025-01-02T03:04:06Z")
+
+    assert first is not None and first.isoformat() == "2025-01-02T03:04:05+00:00"
+    assert fallback is not None and fallback.isoformat() == "2025-01-02T03:04:06+00:00"
+    assert parser("") is None
+
+
+def test_timestamp_parser_memoizes_repeated_second_resolution_values():
+    parser = TimestampParser(cache_size=2)
+
+    first = parser("2025-01-01T05:04:05+02:00")
+    again = parser("2025-01-01T05:04:05+02:00")
+    parser("2025-01-01T05:04:06+02:00")
+    parser("2025-01-01T05:04:07+02:00")
+    evicted = parser("2025-01-01T05:04:05+02:00")
+    fractional = parser("2025-01-01T05:04:05.250+02:00")
+
+    assert first is again
+    assert evicted == first
+    assert fractional is not None and fractional.isoformat() == "2025-01-01T03:04:05.250000+00:00"
+    assert parser.cache_stats() == {"hits": 1, "misses": 4, "hit_ratio": 0.2}
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from collections import Counter
+from itertools import compress
+from typing import Any, Hashable, Iterable, Iterator, Protocol
+
+from .batch import EventBatch, to_epoch_us
+from .models import LogEvent
+from .signatures import SignatureNormalizer
+from .sketches import SpaceSaving
+
+_ERROR_LEVELS = {"ERROR", "CRITICAL", "FATAL"}
+_SUMMARY_ERROR_LEVELS = {"ERROR"}
+# Rows per chunk when a merged stream is added with IncidentAggregator.add_stream.
+_STREAM_CHUNK_ROWS = 16 * 1024
+
+
+class SignatureEngine(Protocol):
+    """Maps a raw error message to a group key; :meth:`signature` renders a key as text.
+
+    :class:`~triage_toolkit.signatures.SignatureNormalizer` and
+    :class:`~triage_toolkit.templates.TemplateMiner` implement it.
+    """
+
+    def __call__(self, message: str) -> Hashable: ...
+
+    def signature(self, key: Any) -> str: ...
+
+    def cache_stats(self) -> dict[str, Any]: ...
+
+
+def is_error(event: LogEvent) -> bool:
+    if event.level.upper() in _ERROR_LEVELS:
+        return True
+    return "error" in event.message.lower()
+
+
+def error_mask(batch: EventBatch) -> bytearray:
+    """Columnar :func:`is_error` over every row of ``batch``."""
+    return batch.rows_with_message_text("error", batch.rows_with_levels(_ERROR_LEVELS))
+
+
+class IncidentAggregator:
+    """Incident statistics gathered in one pass over events added one at a time.
+
+    Keeps the window bounds, correlation coverage, per-component event counts and
+    ERROR-level message counts used by the summary, and for :func:`is_error` events the
+    normalized signature groups (count, first and last timestamp) and per-component error
+    counts used by the timeline and runbook. Memory grows with the number of distinct
+    components and messages, not with the number of events. With ``approx_capacity`` the
+    component and ERROR-message counters are :class:`SpaceSaving` sketches that keep at
+    most that many entries each, and so are the signature groups and per-component error
+    counts (:attr:`signature_counts` and :attr:`error_component_counts`): a group evicted
+    from its sketch is dropped, and one that returns later keeps the first and last
+    timestamps seen since then. With ``group_errors=False`` the :func:`is_error` events
+    are not examined at all, for callers such as the summary that only need the rest.
+
+    Events may arrive in any order. Each is keyed by ``(timestamp, source_index,
+    event_index)``, the merged timeline order, and ties between groups of equal count go to
+    the group whose first event comes first in that order.
+    """
+
+    def __init__(
+        self,
+        normalizer: SignatureEngine | None = None,
+        approx_capacity: int | None = None,
+        group_errors: bool = True,
+    ) -> None:
+        self.normalizer = SignatureNormalizer() if normalizer is None else normalizer
+        self.approx_capacity = approx_capacity
+        self.group_errors = group_errors
+        self.event_count = 0
+        self.error_count = 0
+        self.level_error_count = 0
+        self.correlated_count = 0
+        self.start_us: int | None = None
+        self.end_us: int | None = None
+        self.component_counts: Counter[str] | SpaceSaving
+        self.error_message_counts: Counter[str] | SpaceSaving
+        self.signature_counts: SpaceSaving | None = None
+        self.error_component_counts: SpaceSaving | None = None
+        if approx_capacity is None:
+            self.component_counts = Counter()
+            self.error_message_counts = Counter()
+        else:
+            self.component_counts = SpaceSaving(approx_capacity)
+            self.error_message_counts = SpaceSaving(approx_capacity)
+            self.signature_counts = SpaceSaving(approx_capacity)
+            self.error_component_counts = SpaceSaving(approx_capacity)
+        # signature engine key -> [count, first key, earliest us, latest us]
+        self._signatures: dict[Hashable, list[Any]] = {}
+        # component -> [error count, first key]
+        self._error_components: dict[str, list[Any]] = {}
+
+    def add(self, event: LogEvent, source_index: int = 0, event_index: int | None = None) -> None:
+        timestamp = to_epoch_us(event.timestamp)
+        if event_index is None:
+            event_index = self.event_count
+        self._add_bounds(timestamp, timestamp)
+        self.event_count += 1
+        self.component_counts.update((event.component,))
+        if event.correlation_id:
+            self.correlated_count += 1
+        if event.level.upper() in _SUMMARY_ERROR_LEVELS:
+            self.level_error_count += 1
+            self.error_message_counts.update((event.message,))
+        if self.group_errors and is_error(event):
+            self._add_error(
+                (timestamp, source_index, event_index), event.message, event.component
+            )
+
+    def add_batch(self, batch: EventBatch, source_index: int = 0) -> None:
+        """Add every row of ``batch``; row numbers are the event indexes.
+
+        Totals come from columnar scans; only error rows are visited one by one.
+        """
+        rows = len(batch)
+        if not rows:
+            return
+        timestamps = batch.timestamps
+        self._add_bounds(min(timestamps), max(timestamps))
+        self.event_count += rows
+        self.component_counts.update(batch.component_counts())
+        self.correlated_count += sum(map(bool, batch.correlation_ids))
+
+        level_errors = list(
+            compress(range(rows), batch.rows_with_levels(_SUMMARY_ERROR_LEVELS))
+        )
+        self.level_error_count += len(level_errors)
+        self.error_message_counts.update(batch.message(row) for row in level_errors)
+        if not self.group_errors:
+            return
+
+        component_codes = batch.component_codes
+        components = batch.components
+        error_rows = sorted(compress(range(rows), error_mask(batch)), key=timestamps.__getitem__)
+        if self.approx_capacity is not None:
+            # Pre-grouping would hold every distinct message of the batch; fold rows one by
+            # one instead so memory stays within the sketches.
+            for row in error_rows:
+                self._add_error(
+                    (timestamps[row], source_index, row),
+                    batch.message(row),
+                    components[component_codes[row]],
+                )
+            return
+
+        # Group error rows by raw message and component first, so each distinct message is
+        # normalized and merged once. Rows are visited in timeline order, so the first row
+        # of a group is its earliest and the last row its latest.
+        groups: dict[tuple[str, int], list[int]] = {}
+        for row in error_rows:
+            group_key = (batch.message(row), component_codes[row])
+            group = groups.get(group_key)
+            if group is None:
+                groups[group_key] = [1, row, row]
+            else:
+                group[0] += 1
+                group[2] = row
+        for (message, code), (count, first, last) in groups.items():
+            self._add_error(
+                (timestamps[first], source_index, first),
+                message,
+                components[code],
+                count,
+                timestamps[last],
+            )
+
+    def add_stream(self, events: Iterable[LogEvent]) -> Iterator[LogEvent]:
+        """Pass ``events`` through, adding them one columnar chunk at a time.
+
+        ``events`` must arrive in timeline order, as a merge yields them. Chunks are added
+        as sources numbered in that order, so the ``(timestamp, chunk, row)`` keys follow
+        the arrival order and ties rank as for one :meth:`add_batch` over every event. Only
+        one chunk is held; the last is added when the returned iterator is exhausted.
+        """
+        chunk = EventBatch()
+        number = 0
+        for event in events:
+            chunk.append(event)
+            yield event
+            if len(chunk) >= _STREAM_CHUNK_ROWS:
+                self.add_batch(chunk, number)
+                chunk = EventBatch()
+                number += 1
+        self.add_batch(chunk, number)
+
+    def _add_bounds(self, start: int, end: int) -> None:
+        if self.start_us is None or start < self.start_us:
+            self.start_us = start
+        if self.end_us is None or end > self.end_us:
+            self.end_us = end
+
+    def _add_error(
+        self,
+        key: tuple[int, int, int],
+        message: str,
+        component: str,
+        count: int = 1,
+        last_us: int | None = None,
+    ) -> None:
+        """Fold ``count`` error events sharing ``message`` and ``component`` into the groups.
+
+        ``key`` belongs to the earliest of them and ``last_us`` is the latest timestamp.
+        """
+        self.error_count += count
+        first_us = key[0]
+        if last_us is None:
+            last_us = first_us
+        signature = self.normalizer(message)
+        _track(self._signatures, self.signature_counts, signature, count)
+        group = self._signatures.get(signature)
+        if group is None:
+            self._signatures[signature] = [count, key, first_us, last_us]
+        else:
+            group[0] += count
+            if key < group[1]:
+                group[1] = key
+            if first_us < group[2]:
+                group[2] = first_us
+            if last_us > group[3]:
+                group[3] = last_us
+
+        _track(self._error_components, self.error_component_counts, component, count)
+        counts = self._error_components.get(component)
+        if counts is None:
+            self._error_components[component] = [count, key]
+        else:
+            counts[0] += count
+            if key < counts[1]:
+                counts[1] = key
+
+    def error_signatures(self) -> list[tuple[str, int, int, int]]:
+        """``(signature, count, first_us, last_us)`` by count, then first occurrence.
+
+        Keys are rendered as text now, so template clusters that ended up with the same
+        template are reported as one group. Under ``approx_capacity`` counts are the
+        :attr:`signature_counts` estimates, which may overstate by up to its ``max_error``.
+        """
+        merged: dict[str, list[Any]] = {}
+        signature = self.normalizer.signature
+        sketch = self.signature_counts
+        for key, (count, first_key, first_us, last_us) in self._signatures.items():
+            if sketch is not None:
+                count = sketch.estimate(key)[0]
+            text = signature(key)
+            group = merged.get(text)
+            if group is None:
+                merged[text] = [count, first_key, first_us, last_us]
+            else:
+                group[0] += count
+                group[1] = min(group[1], first_key)
+                group[2] = min(group[2], first_us)
+                group[3] = max(group[3], last_us)
+        ranked = sorted(merged.items(), key=lambda item: (-item[1][0], item[1][1]))
+        return [(text, count, first, last) for text, (count, _, first, last) in ranked]
+
+    def top_error_components(self, limit: int) -> list[tuple[str, int]]:
+        """Components with the most error events, ties by first occurrence.
+
+        Under ``approx_capacity`` counts are :attr:`error_component_counts` estimates.
+        """
+        sketch = self.error_component_counts
+        groups = self._error_components
+        if sketch is None:
+            counts = {component: count for component, (count, _) in groups.items()}
+        else:
+            counts = {component: sketch.estimate(component)[0] for component in groups}
+        ranked = sorted(groups, key=lambda component: (-counts[component], groups[component][1]))
+        return [(component, counts[component]) for component in ranked[:limit]]
+
+
+def _track(
+    groups: dict[Any, list[Any]], sketch: SpaceSaving | None, key: Hashable, count: int
+) -> None:
+    """Count ``key`` in ``sketch``, if any, and drop the group of the key it evicts."""
+    if sketch is not None:
+        evicted = sketch.add(key, count)
+        if evicted is not None:
+            del groups[evicted]
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Collection, Iterable, Iterator
+
+from .models import LogEvent
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+_FILE_MAGIC = b"TTEB"
+_FILE_VERSION = 1
+_HEADER_LENGTH = struct.Struct("<I")
+_ARRAY_COLUMNS = ("timestamps", "level_codes", "component_codes", "message_offsets")
+_STRING_COLUMNS = ("correlation_ids", "source_timestamps", "source_offsets", "raws")
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _Dictionary:
+    """Interns repeated strings as small integer codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class EventBatch:
+    """Columnar store for parsed events.
+
+    Timestamps are UTC epoch microseconds in an ``array('q')``, ``level`` and
+    ``component`` are dictionary-encoded codes, and messages live in one contiguous string
+    table addressed by offsets. Aggregations such as component counts and error filters
+    run as scans over these columns instead of attribute access on per-event objects.
+    Iterating a batch yields equivalent :class:`LogEvent` objects.
+    """
+
+    __slots__ = (
+        "timestamps",
+        "level_codes",
+        "component_codes",
+        "message_offsets",
+        "correlation_ids",
+        "source_timestamps",
+        "source_offsets",
+        "raws",
+        "_levels",
+        "_components",
+        "_message_table",
+        "_pending_messages",
+    )
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.level_codes = array("I")
+        self.component_codes = array("I")
+        self.message_offsets = array("q", [0])
+        self.correlation_ids: list[str | None] = []
+        self.source_timestamps: list[str | None] = []
+        self.source_offsets: list[str | None] = []
+        self.raws: list[str | None] = []
+        self._levels = _Dictionary()
+        self._components = _Dictionary()
+        self._message_table = ""
+        self._pending_messages: list[str] = []
+
+    @classmethod
+    def from_events(cls, events: Iterable[LogEvent]) -> EventBatch:
+        batch = cls()
+        batch.extend(events)
+        return batch
+
+    def append(self, event: LogEvent) -> None:
+        self.timestamps.append(to_epoch_us(event.timestamp))
+        self.level_codes.append(self._levels.code(event.level))
+        self.component_codes.append(self._components.code(event.component))
+        self._pending_messages.append(event.message)
+        self.message_offsets.append(self.message_offsets[-1] + len(event.message))
+        self.correlation_ids.append(event.correlation_id)
+        self.source_timestamps.append(event.source_timestamp)
+        self.source_offsets.append(event.source_offset)
+        self.raws.append(event.raw)
+
+    def extend(self, events: Iterable[LogEvent]) -> None:
+        for event in events:
+            self.append(event)
+
+    def extend_batch(self, other: EventBatch) -> None:
+        """Append every row of ``other`` column by column, re-coding its dictionaries."""
+        levels = [self._levels.code(name) for name in other.levels]
+        components = [self._components.code(name) for name in other.components]
+        self.timestamps.extend(other.timestamps)
+        self.level_codes.extend(levels[code] for code in other.level_codes)
+        self.component_codes.extend(components[code] for code in other.component_codes)
+        base = self.message_offsets[-1]
+        self.message_offsets.extend(base + offset for offset in other.message_offsets[1:])
+        self._pending_messages.append(other.message_table)
+        for name in _STRING_COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[LogEvent]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> LogEvent:
+        return LogEvent(
+            timestamp=self.timestamp(index),
+            level=self.level(index),
+            component=self.component(index),
+            message=self.message(index),
+            correlation_id=self.correlation_ids[index],
+            raw=self.raws[index],
+            source_timestamp=self.source_timestamps[index],
+            source_offset=self.source_offsets[index],
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "timestamps": self.timestamps,
+            "level_codes": self.level_codes,
+            "component_codes": self.component_codes,
+            "message_offsets": self.message_offsets,
+            "correlation_ids": self.correlation_ids,
+            "source_timestamps": self.source_timestamps,
+            "source_offsets": self.source_offsets,
+            "raws": self.raws,
+            "levels": self.levels,
+            "components": self.components,
+            "message_table": self.message_table,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.timestamps = state["timestamps"]
+        self.level_codes = state["level_codes"]
+        self.component_codes = state["component_codes"]
+        self.message_offsets = state["message_offsets"]
+        self.correlation_ids = state["correlation_ids"]
+        self.source_timestamps = state["source_timestamps"]
+        self.source_offsets = state["source_offsets"]
+        self.raws = state["raws"]
+        self._levels = _Dictionary(state["levels"])
+        self._components = _Dictionary(state["components"])
+        self._message_table = state["message_table"]
+        self._pending_messages = []
+
+    def dump(self, handle: BinaryIO) -> None:
+        """Write the batch in a compact binary columnar format; see :meth:`load`.
+
+        Numeric columns are raw array bytes, the message table is UTF-8 text, and the
+        sparse string columns are JSON arrays. Nothing is pickled.
+        """
+        message_table = self.message_table.encode("utf-8")
+        string_columns = [
+            json.dumps(getattr(self, name), separators=(",", ":")).encode("utf-8")
+            for name in _STRING_COLUMNS
+        ]
+        arrays = [getattr(self, name) for name in _ARRAY_COLUMNS]
+        header = json.dumps(
+            {
+                "version": _FILE_VERSION,
+                "byteorder": sys.byteorder,
+                "levels": self.levels,
+                "components": self.components,
+                "lengths": [len(column) for column in arrays]
+                + [len(message_table)]
+                + [len(column) for column in string_columns],
+            }
+        ).encode("utf-8")
+        handle.write(_FILE_MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+        for column in arrays:
+            column.tofile(handle)
+        handle.write(message_table)
+        for column in string_columns:
+            handle.write(column)
+
+    @classmethod
+    def load(cls, handle: BinaryIO) -> EventBatch:
+        """Read a batch written by :meth:`dump`; raises ``ValueError`` if it is malformed."""
+        prefix = handle.read(len(_FILE_MAGIC) + _HEADER_LENGTH.size)
+        if len(prefix) != len(_FILE_MAGIC) + _HEADER_LENGTH.size or not prefix.startswith(
+            _FILE_MAGIC
+        ):
+            raise ValueError("not an event batch file")
+        (header_length,) = _HEADER_LENGTH.unpack(prefix[len(_FILE_MAGIC) :])
+        header = json.loads(handle.read(header_length))
+        if header.get("version") != _FILE_VERSION:
+            raise ValueError(f"unsupported event batch version: {header.get('version')}")
+
+        lengths = iter(header["lengths"])
+        state: dict[str, Any] = {"levels": header["levels"], "components": header["components"]}
+        for name, typecode in zip(_ARRAY_COLUMNS, ("q", "I", "I", "q")):
+            column = array(typecode)
+            try:
+                column.fromfile(handle, next(lengths))
+            except EOFError as exc:
+                raise ValueError("truncated event batch file") from exc
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+            state[name] = column
+        state["message_table"] = _read_exact(handle, next(lengths)).decode("utf-8")
+        for name in _STRING_COLUMNS:
+            state[name] = json.loads(_read_exact(handle, next(lengths)))
+
+        rows = len(state["timestamps"])
+        if len(state["message_offsets"]) != rows + 1 or any(
+            len(state[name]) != rows for name in _STRING_COLUMNS
+        ):
+            raise ValueError("inconsistent event batch columns")
+        batch = cls.__new__(cls)
+        batch.__setstate__(state)
+        return batch
+
+    @property
+    def levels(self) -> list[str]:
+        return self._levels.values
+
+    @property
+    def components(self) -> list[str]:
+        return self._components.values
+
+    @property
+    def message_table(self) -> str:
+        if self._pending_messages:
+            self._message_table += "".join(self._pending_messages)
+            self._pending_messages = []
+        return self._message_table
+
+    def timestamp(self, index: int) -> datetime:
+        return from_epoch_us(self.timestamps[index])
+
+    def level(self, index: int) -> str:
+        return self._levels.values[self.level_codes[index]]
+
+    def component(self, index: int) -> str:
+        return self._components.values[self.component_codes[index]]
+
+    def message(self, index: int) -> str:
+        offsets = self.message_offsets
+        return self.message_table[offsets[index] : offsets[index + 1]]
+
+    def sorted_indices(self) -> list[int]:
+        """Row indices in timestamp order; ties keep insertion order."""
+        return sorted(range(len(self)), key=self.timestamps.__getitem__)
+
+    def rows_with_levels(self, levels: Collection[str]) -> bytearray:
+        """Mask of rows whose upper-cased level is in ``levels``."""
+        wanted = bytes(1 if name.upper() in levels else 0 for name in self.levels)
+        if len(wanted) <= 256:
+            # Codes fit in a byte, so the lookup runs as one C-level translate.
+            return bytearray(array("B", self.level_codes)).translate(wanted.ljust(256, b"\0"))
+        return bytearray(wanted[code] for code in self.level_codes)
+
+    def rows_with_message_text(self, needle: str, mask: bytearray | None = None) -> bytearray:
+        """Mask of rows whose lower-cased message contains the lower-case ASCII ``needle``.
+
+        Matches are OR-ed into ``mask`` when one is given.
+        """
+        if mask is None:
+            mask = bytearray(len(self))
+        table = self.message_table
+        lowered = table.lower()
+        if len(lowered) != len(table):
+            # Some characters change length when lower-cased; offsets no longer line up.
+            for index in range(len(self)):
+                if needle in self.message(index).lower():
+                    mask[index] = 1
+            return mask
+
+        offsets = self.message_offsets
+        position = lowered.find(needle)
+        while position != -1:
+            row = bisect_right(offsets, position) - 1
+            end = offsets[row + 1]
+            if position + len(needle) <= end:
+                mask[row] = 1
+                position = lowered.find(needle, end)
+            else:
+                position = lowered.find(needle, position + 1)
+        return mask
+
+    def component_counts(self, rows: Iterable[int] | None = None) -> Counter[str]:
+        """Count components over all rows or the given ``rows``.
+
+        Like ``Counter``, ties keep the order in which components were first counted.
+        """
+        codes = self.component_codes
+        counts = Counter(codes) if rows is None else Counter(codes[row] for row in rows)
+        names = self.components
+        return Counter({names[code]: count for code, count in counts.items()})
+
+
+def _read_exact(handle: BinaryIO, size: int) -> bytes:
+    data = handle.read(size)
+    if len(data) != size:
+        raise ValueError("truncated event batch file")
+    return data
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+import struct
+import tempfile
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from . import __version__
+from .batch import EventBatch
+from .correlation import CorrelationIndex
+from .models import LogEvent
+from .parser import ParseOptions
+from .utils import cache_dir, sampled_digests, write_atomically
+
+CACHE_MAX_BYTES_ENV = "TRIAGE_CACHE_MAX_BYTES"
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+# An entry is the magic, a run of EventBatch segments, then a JSON trailer holding the parse
+# summary and the segment offsets, its length, and the magic again.
+_ENTRY_MAGIC = b"TTPC"
+_ENTRY_VERSION = 2
+_ENTRY_SUFFIX = ".parse"
+_CORRELATION_SUFFIX = ".cids"
+_TRAILER_LENGTH = struct.Struct("<I")
+_FOOTER_BYTES = _TRAILER_LENGTH.size + len(_ENTRY_MAGIC)
+# Rows per segment: the most a streaming writer or reader holds in memory at once.
+_SEGMENT_ROWS = 16 * 1024
+
+
+@dataclass(frozen=True)
+class ParseCacheKey:
+    """Identity of one input file's parse: where it is, what it contains, how it was parsed."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    name: str
+
+    def still_matches(self) -> bool:
+        """True while the file still has the size and mtime it had when it was hashed."""
+        try:
+            file_stat = self.path.stat()
+        except OSError:
+            return False
+        return (file_stat.st_size, file_stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+
+def parse_cache_dir() -> Path:
+    return cache_dir() / "parse"
+
+
+def max_cache_bytes() -> int:
+    """Size budget for cached parses: ``$TRIAGE_CACHE_MAX_BYTES`` or 1 GiB."""
+    try:
+        return max(0, int(os.environ[CACHE_MAX_BYTES_ENV]))
+    except (KeyError, ValueError):
+        return DEFAULT_CACHE_MAX_BYTES
+
+
+def parse_cache_key(
+    path: Path, options: ParseOptions, schema_version: str
+) -> ParseCacheKey | None:
+    """Key for ``path`` parsed with ``options``, or ``None`` when it cannot be cached.
+
+    The key covers the resolved path, size, mtime, device and inode, digests of the first
+    and last 4 KiB, the parse schema version, the toolkit version, ``keep_raw`` and the
+    time window and filters. Computing it reads only those samples, so a lookup stays cheap
+    on huge inputs and on windowed parses that seek with a time index. Parses with
+    ``verbose_stats`` are not cached, since their counters describe the work actually done.
+    Unreadable inputs are not cached either; the parse that follows reports the error.
+    """
+    if options.verbose_stats:
+        return None
+    try:
+        with path.open("rb") as handle:
+            file_stat = os.fstat(handle.fileno())
+            if not stat.S_ISREG(file_stat.st_mode):
+                return None
+            digests = sampled_digests(handle, file_stat.st_size)
+    except OSError:
+        return None
+    identity = json.dumps(
+        [
+            _ENTRY_VERSION,
+            __version__,
+            schema_version,
+            str(path.resolve()),
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_dev,
+            file_stat.st_ino,
+            digests,
+            options.keep_raw,
+            options.selection(),
+        ]
+    )
+    name = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+    return ParseCacheKey(path, file_stat.st_size, file_stat.st_mtime_ns, name)
+
+
+def _entry_path(key: ParseCacheKey) -> Path:
+    return parse_cache_dir() / f"{key.name}{_ENTRY_SUFFIX}"
+
+
+def _open_entry(entry: Path) -> tuple[BinaryIO, dict[str, Any], list[int]]:
+    """Open ``entry`` and read its trailer: the summary and the segment offsets plus end."""
+    handle = entry.open("rb")
+    try:
+        size = os.fstat(handle.fileno()).st_size
+        magic = handle.read(len(_ENTRY_MAGIC))
+        if size < len(_ENTRY_MAGIC) + _FOOTER_BYTES or magic != _ENTRY_MAGIC:
+            raise ValueError("not a parse cache entry")
+        handle.seek(size - _FOOTER_BYTES)
+        footer = handle.read(_FOOTER_BYTES)
+        if not footer.endswith(_ENTRY_MAGIC):
+            raise ValueError("truncated parse cache entry")
+        (trailer_length,) = _TRAILER_LENGTH.unpack(footer[: _TRAILER_LENGTH.size])
+        trailer_start = size - _FOOTER_BYTES - trailer_length
+        if trailer_start < len(_ENTRY_MAGIC):
+            raise ValueError("truncated parse cache entry")
+        handle.seek(trailer_start)
+        trailer = json.loads(handle.read(trailer_length))
+        offsets = [int(offset) for offset in trailer["segments"]]
+        if offsets[0] != len(_ENTRY_MAGIC) or offsets[-1] != trailer_start:
+            raise ValueError("inconsistent parse cache entry")
+        return handle, trailer["summary"], offsets
+    except BaseException:
+        handle.close()
+        raise
+
+
+def _read_segments(handle: BinaryIO, offsets: list[int]) -> Iterator[EventBatch]:
+    handle.seek(offsets[0])
+    for end in offsets[1:]:
+        batch = EventBatch.load(handle)
+        if handle.tell() != end:
+            raise ValueError("inconsistent parse cache entry")
+        yield batch
+
+
+def _discard(entry: Path) -> None:
+    with suppress(OSError):
+        entry.unlink(missing_ok=True)
+
+
+def load_cached_parse(key: ParseCacheKey) -> tuple[EventBatch, dict[str, Any]] | None:
+    """Return the cached events and parse summary for ``key``, or ``None`` on a miss."""
+    entry = _entry_path(key)
+    try:
+        handle, summary, offsets = _open_entry(entry)
+        with handle:
+            batch = EventBatch()
+            for segment in _read_segments(handle, offsets):
+                if len(offsets) == 2:
+                    batch = segment
+                else:
+                    batch.extend_batch(segment)
+        # Bump the mtime so eviction sees this entry as recently used.
+        os.utime(entry)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        _discard(entry)
+        return None
+    return batch, summary
+
+
+def iter_cached_parse(key: ParseCacheKey) -> tuple[Iterator[LogEvent], dict[str, Any]] | None:
+    """Like :func:`load_cached_parse`, but events are decoded one segment at a time.
+
+    Memory stays bounded by the segment size however many events the entry holds. The
+    entry's layout is checked up front; damage inside a segment surfaces as ``ValueError``
+    while iterating.
+    """
+    entry = _entry_path(key)
+    try:
+        handle, summary, offsets = _open_entry(entry)
+        os.utime(entry)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        _discard(entry)
+        return None
+
+    def _events() -> Iterator[LogEvent]:
+        with handle:
+            for segment in _read_segments(handle, offsets):
+                yield from segment
+
+    return _events(), summary
+
+
+class CachedParseWriter:
+    """Write the cache entry for ``key`` while its events stream past.
+
+    Rows are dumped to a staging file every :data:`_SEGMENT_ROWS` events, so memory does not
+    grow with the input. :meth:`finish` renames the entry into place unless the file changed
+    meanwhile, and :meth:`abort` drops it. Failures are ignored: the entry is just not
+    stored, since the cache must never fail a command.
+    """
+
+    def __init__(self, key: ParseCacheKey) -> None:
+        self.key = key
+        self._batch = EventBatch()
+        self._offsets: list[int] = []
+        self._staging: Path | None = None
+        self._handle: BinaryIO | None = None
+        try:
+            directory = parse_cache_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            descriptor, name = tempfile.mkstemp(
+                dir=directory, prefix=f"{key.name}.", suffix=".tmp"
+            )
+            self._staging = Path(name)
+            self._handle = os.fdopen(descriptor, "wb")
+            self._handle.write(_ENTRY_MAGIC)
+        except OSError:
+            self.abort()
+
+    def append(self, event: LogEvent) -> None:
+        if self._handle is None:
+            return
+        self._batch.append(event)
+        if len(self._batch) >= _SEGMENT_ROWS:
+            self._write_segment(self._batch)
+            self._batch = EventBatch()
+
+    def add_batch(self, batch: EventBatch) -> None:
+        """Write ``batch`` as its own segment after any events appended so far."""
+        if len(self._batch):
+            self._write_segment(self._batch)
+            self._batch = EventBatch()
+        self._write_segment(batch)
+
+    def _write_segment(self, batch: EventBatch) -> None:
+        if self._handle is None:
+            return
+        try:
+            self._offsets.append(self._handle.tell())
+            batch.dump(self._handle)
+        except OSError:
+            self.abort()
+
+    def finish(self, summary: dict[str, Any]) -> None:
+        if len(self._batch) or not self._offsets:
+            self._write_segment(self._batch)
+            self._batch = EventBatch()
+        handle = self._handle
+        if handle is None:
+            return
+        try:
+            self._offsets.append(handle.tell())
+            trailer = json.dumps({"summary": summary, "segments": self._offsets}).encode("utf-8")
+            handle.write(trailer + _TRAILER_LENGTH.pack(len(trailer)) + _ENTRY_MAGIC)
+            handle.close()
+            self._handle = None
+            if self.key.still_matches():
+                os.replace(self._staging, _entry_path(self.key))
+                evict_cached_parses(max_cache_bytes())
+        except OSError:
+            pass
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        if self._handle is not None:
+            with suppress(OSError):
+                self._handle.close()
+            self._handle = None
+        if self._staging is not None:
+            _discard(self._staging)
+            self._staging = None
+
+
+def store_cached_parse(key: ParseCacheKey, batch: EventBatch, summary: dict[str, Any]) -> None:
+    """Cache a parse, then evict least recently used entries beyond :func:`max_cache_bytes`.
+
+    Nothing is stored if the file changed while it was being parsed. Failures are
+    ignored: the cache is an optimization and must never fail a command.
+    """
+    if not key.still_matches():
+        return
+    writer = CachedParseWriter(key)
+    writer.add_batch(batch)
+    writer.finish(summary)
+
+
+def load_cached_correlation_index(key: ParseCacheKey) -> CorrelationIndex | None:
+    """The correlation index stored next to the cached parse for ``key``, if any."""
+    try:
+        state = json.loads(_entry_path(key).with_suffix(_CORRELATION_SUFFIX).read_bytes())
+        return CorrelationIndex.from_dict(state)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def store_cached_correlation_index(key: ParseCacheKey, index: CorrelationIndex) -> None:
+    """Store ``index`` next to the cached parse for ``key``; it is evicted with that entry.
+
+    Like :func:`store_cached_parse`, nothing is stored if the file changed, and failures are
+    ignored.
+    """
+    entry = _entry_path(key)
+    if not key.still_matches() or not entry.exists():
+        return
+    encoded = json.dumps(index.to_dict()).encode("utf-8")
+    try:
+        write_atomically(
+            entry.with_suffix(_CORRELATION_SUFFIX), lambda handle: handle.write(encoded)
+        )
+    except OSError:
+        pass
+
+
+def evict_cached_parses(max_bytes: int) -> None:
+    """Delete least recently used entries until the cache holds at most ``max_bytes``.
+
+    An entry's correlation index is deleted with it but does not count toward the budget.
+    """
+    entries = []
+    for entry in parse_cache_dir().glob(f"*{_ENTRY_SUFFIX}"):
+        try:
+            entry_stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries, key=lambda item: item[:2]):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        entry.with_suffix(_CORRELATION_SUFFIX).unlink(missing_ok=True)
+        total -= size
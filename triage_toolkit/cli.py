@@ -1,21 +1,84 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+import sys
+import tempfile
+import time
 from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from enum import Enum
 from importlib.metadata import PackageNotFoundError, version as package_version
 from pathlib import Path
-from typing import Any, NoReturn
+from typing import Any, Callable, Iterable, Iterator, NoReturn, TextIO
 
 import typer
 
 from . import __version__
-from .parser import parse_file, parse_file_with_summary
-from .runbook import build_runbook
-from .timeline import build_timeline
+from .aggregate import IncidentAggregator
+from .batch import EventBatch, from_epoch_us
+from .cache import (
+    CachedParseWriter,
+    ParseCacheKey,
+    iter_cached_parse,
+    load_cached_correlation_index,
+    load_cached_parse,
+    parse_cache_key,
+    store_cached_correlation_index,
+    store_cached_parse,
+)
+from .correlation import CorrelationIndex, top_error_correlation_ids, trace_events
+from .filters import EventFilter
+from .follow import SourceTailer
+from .incremental import parse_file_incremental
+from .merge import MergeOrderError, merge_event_streams, sort_event_streams
+from .models import LogEvent
+from .output import JsonParseWriter, NdjsonParseWriter
+from .parser import (
+    ParseOptions,
+    build_time_index,
+    first_error_timestamp,
+    iter_file_events_with_summary,
+    merge_parse_summaries,
+    parse_file,
+    parse_file_with_summary,
+    parse_files_with_summary,
+)
+from .runbook import render_runbook
+from .sketches import DEFAULT_SKETCH_CAPACITY, SpaceSaving
+from .templates import TemplateMiner
+from .timeline import (
+    TimelineAccumulator,
+    TimelineWriter,
+    analyze_incident,
+    render_rate_timeline,
+)
+from .utils import parse_timestamp
 
 _PACKAGE_NAME = "incident-triage-toolkit"
 PARSE_SCHEMA_VERSION = "1.0.0"
 SUMMARY_SCHEMA_VERSION = "1.0.0"
+TRACE_SCHEMA_VERSION = "1.0.0"
+_STDOUT_SPOOL_BYTES = 8 * 1024 * 1024
+_COPY_CHUNK_CHARS = 1024 * 1024
+
+
+class OutputFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+
+
+class SignatureMode(str, Enum):
+    normalize = "normalize"
+    drain = "drain"
+
+
+class TimelineView(str, Enum):
+    events = "events"
+    rates = "rates"
+
 
 app = typer.Typer(name="triage", help="Incident triage toolkit.")
 
@@ -51,9 +114,10 @@ def _fail(message: str) -> NoReturn:
     raise typer.Exit(code=2)
 
 
-def _read_events(path: Path):
+@contextmanager
+def _input_errors(path: Path) -> Iterator[None]:
     try:
-        return parse_file(path)
+        yield
     except FileNotFoundError:
         _fail(f"Input file not found: {path}")
     except PermissionError:
@@ -66,57 +130,190 @@ def _read_events(path: Path):
         _fail(f"Could not read input file '{path}': {exc}")
 
 
-def _read_events_with_summary(path: Path) -> tuple[list[Any], dict[str, Any]]:
+def _read_events(path: Path):
+    with _input_errors(path):
+        return parse_file(path)
+
+
+def _read_events_with_summary(
+    path: Path, jobs: int = 1, options: ParseOptions | None = None
+) -> tuple[list[Any], dict[str, Any]]:
+    with _input_errors(path):
+        return parse_file_with_summary(path, workers=jobs, options=options)
+
+
+def _lookup_cache(
+    path: Path, options: ParseOptions | None
+) -> tuple[ParseCacheKey | None, tuple[EventBatch, dict[str, Any]] | None]:
+    key = parse_cache_key(path, options or ParseOptions(), PARSE_SCHEMA_VERSION)
+    return key, load_cached_parse(key) if key else None
+
+
+def _read_batch_with_summary(
+    path: Path,
+    jobs: int = 1,
+    options: ParseOptions | None = None,
+    incremental: bool = False,
+    cache: bool = False,
+) -> tuple[EventBatch, dict[str, Any]]:
+    if incremental:
+        with _input_errors(path):
+            return parse_file_incremental(path, options)
+    key = None
+    if cache:
+        key, cached = _lookup_cache(path, options)
+        if cached:
+            return cached
+
+    if jobs > 1:
+        events, summary = _read_events_with_summary(path, jobs, options)
+        batch = EventBatch.from_events(events)
+    else:
+        summary = {}
+        with _input_errors(path):
+            batch = EventBatch.from_events(iter_file_events_with_summary(path, summary, options))
+    if key:
+        store_cached_parse(key, batch, summary)
+    return batch, summary
+
+
+def _iter_source_events(
+    path: Path, summary: dict[str, Any], options: ParseOptions | None, key: ParseCacheKey | None
+) -> Iterator[LogEvent]:
+    # Hits are read and misses written one segment at a time, so streaming stays in
+    # constant memory with the cache on.
+    cached = iter_cached_parse(key) if key else None
+    if cached:
+        events, parsed = cached
+        summary.update(parsed)
+        yield from events
+        return
+
+    parsed = {}
+    if key is None:
+        with _input_errors(path):
+            yield from iter_file_events_with_summary(path, parsed, options)
+        summary.update(parsed)
+        return
+    writer = CachedParseWriter(key)
     try:
-        return parse_file_with_summary(path)
-    except FileNotFoundError:
-        _fail(f"Input file not found: {path}")
-    except PermissionError:
-        _fail(f"Input file is not readable: {path}")
-    except IsADirectoryError:
-        _fail(f"Input path is a directory, expected a file: {path}")
-    except UnicodeDecodeError:
-        _fail(f"Input file is not valid UTF-8 text: {path}")
-    except OSError as exc:
-        _fail(f"Could not read input file '{path}': {exc}")
+        with _input_errors(path):
+            for event in iter_file_events_with_summary(path, parsed, options):
+                writer.append(event)
+                yield event
+    except BaseException:
+        # Includes GeneratorExit when a restarted merge abandons this stream.
+        writer.abort()
+        raise
+    summary.update(parsed)
+    writer.finish(parsed)
 
 
-def _merge_parse_summaries(summaries: list[dict[str, Any]]) -> dict[str, Any]:
-    total_lines = sum(int(summary["total_lines"]) for summary in summaries)
-    parsed_lines = sum(int(summary["parsed_lines"]) for summary in summaries)
-    dropped_lines = total_lines - parsed_lines
-    drop_ratio = dropped_lines / total_lines if total_lines else 0.0
+def _iter_incremental_source_events(
+    path: Path, summary: dict[str, Any], options: ParseOptions | None
+) -> Iterator[LogEvent]:
+    with _input_errors(path):
+        batch, parsed = parse_file_incremental(path, options)
+    summary.update(parsed)
+    yield from batch
 
-    dropped_reasons: Counter[str] = Counter()
-    for summary in summaries:
-        for reason, count in summary.get("dropped_reasons", {}).items():
-            dropped_reasons[reason] += int(count)
 
-    return {
-        "total_lines": total_lines,
-        "parsed_lines": parsed_lines,
-        "dropped_lines": dropped_lines,
-        "drop_ratio": round(drop_ratio, 6),
-        "dropped_reasons": {reason: dropped_reasons[reason] for reason in sorted(dropped_reasons)},
-    }
+def _open_sources(
+    paths: list[Path],
+    options: ParseOptions | None,
+    incremental: bool = False,
+    cache: bool = False,
+) -> tuple[list[Iterator[LogEvent]], list[dict[str, Any]], list[bool]]:
+    """Per-source event streams and summaries, and which streams write a parse cache entry."""
+    per_source: list[dict[str, Any]] = [{"path": str(path)} for path in paths]
+    if incremental:
+        streams = [
+            _iter_incremental_source_events(path, summary, options)
+            for path, summary in zip(paths, per_source)
+        ]
+        return streams, per_source, [False] * len(paths)
+    keys = [
+        parse_cache_key(path, options or ParseOptions(), PARSE_SCHEMA_VERSION) if cache else None
+        for path in paths
+    ]
+    streams = [
+        _iter_source_events(path, summary, options, key)
+        for path, summary, key in zip(paths, per_source, keys)
+    ]
+    return streams, per_source, [key is not None for key in keys]
 
 
-def _read_events_for_parse(paths: list[Path]) -> tuple[list[Any], dict[str, Any]]:
-    if not paths:
-        _fail("At least one input file path is required.")
+def _parse_sources_in_pool(
+    paths: list[Path], jobs: int, options: ParseOptions | None, cache: bool = False
+) -> tuple[list[Any], list[dict[str, Any]]]:
+    keys: list[ParseCacheKey | None] = [None] * len(paths)
+    cached: list[tuple[EventBatch, dict[str, Any]] | None] = [None] * len(paths)
+    if cache:
+        for index, path in enumerate(paths):
+            keys[index], cached[index] = _lookup_cache(path, options)
+    misses = [path for path, hit in zip(paths, cached) if hit is None]
+    results = parse_files_with_summary(misses, jobs=jobs, options=options) if misses else None
 
-    merged_events: list[tuple[Any, int, int]] = []
+    batches: list[Any] = []
     per_source: list[dict[str, Any]] = []
-
-    for source_index, path in enumerate(paths):
-        events, summary = _read_events_with_summary(path)
-        merged_events.extend((event, source_index, event_index) for event_index, event in enumerate(events))
+    for path, key, hit in zip(paths, keys, cached):
+        if hit is None:
+            with _input_errors(path):
+                events, summary = next(results)
+            if key:
+                store_cached_parse(key, EventBatch.from_events(events), summary)
+        else:
+            events, summary = hit
+        batches.append(events)
         per_source.append({"path": str(path), **summary})
+    return batches, per_source
+
+
+def _require_restartable(restartable: bool, paths: list[Path], exc: MergeOrderError) -> None:
+    if not restartable:
+        _fail(
+            f"Input file is too far out of order to stream: {paths[exc.source_index]} "
+            f"({exc}). Write to a file with --out PATH to allow a full sort."
+        )
+
+
+def _read_events_for_parse(
+    paths: list[Path],
+    jobs: int = 1,
+    options: ParseOptions | None = None,
+    *,
+    collect: Callable[[Iterable[LogEvent]], Any],
+    restartable: bool = True,
+    incremental: bool = False,
+    cache: bool = False,
+) -> tuple[Any, dict[str, Any]]:
+    if not paths:
+        _fail("At least one input file path is required.")
 
-    merged_events.sort(key=lambda item: (item[0].timestamp, item[1], item[2]))
-    all_events = [item[0] for item in merged_events]
+    if jobs > 1 and not incremental:
+        batches, per_source = _parse_sources_in_pool(paths, jobs, options, cache)
+        try:
+            all_events = collect(merge_event_streams(batches))
+        except MergeOrderError as exc:
+            _require_restartable(restartable, paths, exc)
+            all_events = collect(sort_event_streams(batches))
+    else:
+        streams, per_source, caching = _open_sources(paths, options, incremental, cache)
+        try:
+            all_events = collect(merge_event_streams(streams))
+        except MergeOrderError as exc:
+            _require_restartable(restartable, paths, exc)
+            # A source is too disordered for the bounded merge, so sort everything instead.
+            # Streams that write a cache entry are finished first; reopening then reads them
+            # back from the cache rather than parsing those inputs a second time.
+            for stream, writes_cache in zip(streams, caching):
+                if writes_cache:
+                    for _ in stream:
+                        pass
+            streams, per_source, _ = _open_sources(paths, options, incremental, cache)
+            all_events = collect(sort_event_streams(streams))
 
-    aggregate = _merge_parse_summaries(per_source)
+    aggregate = merge_parse_summaries(per_source)
     if len(paths) > 1:
         aggregate["per_source"] = per_source
     return all_events, aggregate
@@ -135,8 +332,139 @@ def _write_output(target: str, content: str) -> None:
         _fail(f"Could not write output file '{path}': {exc}")
 
 
+@contextmanager
+def _staged_output(target: str) -> Iterator[TextIO]:
+    """Yield a stream whose content is published to ``target`` only if the block succeeds.
+
+    Files are written next to the destination and renamed into place; stdout output is
+    spooled (to disk once large) so a failed strict gate or a merge restart never leaves
+    partial output behind.
+    """
+    if target == "-":
+        with tempfile.SpooledTemporaryFile(
+            max_size=_STDOUT_SPOOL_BYTES, mode="w+", encoding="utf-8"
+        ) as spool:
+            yield spool
+            spool.seek(0)
+            for chunk in iter(lambda: spool.read(_COPY_CHUNK_CHARS), ""):
+                typer.echo(chunk, nl=False)
+        return
+
+    path = Path(target)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with staging.open("w", encoding="utf-8") as stream:
+                yield stream
+            os.replace(staging, path)
+        except OSError as exc:
+            _fail(f"Could not write output file '{path}': {exc}")
+    finally:
+        staging.unlink(missing_ok=True)
+
+
+@contextmanager
+def _signature_engine(mode: SignatureMode, cache: bool = True) -> Iterator[TemplateMiner | None]:
+    """Yield the engine for ``mode``; learned Drain templates are saved for the next run.
+
+    Without ``cache`` Drain starts from no templates and saves none.
+    """
+    if mode is SignatureMode.normalize:
+        yield None
+        return
+    if not cache:
+        yield TemplateMiner()
+        return
+    miner = TemplateMiner.load()
+    yield miner
+    miner.save()
+
+
+_WINDOW_OFFSET_RE = re.compile(r"(?P<sign>[+-])(?P<amount>\d+(?:\.\d+)?)(?P<unit>ms|s|m|h|d)")
+_BUCKET_WIDTH_RE = re.compile(r"(?P<amount>\d+(?:\.\d+)?)(?P<unit>ms|s|m|h|d)")
+_WINDOW_OFFSET_UNITS = {
+    "ms": timedelta(milliseconds=1),
+    "s": timedelta(seconds=1),
+    "m": timedelta(minutes=1),
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+}
+
+
+def _window_bound(option: str, value: str) -> datetime | timedelta:
+    offset = _WINDOW_OFFSET_RE.fullmatch(value.strip())
+    if offset:
+        amount = float(offset["amount"]) * _WINDOW_OFFSET_UNITS[offset["unit"]]
+        return -amount if offset["sign"] == "-" else amount
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        _fail(
+            f"{option} must be a timestamp or an offset from the first error such as -5m: {value}"
+        )
+    return timestamp
+
+
+def _bucket_width_us(value: str) -> int:
+    width = _BUCKET_WIDTH_RE.fullmatch(value.strip())
+    if width:
+        amount = float(width["amount"]) * _WINDOW_OFFSET_UNITS[width["unit"]]
+        width_us = amount // timedelta(microseconds=1)
+        if width_us >= 1:
+            return width_us
+    _fail(f"--bucket must be a positive duration such as 30s, 1m or 1h: {value}")
+
+
+def _first_error(paths: list[Path]) -> datetime:
+    first: datetime | None = None
+    for path in paths:
+        with _input_errors(path):
+            timestamp = first_error_timestamp(path)
+        if timestamp is not None and (first is None or timestamp < first):
+            first = timestamp
+    if first is None:
+        _fail("--since/--until offsets are relative to the first error, but no error was found.")
+    return first
+
+
+def _time_window(
+    paths: list[Path], since: str | None, until: str | None
+) -> dict[str, datetime | None]:
+    """Resolve ``--since`` / ``--until`` into :class:`ParseOptions` fields.
+
+    Offsets such as ``-5m`` are relative to the earliest error across ``paths``, found by
+    a pre-scan that only runs when an offset is given.
+    """
+    window: dict[str, datetime | None] = {"since": None, "until": None}
+    anchor: datetime | None = None
+    for name, value in (("since", since), ("until", until)):
+        if value is None:
+            continue
+        bound = _window_bound(f"--{name}", value)
+        if isinstance(bound, timedelta):
+            anchor = anchor or _first_error(paths)
+            bound = anchor + bound
+        window[name] = bound
+    if window["since"] and window["until"] and window["since"] > window["until"]:
+        _fail("--since must not be later than --until.")
+    return window
+
+
+def _event_filter(
+    level: str | None, components: list[str], correlation_ids: list[str], pattern: str | None
+) -> EventFilter | None:
+    if level is None and not components and not correlation_ids and pattern is None:
+        return None
+    try:
+        return EventFilter(level, tuple(components), tuple(correlation_ids), pattern)
+    except ValueError as exc:
+        _fail(str(exc))
+
+
 def _drop_ratio(summary: dict[str, Any]) -> float:
-    total_lines = int(summary["total_lines"])
+    # Lines skipped by --since/--until or the event filters are not parse failures; leave
+    # them out of the ratio.
+    total_lines = int(summary["total_lines"]) - int(summary.get("skipped_lines", 0))
     dropped_lines = int(summary["dropped_lines"])
     if total_lines == 0:
         return 0.0
@@ -145,7 +473,8 @@ def _drop_ratio(summary: dict[str, Any]) -> float:
 
 def _strict_parse_error(summary: dict[str, Any], max_drop_ratio: float) -> str | None:
     if int(summary["parsed_lines"]) == 0:
-        return f"Strict parse gate failed: parsed_lines == 0 (summary={json.dumps(summary, sort_keys=True)})"
+        details = json.dumps(summary, sort_keys=True)
+        return f"Strict parse gate failed: parsed_lines == 0 (summary={details})"
 
     drop_ratio = _drop_ratio(summary)
     if drop_ratio > max_drop_ratio:
@@ -157,39 +486,54 @@ def _strict_parse_error(summary: dict[str, Any], max_drop_ratio: float) -> str |
     return None
 
 
-def _top_items(counter: Counter[str], limit: int = 3) -> list[dict[str, Any]]:
+def _top_items(counter: Counter[str] | SpaceSaving, limit: int = 3) -> list[dict[str, Any]]:
+    if isinstance(counter, SpaceSaving):
+        return [
+            {"name": name, "count": count, "error": error}
+            for name, count, error in counter.top(limit)
+        ]
     ordered = sorted(counter.items(), key=lambda item: (-item[1], item[0]))
     return [{"name": name, "count": count} for name, count in ordered[:limit]]
 
 
-def _build_incident_summary(events: list[Any]) -> dict[str, Any]:
-    event_count = len(events)
-    start = events[0].timestamp.isoformat() if events else None
-    end = events[-1].timestamp.isoformat() if events else None
-
-    component_counts = Counter(event.component for event in events)
-    error_events = [event for event in events if event.level.upper() == "ERROR"]
-    error_signature_counts = Counter(event.message for event in error_events)
-
-    correlated = sum(1 for event in events if event.correlation_id)
+def _build_incident_summary(aggregator: IncidentAggregator) -> dict[str, Any]:
+    event_count = aggregator.event_count
+    start = from_epoch_us(aggregator.start_us).isoformat() if event_count else None
+    end = from_epoch_us(aggregator.end_us).isoformat() if event_count else None
+    correlated = aggregator.correlated_count
     correlation_coverage = 0.0 if event_count == 0 else correlated / event_count
 
-    return {
+    payload = {
         "schema_version": SUMMARY_SCHEMA_VERSION,
         "incident_window": {
             "start": start,
             "end": end,
         },
         "event_count": event_count,
-        "error_count": len(error_events),
-        "top_components": _top_items(component_counts),
-        "top_error_signatures": _top_items(error_signature_counts),
+        "error_count": aggregator.level_error_count,
+        "top_components": _top_items(aggregator.component_counts),
+        "top_error_signatures": _top_items(aggregator.error_message_counts),
         "correlation_id_coverage": {
             "covered_events": correlated,
             "total_events": event_count,
             "coverage_ratio": round(correlation_coverage, 6),
         },
     }
+    if aggregator.approx_capacity is not None:
+        payload["approximation"] = _approximation_bounds(aggregator)
+    return payload
+
+
+def _approximation_bounds(aggregator: IncidentAggregator) -> dict[str, Any]:
+    """Error bounds for the sketched top lists; see :class:`SpaceSaving`."""
+    bounds: dict[str, Any] = {"algorithm": "space-saving", "capacity": aggregator.approx_capacity}
+    for key, counter in (
+        ("top_components", aggregator.component_counts),
+        ("top_error_signatures", aggregator.error_message_counts),
+    ):
+        if isinstance(counter, SpaceSaving):
+            bounds[key] = {"total": counter.total, "max_unlisted_count": counter.max_error}
+    return bounds
 
 
 @app.command()
@@ -208,19 +552,103 @@ def parse(
         max=1.0,
         help="Maximum allowed dropped/total line ratio in strict mode (0.0-1.0).",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    verbose_stats: bool = typer.Option(
+        False,
+        "--verbose-stats",
+        help="Include parser cache statistics in parse_summary.",
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Resume from the previous --incremental run and parse only newly appended bytes.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.json,
+        "--format",
+        help="Output format: one JSON document, or NDJSON with one event per line.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        help="Skip lines before this time: a timestamp, or an offset from the first error "
+        "such as -5m.",
+    ),
+    until: str | None = typer.Option(
+        None,
+        "--until",
+        help="Skip lines after this time: a timestamp, or an offset from the first error "
+        "such as +2m.",
+    ),
+    level: str | None = typer.Option(
+        None, "--level", help="Keep only events at or above this level, such as WARN."
+    ),
+    component: list[str] = typer.Option(
+        [],
+        "--component",
+        help="Keep only events from this component; repeatable, a trailing * matches a prefix.",
+    ),
+    cid: list[str] = typer.Option(
+        [], "--cid", help="Keep only events with this correlation ID; repeatable."
+    ),
+    grep: str | None = typer.Option(
+        None, "--grep", help="Keep only events whose message matches this regular expression."
+    ),
 ) -> None:
     """Parse one or more log files and write normalized JSON output."""
-    events, summary = _read_events_for_parse(paths)
-    strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
-    if strict_error:
-        _fail(strict_error)
+    options = ParseOptions(
+        verbose_stats=verbose_stats,
+        keep_raw=keep_raw,
+        **_time_window(paths, since, until),
+        event_filter=_event_filter(level, component, cid, grep),
+        time_index=not no_cache,
+    )
+    if output_format is OutputFormat.ndjson and out == "-" and not strict:
+        # Nothing can reject the output afterwards, so write events as they are merged.
+        writer = NdjsonParseWriter(sys.stdout, PARSE_SCHEMA_VERSION)
+        _, summary = _read_events_for_parse(
+            paths,
+            jobs,
+            options,
+            collect=writer.write_events,
+            restartable=False,
+            incremental=incremental,
+            cache=not no_cache,
+        )
+        writer.write_summary(summary)
+        return
 
-    payload = {
-        "schema_version": PARSE_SCHEMA_VERSION,
-        "events": [event.to_dict() for event in events],
-        "parse_summary": summary,
-    }
-    _write_output(out, json.dumps(payload, indent=2))
+    writer_type = NdjsonParseWriter if output_format is OutputFormat.ndjson else JsonParseWriter
+    with _staged_output(out) as stream:
+        writer = writer_type(stream, PARSE_SCHEMA_VERSION)
+        _, summary = _read_events_for_parse(
+            paths,
+            jobs,
+            options,
+            collect=writer.write_events,
+            incremental=incremental,
+            cache=not no_cache,
+        )
+        strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
+        if strict_error:
+            _fail(strict_error)
+        writer.write_summary(summary)
     if out != "-":
         typer.echo(f"Wrote {summary['parsed_lines']} events to {out}")
 
@@ -241,14 +669,86 @@ def summary(
         max=1.0,
         help="Maximum allowed dropped/total line ratio in strict mode (0.0-1.0).",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    verbose_stats: bool = typer.Option(
+        False,
+        "--verbose-stats",
+        help="Include parser cache statistics in parse_summary.",
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Resume from the previous --incremental run and parse only newly appended bytes.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Count top components and error messages in bounded memory (Space-Saving); "
+        "counts may overstate by their reported 'error'.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        help="Skip lines before this time: a timestamp, or an offset from the first error "
+        "such as -5m.",
+    ),
+    until: str | None = typer.Option(
+        None,
+        "--until",
+        help="Skip lines after this time: a timestamp, or an offset from the first error "
+        "such as +2m.",
+    ),
+    level: str | None = typer.Option(
+        None, "--level", help="Keep only events at or above this level, such as WARN."
+    ),
+    component: list[str] = typer.Option(
+        [],
+        "--component",
+        help="Keep only events from this component; repeatable, a trailing * matches a prefix.",
+    ),
+    cid: list[str] = typer.Option(
+        [], "--cid", help="Keep only events with this correlation ID; repeatable."
+    ),
+    grep: str | None = typer.Option(
+        None, "--grep", help="Keep only events whose message matches this regular expression."
+    ),
 ) -> None:
     """Generate a machine-readable incident summary JSON output."""
-    events, parse_summary = _read_events_with_summary(path)
+    options = ParseOptions(
+        verbose_stats=verbose_stats,
+        keep_raw=keep_raw,
+        **_time_window([path], since, until),
+        event_filter=_event_filter(level, component, cid, grep),
+        time_index=not no_cache,
+    )
+    events, parse_summary = _read_batch_with_summary(
+        path, jobs, options, incremental, cache=not no_cache
+    )
     strict_error = _strict_parse_error(parse_summary, max_drop_ratio) if strict else None
     if strict_error:
         _fail(strict_error)
 
-    payload = _build_incident_summary(events)
+    aggregator = IncidentAggregator(
+        approx_capacity=DEFAULT_SKETCH_CAPACITY if approx else None, group_errors=False
+    )
+    aggregator.add_batch(events)
+    payload = _build_incident_summary(aggregator)
     payload["parse_summary"] = parse_summary
     _write_output(out, json.dumps(payload, indent=2))
     if out != "-":
@@ -271,15 +771,126 @@ def timeline(
         max=1.0,
         help="Maximum allowed dropped/total line ratio in strict mode (0.0-1.0).",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    verbose_stats: bool = typer.Option(
+        False,
+        "--verbose-stats",
+        help="Print error-signature cache statistics to stderr as JSON.",
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Resume from the previous --incremental run and parse only newly appended bytes.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+    view: TimelineView = typer.Option(
+        TimelineView.events,
+        "--view",
+        help="'events' lists every event; 'rates' shows per-bucket counts by level and "
+        "component with error burst and incident onset detection.",
+    ),
+    bucket: str = typer.Option(
+        "1m", "--bucket", help="Bucket width for --view rates, such as 30s, 1m or 1h."
+    ),
+    signature_mode: SignatureMode = typer.Option(
+        SignatureMode.normalize,
+        "--signatures",
+        help="Error grouping: 'normalize' masks digits and correlation IDs; 'drain' mines "
+        "message templates and reuses them across runs.",
+    ),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Count error signatures and components in bounded memory (Space-Saving); "
+        "counts may overstate by the bound noted under Notable Errors.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        help="Skip lines before this time: a timestamp, or an offset from the first error "
+        "such as -5m.",
+    ),
+    until: str | None = typer.Option(
+        None,
+        "--until",
+        help="Skip lines after this time: a timestamp, or an offset from the first error "
+        "such as +2m.",
+    ),
+    level: str | None = typer.Option(
+        None, "--level", help="Keep only events at or above this level, such as WARN."
+    ),
+    component: list[str] = typer.Option(
+        [],
+        "--component",
+        help="Keep only events from this component; repeatable, a trailing * matches a prefix.",
+    ),
+    cid: list[str] = typer.Option(
+        [], "--cid", help="Keep only events with this correlation ID; repeatable."
+    ),
+    grep: str | None = typer.Option(
+        None, "--grep", help="Keep only events whose message matches this regular expression."
+    ),
 ) -> None:
     """Generate a timeline markdown file from one or more log files."""
-    events, summary = _read_events_for_parse(paths)
-    strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
-    if strict_error:
-        _fail(strict_error)
-
-    content = build_timeline(events)
-    _write_output(out, content)
+    bucket_us = _bucket_width_us(bucket)
+    options = ParseOptions(
+        keep_raw=keep_raw,
+        **_time_window(paths, since, until),
+        event_filter=_event_filter(level, component, cid, grep),
+        time_index=not no_cache,
+    )
+    approx_capacity = DEFAULT_SKETCH_CAPACITY if approx else None
+    with _signature_engine(signature_mode, cache=not no_cache) as signatures:
+        if view is TimelineView.rates:
+            # The rate tables need the whole time span before bucketing, so events are kept.
+            events, summary = _read_events_for_parse(
+                paths,
+                jobs,
+                options,
+                collect=EventBatch.from_events,
+                incremental=incremental,
+                cache=not no_cache,
+            )
+            strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
+            if strict_error:
+                _fail(strict_error)
+            analysis = analyze_incident(events, signatures, approx_capacity)
+            aggregator = analysis.aggregator
+            _write_output(out, render_rate_timeline(analysis, bucket_us))
+        else:
+            # Rows are written as events are merged; only the aggregates stay in memory.
+            with _staged_output(out) as stream:
+                writer = TimelineWriter(stream, signatures, approx_capacity)
+                _, summary = _read_events_for_parse(
+                    paths,
+                    jobs,
+                    options,
+                    collect=writer.write_events,
+                    incremental=incremental,
+                    cache=not no_cache,
+                )
+                strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
+                if strict_error:
+                    _fail(strict_error)
+            aggregator = writer.aggregator
+    if verbose_stats:
+        stats = {"signature_cache": aggregator.normalizer.cache_stats()}
+        typer.echo(json.dumps(stats), err=True)
     if out != "-":
         typer.echo(f"Wrote timeline to {out}")
 
@@ -301,19 +912,407 @@ def runbook(
         max=1.0,
         help="Maximum allowed dropped/total line ratio in strict mode (0.0-1.0).",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Resume from the previous --incremental run and parse only newly appended bytes.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        help="Skip lines before this time: a timestamp, or an offset from the first error "
+        "such as -5m.",
+    ),
+    until: str | None = typer.Option(
+        None,
+        "--until",
+        help="Skip lines after this time: a timestamp, or an offset from the first error "
+        "such as +2m.",
+    ),
+    level: str | None = typer.Option(
+        None, "--level", help="Keep only events at or above this level, such as WARN."
+    ),
+    component: list[str] = typer.Option(
+        [],
+        "--component",
+        help="Keep only events from this component; repeatable, a trailing * matches a prefix.",
+    ),
+    cid: list[str] = typer.Option(
+        [], "--cid", help="Keep only events with this correlation ID; repeatable."
+    ),
+    grep: str | None = typer.Option(
+        None, "--grep", help="Keep only events whose message matches this regular expression."
+    ),
 ) -> None:
     """Generate a runbook skeleton from one or more log files."""
-    events, summary = _read_events_for_parse(paths)
+
+    def _aggregate(events: Iterable[LogEvent]) -> IncidentAggregator:
+        # The runbook only needs the aggregates, so no event outlives the merge.
+        aggregator = IncidentAggregator()
+        for _ in aggregator.add_stream(events):
+            pass
+        return aggregator
+
+    aggregator, summary = _read_events_for_parse(
+        paths,
+        jobs,
+        ParseOptions(
+            keep_raw=keep_raw,
+            **_time_window(paths, since, until),
+            event_filter=_event_filter(level, component, cid, grep),
+            time_index=not no_cache,
+        ),
+        collect=_aggregate,
+        incremental=incremental,
+        cache=not no_cache,
+    )
     strict_error = _strict_parse_error(summary, max_drop_ratio) if strict else None
     if strict_error:
         _fail(strict_error)
 
-    content = build_runbook(events, title)
+    content = render_runbook(aggregator, title)
     _write_output(out, content)
     if out != "-":
         typer.echo(f"Wrote runbook to {out}")
 
 
+@app.command()
+def report(
+    paths: list[Path] = typer.Argument(..., help="One or more input log files."),
+    out_dir: Path = typer.Option(
+        ...,
+        "--out-dir",
+        "-o",
+        help="Directory for parsed.json, summary.json, timeline.md, runbook.md.",
+    ),
+    title: str = typer.Option("Incident: Untitled", "--title"),
+    strict: bool = typer.Option(
+        False,
+        "--strict",
+        help="Fail with non-zero exit code when parse quality gates are violated.",
+    ),
+    max_drop_ratio: float = typer.Option(
+        1.0,
+        "--max-drop-ratio",
+        min=0.0,
+        max=1.0,
+        help="Maximum allowed dropped/total line ratio in strict mode (0.0-1.0).",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    verbose_stats: bool = typer.Option(
+        False,
+        "--verbose-stats",
+        help="Include parser and error-signature cache statistics in summary.json.",
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Resume from the previous --incremental run and parse only newly appended bytes.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+    signature_mode: SignatureMode = typer.Option(
+        SignatureMode.normalize,
+        "--signatures",
+        help="Error grouping: 'normalize' masks digits and correlation IDs; 'drain' mines "
+        "message templates and reuses them across runs.",
+    ),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Count top components and error messages in bounded memory (Space-Saving); "
+        "counts may overstate by their reported 'error'.",
+    ),
+    since: str | None = typer.Option(
+        None,
+        "--since",
+        help="Skip lines before this time: a timestamp, or an offset from the first error "
+        "such as -5m.",
+    ),
+    until: str | None = typer.Option(
+        None,
+        "--until",
+        help="Skip lines after this time: a timestamp, or an offset from the first error "
+        "such as +2m.",
+    ),
+    level: str | None = typer.Option(
+        None, "--level", help="Keep only events at or above this level, such as WARN."
+    ),
+    component: list[str] = typer.Option(
+        [],
+        "--component",
+        help="Keep only events from this component; repeatable, a trailing * matches a prefix.",
+    ),
+    cid: list[str] = typer.Option(
+        [], "--cid", help="Keep only events with this correlation ID; repeatable."
+    ),
+    grep: str | None = typer.Option(
+        None, "--grep", help="Keep only events whose message matches this regular expression."
+    ),
+) -> None:
+    """Parse once and write the parsed JSON, summary, timeline and runbook to a directory."""
+    options = ParseOptions(
+        verbose_stats=verbose_stats,
+        keep_raw=keep_raw,
+        **_time_window(paths, since, until),
+        event_filter=_event_filter(level, component, cid, grep),
+        time_index=not no_cache,
+    )
+    approx_capacity = DEFAULT_SKETCH_CAPACITY if approx else None
+    with (
+        _signature_engine(signature_mode, cache=not no_cache) as signatures,
+        _staged_output(str(out_dir / "parsed.json")) as stream,
+        _staged_output(str(out_dir / "timeline.md")) as timeline_stream,
+    ):
+        # Each merged event is written to parsed.json and timeline.md as it passes; only
+        # the aggregates for the summary and runbook stay in memory.
+        writer = JsonParseWriter(stream, PARSE_SCHEMA_VERSION)
+        timeline_writer = TimelineWriter(timeline_stream, signatures, approx_capacity)
+        event_count, parse_summary = _read_events_for_parse(
+            paths,
+            jobs,
+            options,
+            collect=lambda events: writer.write_events(timeline_writer.passing(events)),
+            incremental=incremental,
+            cache=not no_cache,
+        )
+        strict_error = _strict_parse_error(parse_summary, max_drop_ratio) if strict else None
+        if strict_error:
+            _fail(strict_error)
+        writer.write_summary(parse_summary)
+
+    aggregator = timeline_writer.aggregator
+    payload = _build_incident_summary(aggregator)
+    payload["parse_summary"] = parse_summary
+    if verbose_stats:
+        payload["stats"] = {"signature_cache": aggregator.normalizer.cache_stats()}
+    _write_output(str(out_dir / "summary.json"), json.dumps(payload, indent=2))
+    _write_output(str(out_dir / "runbook.md"), render_runbook(aggregator, title))
+    typer.echo(f"Wrote report for {event_count} events to {out_dir}")
+
+
+@app.command()
+def index(
+    paths: list[Path] = typer.Argument(..., help="One or more plain (uncompressed) log files."),
+) -> None:
+    """Prebuild the sparse timestamp index that windowed parses seek with."""
+    for path in paths:
+        with _input_errors(path):
+            try:
+                time_index = build_time_index(path)
+            except ValueError as exc:
+                _fail(str(exc))
+        if time_index is None:
+            _fail(f"Could not save the time index for {path}; did it change while indexing?")
+        typer.echo(f"Indexed {path}: {len(time_index)} block(s)")
+
+
+def _read_correlated_source(
+    path: Path, jobs: int, cache: bool
+) -> tuple[EventBatch, CorrelationIndex]:
+    """Parse ``path`` and index its correlation IDs, reusing both from the parse cache."""
+    # The same options as the other commands' defaults, so their cache entries are reused.
+    options = ParseOptions(keep_raw=False, time_index=cache)
+    key, cached = _lookup_cache(path, options) if cache else (None, None)
+    if cached:
+        batch, _ = cached
+        index = load_cached_correlation_index(key)
+        if index is not None:
+            return batch, index
+    else:
+        batch, summary = _read_batch_with_summary(path, jobs, options)
+        if key:
+            store_cached_parse(key, batch, summary)
+    index = CorrelationIndex.from_batch(batch)
+    if key:
+        store_cached_correlation_index(key, index)
+    return batch, index
+
+
+@app.command()
+def trace(
+    correlation_ids: list[str] = typer.Argument(
+        None, help="Correlation IDs whose event chains to reconstruct."
+    ),
+    paths: list[Path] = typer.Option(
+        ..., "--log", "-l", help="Input log file; repeat for several sources."
+    ),
+    out: str = typer.Option("-", "--out", "-o", help="Output path or '-' for stdout."),
+    top_errors: int = typer.Option(
+        0,
+        "--top-errors",
+        min=0,
+        help="Also list the N correlation IDs with the most error events.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Parse inputs in up to N worker processes, splitting large files into chunks.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse inputs from scratch instead of reusing (and storing) cached parse results.",
+    ),
+) -> None:
+    """Reconstruct the cross-source event chain of each correlation ID as JSON."""
+    correlation_ids = correlation_ids or []
+    if not correlation_ids and not top_errors:
+        _fail("Give at least one correlation ID or --top-errors N.")
+    batches: list[EventBatch] = []
+    indexes: list[CorrelationIndex] = []
+    for path in paths:
+        batch, index = _read_correlated_source(path, jobs, cache=not no_cache)
+        batches.append(batch)
+        indexes.append(index)
+
+    traces = []
+    for correlation_id in dict.fromkeys(correlation_ids):
+        chain = trace_events(batches, indexes, correlation_id)
+        traces.append(
+            {
+                "correlation_id": correlation_id,
+                "event_count": len(chain),
+                "error_count": sum(index.errors.get(correlation_id, 0) for index in indexes),
+                "events": [
+                    {**event.to_dict(), "source": str(paths[source])} for source, event in chain
+                ],
+            }
+        )
+    payload: dict[str, Any] = {"schema_version": TRACE_SCHEMA_VERSION, "traces": traces}
+    if top_errors:
+        payload["top_error_correlation_ids"] = [
+            {"correlation_id": correlation_id, "error_count": errors, "event_count": events}
+            for correlation_id, errors, events in top_error_correlation_ids(indexes, top_errors)
+        ]
+    _write_output(out, json.dumps(payload, indent=2))
+    if out != "-":
+        typer.echo(f"Wrote {len(traces)} trace(s) to {out}")
+
+
+def _publish(target: str, content: str) -> None:
+    with _staged_output(target) as stream:
+        stream.write(content)
+
+
+@app.command()
+def follow(
+    paths: list[Path] = typer.Argument(..., help="One or more growing log files."),
+    timeline_out: str | None = typer.Option(
+        None, "--timeline-out", help="Timeline markdown path rewritten on every refresh."
+    ),
+    summary_out: str | None = typer.Option(
+        None, "--summary-out", help="Incident summary JSON path rewritten on every refresh."
+    ),
+    interval: float = typer.Option(
+        2.0, "--interval", min=0.05, help="Seconds between polls for new lines."
+    ),
+    max_refreshes: int = typer.Option(
+        0, "--max-refreshes", min=0, help="Stop after N polls (0 = run until interrupted)."
+    ),
+    keep_raw: bool = typer.Option(
+        False,
+        "--keep-raw/--no-keep-raw",
+        help="Retain each event's original log line in memory (not emitted by any output).",
+    ),
+    signature_mode: SignatureMode = typer.Option(
+        SignatureMode.normalize,
+        "--signatures",
+        help="Error grouping: 'normalize' masks digits and correlation IDs; 'drain' mines "
+        "message templates and reuses them across runs.",
+    ),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Count top components and error messages in bounded memory (Space-Saving); "
+        "counts may overstate by their reported 'error'.",
+    ),
+) -> None:
+    """Tail log files and keep timeline and summary outputs up to date."""
+    if not timeline_out and not summary_out:
+        _fail("Pass --timeline-out and/or --summary-out.")
+    if "-" in (timeline_out, summary_out):
+        _fail("follow rewrites its outputs in place; pass file paths, not '-'.")
+
+    options = ParseOptions(keep_raw=keep_raw)
+    tailers: list[SourceTailer] = []
+    for path in paths:
+        with _input_errors(path):
+            tailers.append(SourceTailer(path, options))
+
+    with _signature_engine(signature_mode) as signatures:
+        accumulator = TimelineAccumulator(
+            signatures, DEFAULT_SKETCH_CAPACITY if approx else None
+        )
+        refreshes = 0
+        changed = True
+        try:
+            while True:
+                for source_index, tailer in enumerate(tailers):
+                    lines_before = tailer.total_lines
+                    with _input_errors(tailer.path):
+                        new_events = tailer.poll()
+                    for event_index, event in new_events:
+                        accumulator.add(event, source_index, event_index)
+                    changed = changed or tailer.total_lines != lines_before
+
+                if changed:
+                    if timeline_out:
+                        _publish(timeline_out, accumulator.render())
+                    if summary_out:
+                        per_source = [{"path": str(t.path), **t.summary()} for t in tailers]
+                        payload = _build_incident_summary(accumulator.aggregator)
+                        payload["parse_summary"] = merge_parse_summaries(per_source)
+                        if len(tailers) > 1:
+                            payload["parse_summary"]["per_source"] = per_source
+                        _publish(summary_out, json.dumps(payload, indent=2))
+                    changed = False
+
+                refreshes += 1
+                if max_refreshes and refreshes >= max_refreshes:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for tailer in tailers:
+                tailer.close()
+    typer.echo(f"Followed {len(accumulator)} events from {len(tailers)} source(s)")
+
+
 def main() -> None:
     app()
 
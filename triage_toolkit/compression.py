@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when the optional extra is absent
+    zstandard = None
+
+DEFAULT_READ_BUFFER_BYTES = 1024 * 1024
+_QUEUE_DEPTH = 8
+_PUT_TIMEOUT_SECONDS = 0.1
+
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_MAGIC_BYTES = max(len(magic) for magic, _ in _MAGIC)
+
+
+def detect_compression(path: Path) -> str | None:
+    """Return ``"gzip"``, ``"bz2"``, ``"xz"`` or ``"zstd"`` from the file's magic bytes."""
+    with path.open("rb") as handle:
+        head = handle.read(_MAGIC_BYTES)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _zstd_reader(raw: BinaryIO) -> BinaryIO:
+    if zstandard is None:
+        raise OSError("zstd-compressed input requires the optional 'zstandard' package")
+    return zstandard.ZstdDecompressor().stream_reader(
+        raw, read_size=DEFAULT_READ_BUFFER_BYTES, closefd=False
+    )
+
+
+_DECOMPRESSORS: dict[str, Callable[[BinaryIO], BinaryIO]] = {
+    "gzip": lambda raw: gzip.GzipFile(fileobj=raw, mode="rb"),
+    "bz2": lambda raw: bz2.BZ2File(raw, mode="rb"),
+    "xz": lambda raw: lzma.LZMAFile(raw, mode="rb"),
+    "zstd": _zstd_reader,
+}
+
+
+class _QueueReader(io.RawIOBase):
+    """Raw binary stream over chunks handed across by the decompression thread."""
+
+    def __init__(self, chunks: queue.Queue, compression: str) -> None:
+        self._chunks = chunks
+        self._compression = compression
+        self._pending = memoryview(b"")
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            if self._done:
+                return 0
+            chunk = self._chunks.get()
+            if isinstance(chunk, BaseException):
+                self._done = True
+                if isinstance(chunk, OSError):
+                    raise chunk
+                raise OSError(f"Could not decompress {self._compression} input: {chunk}") from chunk
+            if not chunk:
+                self._done = True
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class DecompressedInput:
+    """Decompress one file on a background thread while the caller consumes its text.
+
+    The C decompressors release the GIL, so decompression overlaps with parsing. Memory is
+    bounded to a few read buffers in flight. After :meth:`close`, ``compressed_bytes`` and
+    ``uncompressed_bytes`` hold the totals read so far.
+    """
+
+    def __init__(
+        self, path: Path, compression: str, buffer_bytes: int = DEFAULT_READ_BUFFER_BYTES
+    ) -> None:
+        self.compression = compression
+        self.compressed_bytes = 0
+        self.uncompressed_bytes = 0
+        self._buffer_bytes = buffer_bytes
+        self._raw = path.open("rb", buffering=buffer_bytes)
+        self._chunks: queue.Queue = queue.Queue(maxsize=_QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+        reader = io.BufferedReader(_QueueReader(self._chunks, compression), buffer_bytes)
+        self.text = io.TextIOWrapper(reader, encoding="utf-8")
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            with _DECOMPRESSORS[self.compression](self._raw) as stream:
+                while True:
+                    chunk = stream.read(self._buffer_bytes)
+                    if not chunk:
+                        break
+                    self.uncompressed_bytes += len(chunk)
+                    if not self._put(chunk):
+                        return
+            self._put(b"")
+        except Exception as exc:  # handed to the consuming thread
+            self._put(exc)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.compressed_bytes = self._raw.tell()
+        self._raw.close()
+        self.text.close()
+
+    def __enter__(self) -> DecompressedInput:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
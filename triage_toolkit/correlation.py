@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from heapq import nsmallest
+from itertools import compress
+from typing import Any
+
+from . import __version__
+from .aggregate import error_mask
+from .batch import EventBatch
+from .models import LogEvent
+
+_INDEX_VERSION = 1
+
+
+class CorrelationIndex:
+    """Inverted index from correlation ID to the rows of one :class:`EventBatch`.
+
+    Rows are kept in batch order, with the number of :func:`~triage_toolkit.aggregate.is_error`
+    events per ID, so looking up an ID costs its own events rather than a scan of the batch.
+    IDs are keyed as text: JSON inputs may carry numeric IDs, and a persisted index and a
+    command-line argument can only hold strings.
+    """
+
+    def __init__(self) -> None:
+        self.rows: dict[str, array[int]] = {}
+        self.errors: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_batch(cls, batch: EventBatch) -> CorrelationIndex:
+        index = cls()
+        rows = index.rows
+        for row, correlation_id in enumerate(batch.correlation_ids):
+            if correlation_id:
+                key = str(correlation_id)
+                positions = rows.get(key)
+                if positions is None:
+                    positions = rows[key] = array("I")
+                positions.append(row)
+        errors = index.errors
+        correlation_ids = batch.correlation_ids
+        for row in compress(range(len(batch)), error_mask(batch)):
+            correlation_id = correlation_ids[row]
+            if correlation_id:
+                key = str(correlation_id)
+                errors[key] = errors.get(key, 0) + 1
+        return index
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": _INDEX_VERSION,
+            "toolkit_version": __version__,
+            "rows": {key: positions.tolist() for key, positions in self.rows.items()},
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> CorrelationIndex:
+        """Rebuild an index from :meth:`to_dict` output; raises ``ValueError`` if malformed."""
+        if state.get("version") != _INDEX_VERSION or state.get("toolkit_version") != __version__:
+            raise ValueError("unsupported correlation index version")
+        index = cls()
+        try:
+            index.rows = {str(key): array("I", rows) for key, rows in state["rows"].items()}
+            index.errors = {str(key): int(count) for key, count in state["errors"].items()}
+        except (KeyError, TypeError, AttributeError, OverflowError) as exc:
+            raise ValueError(f"malformed correlation index: {exc}") from exc
+        return index
+
+
+def trace_events(
+    batches: Sequence[EventBatch], indexes: Sequence[CorrelationIndex], correlation_id: str
+) -> list[tuple[int, LogEvent]]:
+    """``(source_index, event)`` for every event with ``correlation_id`` across sources.
+
+    Events come in merged timeline order: timestamp, then source index, then row.
+    """
+    keys: list[tuple[int, int, int]] = []
+    for source, (batch, index) in enumerate(zip(batches, indexes)):
+        timestamps = batch.timestamps
+        keys.extend((timestamps[row], source, row) for row in index.rows.get(correlation_id, ()))
+    keys.sort()
+    return [(source, batches[source][row]) for _, source, row in keys]
+
+
+def top_error_correlation_ids(
+    indexes: Sequence[CorrelationIndex], limit: int
+) -> list[tuple[str, int, int]]:
+    """``(correlation_id, error_count, event_count)`` for the IDs with the most errors.
+
+    Ties go to the ID with more events, then to the ID itself.
+    """
+    errors: dict[str, int] = {}
+    for index in indexes:
+        for correlation_id, count in index.errors.items():
+            errors[correlation_id] = errors.get(correlation_id, 0) + count
+    ranked = (
+        (correlation_id, count, sum(len(index.rows.get(correlation_id, ())) for index in indexes))
+        for correlation_id, count in errors.items()
+    )
+    return nsmallest(limit, ranked, key=lambda item: (-item[1], -item[2], item[0]))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+# Severity order for --level; levels not listed rank with INFO, the parser's default.
+LEVEL_RANKS = {
+    "TRACE": 0,
+    "DEBUG": 1,
+    "INFO": 2,
+    "NOTICE": 2,
+    "WARN": 3,
+    "WARNING": 3,
+    "ERROR": 4,
+    "CRITICAL": 5,
+    "FATAL": 5,
+}
+_DEFAULT_RANK = LEVEL_RANKS["INFO"]
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Compiled ``--level`` / ``--component`` / ``--cid`` / ``--grep`` predicates.
+
+    ``min_level`` keeps events at or above that severity. ``components`` are exact names,
+    or prefixes when they end in ``*``. ``correlation_ids`` are exact, and ``pattern`` is a
+    regular expression searched in the message. Empty predicates accept everything; all
+    given predicates must hold. The parser calls :meth:`accepts_source` as soon as a line's
+    level and component are known and :meth:`accepts_message` before parsing its timestamp.
+    """
+
+    min_level: str | None = None
+    components: tuple[str, ...] = ()
+    correlation_ids: tuple[str, ...] = ()
+    pattern: str | None = None
+    _min_rank: int | None = field(init=False, repr=False, compare=False, default=None)
+    _names: frozenset[str] = field(init=False, repr=False, compare=False, default=frozenset())
+    _prefixes: tuple[str, ...] = field(init=False, repr=False, compare=False, default=())
+    _regex: re.Pattern[str] | None = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.min_level is not None:
+            level = self.min_level.upper()
+            if level not in LEVEL_RANKS:
+                raise ValueError(
+                    f"Unknown level '{self.min_level}'; expected one of {', '.join(LEVEL_RANKS)}."
+                )
+            object.__setattr__(self, "_min_rank", LEVEL_RANKS[level])
+        names = frozenset(name for name in self.components if not name.endswith("*"))
+        prefixes = tuple(name[:-1] for name in self.components if name.endswith("*"))
+        object.__setattr__(self, "_names", names)
+        object.__setattr__(self, "_prefixes", prefixes)
+        if self.pattern is not None:
+            try:
+                object.__setattr__(self, "_regex", re.compile(self.pattern))
+            except re.error as exc:
+                raise ValueError(f"Invalid --grep pattern '{self.pattern}': {exc}") from exc
+
+    def accepts_source(self, level: str, component: str) -> bool:
+        if self._min_rank is not None and LEVEL_RANKS.get(level, _DEFAULT_RANK) < self._min_rank:
+            return False
+        if self.components and component not in self._names:
+            return component.startswith(self._prefixes) if self._prefixes else False
+        return True
+
+    def accepts_message(self, message: str, correlation_id: str | None) -> bool:
+        if self.correlation_ids and correlation_id not in self.correlation_ids:
+            return False
+        return self._regex is None or self._regex.search(message) is not None
+
+    def identity(self) -> dict[str, Any]:
+        """The predicates as plain values, for cache and checkpoint identities."""
+        return {
+            "min_level": self.min_level.upper() if self.min_level else None,
+            "components": sorted(self.components),
+            "correlation_ids": sorted(self.correlation_ids),
+            "pattern": self.pattern,
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .models import LogEvent
+from .parser import ParseContext, ParseOptions, merge_parse_summaries, parse_line_with_reason
+
+DEFAULT_POLL_READ_BYTES = 8 * 1024 * 1024
+_DROP_UNKNOWN = "unknown"
+
+
+class SourceTailer:
+    """Poll one log file for appended lines, following truncation and rotation.
+
+    Each :meth:`poll` reads only bytes written since the previous call and parses the
+    complete lines among them with a long-lived :class:`ParseContext`; a trailing partial
+    line waits for its newline. Like ``tail -F``, a file that is replaced (new inode) is
+    drained to its end before the new file is read from the start, and a file that shrinks
+    is read again from the start. Events keep counting up across both.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        options: ParseOptions | None = None,
+        read_bytes: int = DEFAULT_POLL_READ_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.event_count = 0
+        self.total_lines = 0
+        self._read_bytes = read_bytes
+        self._context = ParseContext(options or ParseOptions())
+        self._parsed_lines = 0
+        self._dropped: Counter[str] = Counter()
+        self._pending = b""
+        self._handle: BinaryIO = self.path.open("rb")
+        self._identity = _identity(os.fstat(self._handle.fileno()))
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> SourceTailer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def poll(self) -> list[tuple[int, LogEvent]]:
+        """Return ``(event_index, event)`` for every event completed since the last poll."""
+        events: list[tuple[int, LogEvent]] = []
+        if os.fstat(self._handle.fileno()).st_size < self._handle.tell():
+            self._restart_after_truncation(events)
+        while True:
+            chunk = self._handle.read(self._read_bytes)
+            if chunk:
+                self._consume(chunk, events)
+                continue
+            if not self._reopen_if_rotated(events):
+                return events
+
+    def summary(self) -> dict[str, Any]:
+        """Parse summary of every complete line read so far, shaped like ``parse_summary``."""
+        stats = self._context.stats() if self._context.options.verbose_stats else None
+        summary = {
+            "total_lines": self.total_lines,
+            "parsed_lines": self._parsed_lines,
+            "dropped_reasons": dict(self._dropped),
+        }
+        if stats is not None:
+            summary["stats"] = stats
+        return merge_parse_summaries([summary])
+
+    def _consume(self, chunk: bytes, events: list[tuple[int, LogEvent]]) -> None:
+        data = self._pending + chunk
+        end = data.rfind(b"\n") + 1
+        self._pending = data[end:]
+        if end:
+            self._parse(data[:end], events)
+
+    def _flush_pending(self, events: list[tuple[int, LogEvent]]) -> None:
+        # The old file will not grow any more, so its unterminated last line is complete.
+        if self._pending:
+            pending, self._pending = self._pending, b""
+            self._parse(pending, events)
+
+    def _parse(self, data: bytes, events: list[tuple[int, LogEvent]]) -> None:
+        # Decode through a text wrapper so \r\n and \r line endings match file parsing.
+        for line in io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"):
+            self.total_lines += 1
+            event, drop_reason = parse_line_with_reason(line.rstrip("\n"), self._context)
+            if event:
+                self._parsed_lines += 1
+                events.append((self.event_count, event))
+                self.event_count += 1
+            else:
+                self._dropped[drop_reason or _DROP_UNKNOWN] += 1
+
+    def _restart_after_truncation(self, events: list[tuple[int, LogEvent]]) -> None:
+        self._flush_pending(events)
+        self._handle.seek(0)
+
+    def _reopen_if_rotated(self, events: list[tuple[int, LogEvent]]) -> bool:
+        try:
+            identity = _identity(self.path.stat())
+        except FileNotFoundError:
+            # Mid-rotation: keep the old handle until a new file appears.
+            return False
+        if identity == self._identity:
+            return False
+        self._flush_pending(events)
+        handle = self.path.open("rb")
+        self._handle.close()
+        self._handle = handle
+        self._identity = _identity(os.fstat(handle.fileno()))
+        return True
+
+
+def _identity(file_stat: os.stat_result) -> tuple[int, int]:
+    return file_stat.st_dev, file_stat.st_ino
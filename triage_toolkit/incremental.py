@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from . import __version__
+from .batch import EventBatch
+from .compression import detect_compression
+from .parser import (
+    ParseOptions,
+    iter_file_events_with_summary,
+    merge_parse_stats,
+    merge_parse_summaries,
+    parse_byte_range,
+)
+from .utils import cache_dir, sampled_digests, write_atomically
+
+_STATE_VERSION = 1
+_SCAN_BYTES = 64 * 1024
+
+
+def checkpoint_dir() -> Path:
+    return cache_dir() / "incremental"
+
+
+def _state_paths(path: Path) -> tuple[Path, Path]:
+    key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+    directory = checkpoint_dir()
+    return directory / f"{key}.json", directory / f"{key}.events"
+
+
+def _complete_end(handle: BinaryIO, offset: int, size: int) -> int:
+    """Position just after the last ``\\n`` in ``[offset, size)``, or ``offset`` if none."""
+    position = size
+    while position > offset:
+        start = max(offset, position - _SCAN_BYTES)
+        handle.seek(start)
+        index = handle.read(position - start).rfind(b"\n")
+        if index != -1:
+            return start + index + 1
+        position = start
+    return offset
+
+
+def _load_checkpoint(
+    path: Path, file_stat: os.stat_result, options: ParseOptions
+) -> tuple[dict[str, Any], EventBatch] | None:
+    state_path, events_path = _state_paths(path)
+    try:
+        checkpoint = json.loads(state_path.read_text(encoding="utf-8"))
+        if (
+            checkpoint.get("version") != _STATE_VERSION
+            or checkpoint.get("toolkit_version") != __version__
+            or checkpoint.get("keep_raw") != options.keep_raw
+            or checkpoint.get("selection") != options.selection()
+            or checkpoint.get("device") != file_stat.st_dev
+            or checkpoint.get("inode") != file_stat.st_ino
+            or file_stat.st_size < checkpoint["size"]
+        ):
+            return None
+        with path.open("rb") as handle:
+            if sampled_digests(handle, checkpoint["offset"]) != checkpoint["fingerprints"]:
+                return None
+        with events_path.open("rb") as handle:
+            batch = EventBatch.load(handle)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if len(batch) != checkpoint["event_count"]:
+        return None
+    return checkpoint, batch
+
+
+def _save_checkpoint(
+    path: Path,
+    file_stat: os.stat_result,
+    offset: int,
+    batch: EventBatch,
+    summary: dict[str, Any],
+    options: ParseOptions,
+) -> None:
+    state_path, events_path = _state_paths(path)
+    with path.open("rb") as handle:
+        fingerprints = sampled_digests(handle, offset)
+    checkpoint = {
+        "version": _STATE_VERSION,
+        "toolkit_version": __version__,
+        "path": str(path.resolve()),
+        "device": file_stat.st_dev,
+        "inode": file_stat.st_ino,
+        "size": file_stat.st_size,
+        "offset": offset,
+        "fingerprints": fingerprints,
+        "event_count": len(batch),
+        "keep_raw": options.keep_raw,
+        "selection": options.selection(),
+        "summary": {key: value for key, value in summary.items() if key != "stats"},
+    }
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        # Events first: a checkpoint is only trusted when its event_count matches the batch.
+        write_atomically(events_path, batch.dump)
+        write_atomically(
+            state_path, lambda handle: handle.write(json.dumps(checkpoint).encode("utf-8"))
+        )
+    except OSError:
+        # The checkpoint is an optimization; an unwritable cache dir must not fail the run.
+        pass
+
+
+def parse_file_incremental(
+    path: str | Path, options: ParseOptions | None = None
+) -> tuple[EventBatch, dict[str, Any]]:
+    """Parse a growing file, resuming from the checkpoint left by the previous call.
+
+    Only bytes appended since the checkpoint are parsed; earlier events and summary counts
+    come from the checkpoint. A partial last line is parsed for this call but left out of
+    the checkpoint, so it is read again once complete. A different inode, a file smaller
+    than at the last run, changed content before the checkpoint, or different options
+    fall back to a full parse. Results always match :func:`parse_file_with_summary`.
+    """
+    path = Path(path)
+    options = options or ParseOptions()
+    file_stat = path.stat()
+    if not stat.S_ISREG(file_stat.st_mode) or detect_compression(path) is not None:
+        summary: dict[str, Any] = {}
+        batch = EventBatch.from_events(iter_file_events_with_summary(path, summary, options))
+        return batch, summary
+
+    loaded = _load_checkpoint(path, file_stat, options)
+    if loaded is None:
+        batch, offset, summaries = EventBatch(), 0, []
+    else:
+        checkpoint, batch = loaded
+        offset, summaries = checkpoint["offset"], [checkpoint["summary"]]
+
+    size = file_stat.st_size
+    with path.open("rb") as handle:
+        complete_end = _complete_end(handle, offset, size)
+    if complete_end > offset:
+        appended, appended_summary = parse_byte_range(path, offset, complete_end, options)
+        batch.extend(appended)
+        summaries.append(appended_summary)
+    if loaded is None or complete_end > offset:
+        _save_checkpoint(
+            path, file_stat, complete_end, batch, merge_parse_summaries(summaries), options
+        )
+
+    if complete_end < size:
+        partial, partial_summary = parse_byte_range(path, complete_end, size, options)
+        batch.extend(partial)
+        summaries.append(partial_summary)
+    summary = merge_parse_summaries(summaries)
+    if options.verbose_stats and "stats" not in summary:
+        summary["stats"] = merge_parse_stats([])
+    return batch, summary
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from pathlib import Path
+from typing import Any, Mapping
+
+from . import __version__
+from .utils import cache_dir, write_atomically
+
+_INDEX_VERSION = 1
+
+
+def time_index_dir() -> Path:
+    return cache_dir() / "index"
+
+
+def time_index_path(path: Path) -> Path:
+    key = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:32]
+    return time_index_dir() / f"{key}.json"
+
+
+class TimeIndex:
+    """Sparse timestamp index of one plain log file, for seeking to a time window.
+
+    The file is cut into newline-aligned blocks. For each block the index keeps its byte
+    offset, its line count, the earliest and latest event timestamp in it (epoch
+    microseconds, ``None`` when no line has a timestamp) and the drop reasons of its lines
+    that did not parse. That is enough to skip whole blocks outside a window and still
+    report the same line counts as reading them. Files only need to be roughly in time
+    order: blocks are skipped by the running maximum before the window and the running
+    minimum after it, so out-of-order lines are never lost, they only cost extra reading.
+    """
+
+    def __init__(self, size: int, mtime_ns: int) -> None:
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.offsets: list[int] = []
+        self.lines: list[int] = []
+        self.lowest: list[int | None] = []
+        self.highest: list[int | None] = []
+        self.dropped: list[dict[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def add_block(
+        self,
+        offset: int,
+        lines: int,
+        lowest: int | None,
+        highest: int | None,
+        dropped: Mapping[str, int],
+    ) -> None:
+        self.offsets.append(offset)
+        self.lines.append(lines)
+        self.lowest.append(lowest)
+        self.highest.append(highest)
+        self.dropped.append(dict(dropped))
+
+    def window_blocks(self, since_us: int | None, until_us: int | None) -> tuple[int, int]:
+        """Blocks ``[first, stop)`` that may hold events between ``since_us`` and ``until_us``.
+
+        Blocks before ``first`` hold only timestamps before ``since_us`` and blocks from
+        ``stop`` on only timestamps after ``until_us``.
+        """
+        first, stop = 0, len(self)
+        if since_us is not None:
+            running_max: list[float] = []
+            latest = float("-inf")
+            for highest in self.highest:
+                if highest is not None and highest > latest:
+                    latest = highest
+                running_max.append(latest)
+            first = bisect_left(running_max, since_us)
+        if until_us is not None:
+            running_min: list[float] = []
+            earliest = float("inf")
+            for lowest in reversed(self.lowest):
+                if lowest is not None and lowest < earliest:
+                    earliest = lowest
+                running_min.append(earliest)
+            running_min.reverse()
+            stop = max(first, bisect_right(running_min, until_us))
+        return first, stop
+
+    def block_offset(self, block: int) -> int:
+        return self.offsets[block] if block < len(self) else self.size
+
+    def outside_counts(self, first: int, stop: int) -> tuple[int, Counter[str]]:
+        """Timestamped lines and drop reasons of the blocks outside ``[first, stop)``."""
+        timestamped = 0
+        dropped: Counter[str] = Counter()
+        for block in (*range(first), *range(stop, len(self))):
+            reasons = self.dropped[block]
+            dropped.update(reasons)
+            timestamped += self.lines[block] - sum(reasons.values())
+        return timestamped, dropped
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": _INDEX_VERSION,
+            "toolkit_version": __version__,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "offsets": self.offsets,
+            "lines": self.lines,
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "dropped": self.dropped,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> TimeIndex:
+        """Rebuild an index from :meth:`to_dict` output; raises ``ValueError`` if malformed."""
+        if state.get("version") != _INDEX_VERSION or state.get("toolkit_version") != __version__:
+            raise ValueError("unsupported time index version")
+        try:
+            index = cls(int(state["size"]), int(state["mtime_ns"]))
+            columns = [state[key] for key in ("offsets", "lines", "lowest", "highest", "dropped")]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"malformed time index: {exc}") from exc
+        if len({len(column) for column in columns}) != 1:
+            raise ValueError("malformed time index: column lengths differ")
+        for block in zip(*columns):
+            index.add_block(*block)
+        return index
+
+
+def load_time_index(path: Path) -> TimeIndex | None:
+    """The index of ``path``, or ``None`` if there is none or the file's size or mtime moved."""
+    try:
+        file_stat = path.stat()
+        index = TimeIndex.from_dict(json.loads(time_index_path(path).read_text("utf-8")))
+    except (OSError, ValueError):
+        return None
+    if (index.size, index.mtime_ns) != (file_stat.st_size, file_stat.st_mtime_ns):
+        return None
+    return index
+
+
+def save_time_index(path: Path, index: TimeIndex) -> None:
+    """Persist ``index`` unless ``path`` changed since it was read; failures are ignored."""
+    try:
+        file_stat = path.stat()
+        if (index.size, index.mtime_ns) != (file_stat.st_size, file_stat.st_mtime_ns):
+            return
+        target = time_index_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(index.to_dict()).encode("utf-8")
+        write_atomically(target, lambda handle: handle.write(encoded))
+    except OSError:
+        pass
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, Iterator, Sequence
+
+from .models import LogEvent
+
+DEFAULT_REORDER_WINDOW = 10_000
+
+
+class MergeOrderError(ValueError):
+    """Raised when a source is further out of order than the reorder window allows."""
+
+    def __init__(self, source_index: int, event_index: int, window: int) -> None:
+        super().__init__(
+            f"source #{source_index} event #{event_index} is out of order beyond "
+            f"the reorder window of {window} events"
+        )
+        self.source_index = source_index
+        self.event_index = event_index
+        self.window = window
+
+
+def _reordered(
+    events: Iterable[LogEvent], source_index: int, window: int
+) -> Iterator[tuple[LogEvent, int, int]]:
+    # Each source is expected to be almost time-ordered, so a small heap is enough to
+    # restore (timestamp, event_index) order. An event older than something already
+    # emitted cannot be repaired without buffering the whole source.
+    buffer: list[tuple[object, int, LogEvent]] = []
+    last_emitted = None
+
+    for event_index, event in enumerate(events):
+        if last_emitted is not None and event.timestamp < last_emitted:
+            raise MergeOrderError(source_index, event_index, window)
+        heapq.heappush(buffer, (event.timestamp, event_index, event))
+        if len(buffer) > window:
+            timestamp, index, ready = heapq.heappop(buffer)
+            last_emitted = timestamp
+            yield ready, source_index, index
+
+    while buffer:
+        _, index, ready = heapq.heappop(buffer)
+        yield ready, source_index, index
+
+
+def _merge_key(item: tuple[LogEvent, int, int]) -> tuple[object, int, int]:
+    return item[0].timestamp, item[1], item[2]
+
+
+def merge_event_streams(
+    streams: Sequence[Iterable[LogEvent]],
+    *,
+    reorder_window: int = DEFAULT_REORDER_WINDOW,
+) -> Iterator[LogEvent]:
+    """Lazily merge per-source event streams into canonical order.
+
+    Ordering matches a full sort on ``(timestamp, source_index, event_index)``. Memory is
+    bounded by ``reorder_window`` events per source; a source that is more disordered
+    than that raises :class:`MergeOrderError` so callers can fall back to a full sort.
+    """
+    if reorder_window < 0:
+        raise ValueError("reorder_window must be >= 0")
+
+    ordered = [
+        _reordered(events, source_index, reorder_window)
+        for source_index, events in enumerate(streams)
+    ]
+    for event, _, _ in heapq.merge(*ordered, key=_merge_key):
+        yield event
+
+
+def sort_event_streams(streams: Sequence[Iterable[LogEvent]]) -> list[LogEvent]:
+    """Materialize and fully sort per-source streams; the unbounded fallback for merging."""
+    merged: list[tuple[LogEvent, int, int]] = []
+    for source_index, events in enumerate(streams):
+        merged.extend(
+            (event, source_index, event_index) for event_index, event in enumerate(events)
+        )
+    merged.sort(key=_merge_key)
+    return [item[0] for item in merged]
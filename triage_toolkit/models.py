@@ -5,14 +5,14 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LogEvent:
     timestamp: datetime
     level: str
     component: str
     message: str
     correlation_id: str | None
-    raw: str
+    raw: str | None = None
     source_timestamp: str | None = None
     source_offset: str | None = None
 
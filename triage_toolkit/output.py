@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, TextIO
+
+from .models import LogEvent
+
+_COMPACT = (",", ":")
+_EVENT_INDENT = "\n    "
+_SUMMARY_INDENT = "\n  "
+
+
+def _restart(stream: TextIO, started: bool) -> None:
+    # Only rewind a stream this writer has already written to: a fresh stream may be
+    # stdout, which must never be seeked or truncated.
+    if started:
+        stream.seek(0)
+        stream.truncate()
+
+
+class JsonParseWriter:
+    """Write the ``triage parse`` document incrementally.
+
+    The bytes written are identical to ``json.dumps(payload, indent=2)`` for
+    ``{"schema_version": ..., "events": [...], "parse_summary": ...}``, but events are
+    encoded one at a time so the full list never has to exist in memory.
+    """
+
+    def __init__(self, stream: TextIO, schema_version: str) -> None:
+        self._stream = stream
+        self._schema_version = schema_version
+        self._started = False
+
+    def write_events(self, events: Iterable[LogEvent]) -> int:
+        """Write the header and every event; calling again rewinds and starts over."""
+        stream = self._stream
+        _restart(stream, self._started)
+        self._started = True
+        schema_version = json.dumps(self._schema_version)
+        stream.write('{\n  "schema_version": ' + schema_version + ',\n  "events": [')
+
+        count = 0
+        separator = "\n    "
+        for event in events:
+            # json escapes control characters, so every newline here is indentation.
+            encoded = json.dumps(event.to_dict(), indent=2).replace("\n", _EVENT_INDENT)
+            stream.write(separator + encoded)
+            separator = ",\n    "
+            count += 1
+        stream.write("\n  ]," if count else "],")
+        return count
+
+    def write_summary(self, summary: dict[str, Any]) -> None:
+        encoded = json.dumps(summary, indent=2).replace("\n", _SUMMARY_INDENT)
+        self._stream.write('\n  "parse_summary": ' + encoded + "\n}")
+
+
+class NdjsonParseWriter:
+    """Write ``triage parse`` output as newline-delimited JSON.
+
+    Each event is one compact ``LogEvent.to_dict()`` object per line, followed by a final
+    record holding ``schema_version`` and ``parse_summary``.
+    """
+
+    def __init__(self, stream: TextIO, schema_version: str) -> None:
+        self._stream = stream
+        self._schema_version = schema_version
+        self._started = False
+
+    def write_events(self, events: Iterable[LogEvent]) -> int:
+        """Write one line per event; calling again rewinds and starts over."""
+        stream = self._stream
+        _restart(stream, self._started)
+        self._started = True
+
+        count = 0
+        for event in events:
+            stream.write(json.dumps(event.to_dict(), separators=_COMPACT) + "\n")
+            count += 1
+        return count
+
+    def write_summary(self, summary: dict[str, Any]) -> None:
+        record = {"schema_version": self._schema_version, "parse_summary": summary}
+        self._stream.write(json.dumps(record, separators=_COMPACT) + "\n")
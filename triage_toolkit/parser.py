@@ -1,13 +1,35 @@
 from __future__ import annotations
 
+import io
 import json
+import mmap
+import os
 import re
+import stat
 from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable, Iterator
-
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the optional extra is absent
+    orjson = None
+
+from .aggregate import is_error
+from .batch import EventBatch, to_epoch_us
+from .compression import DecompressedInput, detect_compression
+from .filters import EventFilter
+from .index import TimeIndex, load_time_index, save_time_index
 from .models import LogEvent
-from .utils import extract_correlation_id, parse_timestamp
+from .utils import (
+    TimestampParser,
+    cache_hit_stats,
+    extract_correlation_id,
+    parse_timestamp,
+)
 
 _TS_KEYS = ["timestamp", "time", "ts"]
 _LEVEL_KEYS = ["level", "severity", "lvl"]
@@ -21,6 +43,15 @@ _LEVEL_RE = re.compile(r"^(?:\[(?P<bracket>[A-Z]+)\]|(?P<plain>[A-Z]+))\s+(?P<re
 _COMPONENT_RE = re.compile(r"^(?P<component>[A-Za-z0-9_.-]+):\s*(?P<message>.*)$")
 _SOURCE_OFFSET_RE = re.compile(r"(?P<offset>Z|[+-]\d{2}:\d{2})$")
 
+_JSON_FIELD_KEYS = (_TS_KEYS, _LEVEL_KEYS, _COMPONENT_KEYS, _MESSAGE_KEYS)
+_KEY_LEARNING_LINES = 32
+_EXACT_JSON_TYPES = (str, int, bool, type(None))
+
+_BYTES_BLANK_GAP_RE = re.compile(rb"\n[ \t\x0b\x0c]*\n")
+_SCAN_BLOCK_BYTES = 1024 * 1024
+DEFAULT_MMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+_READERS = ("auto", "text", "mmap")
+
 _DROP_BLANK_LINE = "blank_line"
 _DROP_INVALID_JSON = "invalid_json"
 _DROP_JSON_NOT_OBJECT = "json_not_object"
@@ -28,6 +59,147 @@ _DROP_MISSING_TIMESTAMP = "missing_timestamp"
 _DROP_INVALID_TIMESTAMP = "invalid_timestamp"
 _DROP_UNRECOGNIZED_TEXT = "unrecognized_text"
 _DROP_UNKNOWN = "unknown"
+# Lines outside the ParseOptions time window or rejected by its event filter travel with the
+# drop reasons internally, but summaries report them as ``skipped_lines``, not as dropped.
+_SKIPPED = "skipped"
+_ERROR_HINT_RE = re.compile(r"error|critical|fatal", re.IGNORECASE)
+
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ParseOptions:
+    """Settings that change how lines are parsed or what the parse summary reports."""
+
+    verbose_stats: bool = False
+    keep_raw: bool = True
+    # "mmap" scans plain files as bytes, "text" reads them through a text-mode handle,
+    # "auto" uses mmap for regular files of at least DEFAULT_MMAP_THRESHOLD_BYTES.
+    reader: str = "auto"
+    # Inclusive UTC time window; lines outside it are skipped once their timestamp is parsed.
+    since: datetime | None = None
+    until: datetime | None = None
+    # Level/component/correlation ID/message predicates, checked before the timestamp.
+    event_filter: EventFilter | None = None
+    # Load and save the TimeIndex sidecar in the cache directory; off for --no-cache runs.
+    time_index: bool = True
+
+    def __post_init__(self) -> None:
+        if self.reader not in _READERS:
+            raise ValueError(f"reader must be one of {', '.join(_READERS)}")
+        for bound in (self.since, self.until):
+            if bound is not None and bound.tzinfo is None:
+                raise ValueError("since and until must be timezone-aware")
+
+    @property
+    def windowed(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    def selection(self) -> dict[str, Any]:
+        """The time window and event filter as plain values, for cache and checkpoint keys."""
+        return {
+            "since": self.since.isoformat() if self.since else None,
+            "until": self.until.isoformat() if self.until else None,
+            "filter": self.event_filter.identity() if self.event_filter else None,
+        }
+
+
+def _orjson_loads(line: str) -> Any:
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than json (NaN, huge numbers, lone surrogates); let the stdlib
+        # decide what counts as invalid so drop reasons never change.
+        return json.loads(line)
+
+
+def _select_json_loads() -> Callable[[str], Any]:
+    return json.loads if orjson is None else _orjson_loads
+
+
+_json_loads = _select_json_loads()
+
+
+class JsonKeyResolver:
+    """Pick JSON field values exactly like :func:`_get_first`, learning per source which key wins.
+
+    After ``learn_after`` lines the most frequent winning key of each field is checked
+    first, so later lines usually need one dict lookup. The learned key is only trusted
+    when no higher-priority key is present; otherwise the full key list is walked.
+    """
+
+    def __init__(self, learn_after: int = _KEY_LEARNING_LINES) -> None:
+        self._learn_after = learn_after
+        self._seen = 0
+        self._votes: list[Counter[str]] = [Counter() for _ in _JSON_FIELD_KEYS]
+        self._plans: list[tuple[str, tuple[str, ...]] | None] | None = None
+
+    def pick(self, payload: dict) -> tuple[Any, Any, Any, Any]:
+        """Return raw ``(timestamp, level, component, message)`` values or ``None``."""
+        plans = self._plans
+        if plans is None:
+            return self._pick_and_learn(payload)
+
+        values = []
+        for plan, keys in zip(plans, _JSON_FIELD_KEYS):
+            if plan is not None:
+                key, shadowing = plan
+                value = payload.get(key)
+                if value not in (None, "") and (
+                    not shadowing or payload.keys().isdisjoint(shadowing)
+                ):
+                    values.append(value)
+                    continue
+            values.append(_get_first_value(payload, keys))
+        return values[0], values[1], values[2], values[3]
+
+    def _pick_and_learn(self, payload: dict) -> tuple[Any, Any, Any, Any]:
+        values = []
+        for votes, keys in zip(self._votes, _JSON_FIELD_KEYS):
+            for key in keys:
+                if key in payload and payload[key] not in (None, ""):
+                    votes[key] += 1
+                    values.append(payload[key])
+                    break
+            else:
+                values.append(None)
+
+        self._seen += 1
+        if self._seen >= self._learn_after:
+            self._plans = [
+                _key_plan(votes.most_common(1)[0][0], keys) if votes else None
+                for votes, keys in zip(self._votes, _JSON_FIELD_KEYS)
+            ]
+        return values[0], values[1], values[2], values[3]
+
+
+def _key_plan(key: str, keys: list[str]) -> tuple[str, tuple[str, ...]]:
+    return key, tuple(keys[: keys.index(key)])
+
+
+@dataclass
+class ParseContext:
+    """Per-source state carried across the lines of one input."""
+
+    options: ParseOptions = field(default_factory=ParseOptions)
+    parse_timestamp: TimestampParser = field(default_factory=TimestampParser)
+    json_keys: JsonKeyResolver = field(default_factory=JsonKeyResolver)
+    # Timestamp of the most recent line whose timestamp parsed, inside the window or not.
+    last_timestamp: datetime | None = None
+
+    def stats(self) -> dict[str, Any]:
+        return {"timestamp_cache": self.parse_timestamp.cache_stats()}
+
+
+def _outside_window(timestamp: datetime, context: ParseContext | None) -> bool:
+    """Record ``timestamp`` on ``context`` and tell whether it falls outside the window."""
+    if context is None:
+        return False
+    context.last_timestamp = timestamp
+    options = context.options
+    return (options.since is not None and timestamp < options.since) or (
+        options.until is not None and timestamp > options.until
+    )
 
 
 def _get_first(data: dict, keys: list[str], default: str | None = None) -> str | None:
@@ -37,6 +209,13 @@ def _get_first(data: dict, keys: list[str], default: str | None = None) -> str |
     return default
 
 
+def _get_first_value(data: dict, keys: list[str]) -> Any:
+    for key in keys:
+        if key in data and data[key] not in (None, ""):
+            return data[key]
+    return None
+
+
 def _source_timestamp_provenance(value: str) -> tuple[str, str | None]:
     source_timestamp = value.strip()
     offset_match = _SOURCE_OFFSET_RE.search(source_timestamp)
@@ -44,29 +223,75 @@ def _source_timestamp_provenance(value: str) -> tuple[str, str | None]:
     return source_timestamp, source_offset
 
 
-def _parse_json_line_with_reason(line: str) -> tuple[LogEvent | None, str | None]:
+def _pick_json_fields(
+    payload: dict, keys: JsonKeyResolver | None
+) -> tuple[Any, Any, Any, Any, Any]:
+    if keys is None:
+        fields = tuple(_get_first_value(payload, field_keys) for field_keys in _JSON_FIELD_KEYS)
+    else:
+        fields = keys.pick(payload)
+    correlation_id = payload.get("correlation_id") or payload.get("cid")
+    return fields[0], fields[1], fields[2], fields[3], correlation_id
+
+
+def _json_event_fields(
+    level_raw: Any, component_raw: Any, message_raw: Any, correlation_id: Any
+) -> tuple[str, str, str, Any]:
+    level = (str(level_raw) if level_raw is not None else "INFO").upper() or "INFO"
+    component = str(component_raw) if component_raw is not None else "unknown"
+    message = str(message_raw) if message_raw is not None else ""
+    if correlation_id is None:
+        correlation_id = extract_correlation_id(message)
+    return level, component, message, correlation_id
+
+
+def _parse_json_line_with_reason(
+    line: str, context: ParseContext | None = None
+) -> tuple[LogEvent | None, str | None]:
     try:
-        payload = json.loads(line)
-    except json.JSONDecodeError:
+        payload = _json_loads(line)
+    except ValueError:
         return None, _DROP_INVALID_JSON
     if not isinstance(payload, dict):
         return None, _DROP_JSON_NOT_OBJECT
 
-    ts_value = _get_first(payload, _TS_KEYS)
+    keys = context.json_keys if context else None
+    fields = _pick_json_fields(payload, keys)
+    if _json_loads is not json.loads and not all(
+        isinstance(value, _EXACT_JSON_TYPES) for value in fields
+    ):
+        # orjson turns integers beyond 64 bits into floats; re-decode so str() matches json.
+        fields = _pick_json_fields(json.loads(line), keys)
+    ts_raw, level_raw, component_raw, message_raw, correlation_id = fields
+
+    if ts_raw is None:
+        return None, _DROP_MISSING_TIMESTAMP
+    ts_value = str(ts_raw)
     if not ts_value:
         return None, _DROP_MISSING_TIMESTAMP
 
+    event_filter = context.options.event_filter if context else None
+    if event_filter is not None:
+        level, component, message, correlation_id = _json_event_fields(
+            level_raw, component_raw, message_raw, correlation_id
+        )
+        if not (
+            event_filter.accepts_source(level, component)
+            and event_filter.accepts_message(message, correlation_id)
+        ):
+            return None, _SKIPPED
+
     source_timestamp, source_offset = _source_timestamp_provenance(ts_value)
-    timestamp = parse_timestamp(source_timestamp)
+    timestamp = (context.parse_timestamp if context else parse_timestamp)(source_timestamp)
     if not timestamp:
         return None, _DROP_INVALID_TIMESTAMP
+    if _outside_window(timestamp, context):
+        return None, _SKIPPED
 
-    level = (_get_first(payload, _LEVEL_KEYS, "INFO") or "INFO").upper()
-    component = _get_first(payload, _COMPONENT_KEYS, "unknown") or "unknown"
-    message = _get_first(payload, _MESSAGE_KEYS, "") or ""
-    correlation_id = payload.get("correlation_id") or payload.get("cid")
-    if correlation_id is None:
-        correlation_id = extract_correlation_id(message)
+    if event_filter is None:
+        level, component, message, correlation_id = _json_event_fields(
+            level_raw, component_raw, message_raw, correlation_id
+        )
 
     return (
         LogEvent(
@@ -75,7 +300,7 @@ def _parse_json_line_with_reason(line: str) -> tuple[LogEvent | None, str | None
             component=component,
             message=message,
             correlation_id=correlation_id,
-            raw=line.rstrip(),
+            raw=line.rstrip() if context is None or context.options.keep_raw else None,
             source_timestamp=source_timestamp,
             source_offset=source_offset,
         ),
@@ -88,17 +313,8 @@ def parse_json_line(line: str) -> LogEvent | None:
     return event
 
 
-def _parse_text_line_with_reason(line: str) -> tuple[LogEvent | None, str | None]:
-    match = _TEXT_TS_RE.match(line)
-    if not match:
-        return None, _DROP_UNRECOGNIZED_TEXT
-
-    source_timestamp, source_offset = _source_timestamp_provenance(match.group("ts"))
-    timestamp = parse_timestamp(source_timestamp)
-    if not timestamp:
-        return None, _DROP_INVALID_TIMESTAMP
-
-    rest = match.group("rest").strip()
+def _text_event_fields(rest: str) -> tuple[str, str, str]:
+    rest = rest.strip()
     level = "INFO"
     level_match = _LEVEL_RE.match(rest)
     if level_match:
@@ -111,8 +327,37 @@ def _parse_text_line_with_reason(line: str) -> tuple[LogEvent | None, str | None
     if comp_match:
         component = comp_match.group("component")
         message = comp_match.group("message").strip()
+    return level, component, message
+
+
+def _parse_text_line_with_reason(
+    line: str, context: ParseContext | None = None
+) -> tuple[LogEvent | None, str | None]:
+    match = _TEXT_TS_RE.match(line)
+    if not match:
+        return None, _DROP_UNRECOGNIZED_TEXT
 
-    correlation_id = extract_correlation_id(message)
+    event_filter = context.options.event_filter if context else None
+    if event_filter is not None:
+        # Level and component come from two short regex matches, far cheaper than the
+        # timestamp, so a filter rejects most lines before the timestamp is parsed.
+        level, component, message = _text_event_fields(match.group("rest"))
+        if not event_filter.accepts_source(level, component):
+            return None, _SKIPPED
+        correlation_id = extract_correlation_id(message)
+        if not event_filter.accepts_message(message, correlation_id):
+            return None, _SKIPPED
+
+    source_timestamp, source_offset = _source_timestamp_provenance(match.group("ts"))
+    timestamp = (context.parse_timestamp if context else parse_timestamp)(source_timestamp)
+    if not timestamp:
+        return None, _DROP_INVALID_TIMESTAMP
+    if _outside_window(timestamp, context):
+        return None, _SKIPPED
+
+    if event_filter is None:
+        level, component, message = _text_event_fields(match.group("rest"))
+        correlation_id = extract_correlation_id(message)
 
     return (
         LogEvent(
@@ -121,7 +366,7 @@ def _parse_text_line_with_reason(line: str) -> tuple[LogEvent | None, str | None
             component=component,
             message=message,
             correlation_id=correlation_id,
-            raw=line.rstrip(),
+            raw=line.rstrip() if context is None or context.options.keep_raw else None,
             source_timestamp=source_timestamp,
             source_offset=source_offset,
         ),
@@ -134,15 +379,17 @@ def parse_text_line(line: str) -> LogEvent | None:
     return event
 
 
-def parse_line_with_reason(line: str) -> tuple[LogEvent | None, str | None]:
+def parse_line_with_reason(
+    line: str, context: ParseContext | None = None
+) -> tuple[LogEvent | None, str | None]:
     stripped = line.lstrip()
     if not stripped:
         return None, _DROP_BLANK_LINE
 
     if stripped.startswith("{"):
-        event, drop_reason = _parse_json_line_with_reason(stripped)
+        event, drop_reason = _parse_json_line_with_reason(stripped, context)
     else:
-        event, drop_reason = _parse_text_line_with_reason(stripped)
+        event, drop_reason = _parse_text_line_with_reason(stripped, context)
 
     if event:
         return event, None
@@ -159,53 +406,569 @@ def _build_parse_summary(
     total_lines: int,
     parsed_lines: int,
     dropped_reasons: Counter[str],
+    stats: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    dropped_lines = total_lines - parsed_lines
-    drop_ratio = dropped_lines / total_lines if total_lines else 0.0
-    summary = {
-        "total_lines": total_lines,
-        "parsed_lines": parsed_lines,
-        "dropped_lines": dropped_lines,
-        "drop_ratio": round(drop_ratio, 6),
-        "dropped_reasons": {
-            reason: dropped_reasons[reason] for reason in sorted(dropped_reasons)
-        },
-    }
+    # Lines skipped by the time window were neither parsed nor broken, so the drop ratio
+    # covers only the lines that were considered.
+    skipped_lines = dropped_reasons.get(_SKIPPED, 0)
+    considered_lines = total_lines - skipped_lines
+    dropped_lines = considered_lines - parsed_lines
+    drop_ratio = dropped_lines / considered_lines if considered_lines else 0.0
+    summary: dict[str, Any] = {"total_lines": total_lines, "parsed_lines": parsed_lines}
+    if skipped_lines:
+        summary["skipped_lines"] = skipped_lines
+    summary.update(
+        {
+            "dropped_lines": dropped_lines,
+            "drop_ratio": round(drop_ratio, 6),
+            "dropped_reasons": {
+                reason: dropped_reasons[reason]
+                for reason in sorted(dropped_reasons)
+                if reason != _SKIPPED
+            },
+        }
+    )
+    if stats is not None:
+        summary["stats"] = stats
     return summary
 
 
-def parse_lines_with_summary(lines: Iterable[str]) -> tuple[list[LogEvent], dict[str, Any]]:
-    events: list[LogEvent] = []
+def merge_parse_summaries(summaries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Add up per-source or per-run parse summaries into one summary."""
+    total_lines = sum(int(summary["total_lines"]) for summary in summaries)
+    parsed_lines = sum(int(summary["parsed_lines"]) for summary in summaries)
+    dropped_reasons: Counter[str] = Counter()
+    for summary in summaries:
+        dropped_reasons.update(_unparsed_line_counts(summary))
+
+    stats = None
+    if any("stats" in summary for summary in summaries):
+        stats = merge_parse_stats(summary["stats"] for summary in summaries if "stats" in summary)
+    merged = _build_parse_summary(
+        total_lines=total_lines,
+        parsed_lines=parsed_lines,
+        dropped_reasons=dropped_reasons,
+        stats=stats,
+    )
+    if len(summaries) == 1 and "compression" in summaries[0]:
+        merged["compression"] = summaries[0]["compression"]
+    return merged
+
+
+def _unparsed_line_counts(summary: dict[str, Any]) -> Counter[str]:
+    """Drop reasons of a built summary, with its skipped lines folded back in."""
+    counts = Counter(
+        {reason: int(count) for reason, count in summary.get("dropped_reasons", {}).items()}
+    )
+    if summary.get("skipped_lines"):
+        counts[_SKIPPED] += int(summary["skipped_lines"])
+    return counts
+
+
+def merge_parse_stats(stats: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Combine verbose ``stats`` blocks from several sources or byte ranges."""
+    hits = 0
+    misses = 0
+    for item in stats:
+        hits += item["timestamp_cache"]["hits"]
+        misses += item["timestamp_cache"]["misses"]
+    return {"timestamp_cache": cache_hit_stats(hits, misses)}
+
+
+def iter_events_with_summary(
+    lines: Iterable[str],
+    summary: dict[str, Any],
+    options: ParseOptions | None = None,
+    *,
+    dropped: Counter[str] | None = None,
+) -> Iterator[LogEvent]:
+    """Yield parsed events lazily; ``summary`` is filled in once ``lines`` is exhausted.
+
+    ``dropped`` holds drops the line source classified itself (blank lines counted at the
+    byte level) so they never reach ``lines``; they still count towards ``total_lines``.
+    """
+    context = ParseContext(options or ParseOptions())
     dropped_reasons: Counter[str] = Counter()
     total_lines = 0
+    parsed_lines = 0
 
     for line in lines:
         total_lines += 1
-        event, drop_reason = parse_line_with_reason(line)
+        event, drop_reason = parse_line_with_reason(line, context)
         if event:
-            events.append(event)
+            parsed_lines += 1
+            yield event
         else:
             dropped_reasons[drop_reason or _DROP_UNKNOWN] += 1
 
-    summary = _build_parse_summary(
-        total_lines=total_lines,
-        parsed_lines=len(events),
-        dropped_reasons=dropped_reasons,
+    if dropped:
+        total_lines += sum(dropped.values())
+        dropped_reasons.update(dropped)
+    summary.update(
+        _build_parse_summary(
+            total_lines=total_lines,
+            parsed_lines=parsed_lines,
+            dropped_reasons=dropped_reasons,
+            stats=context.stats() if context.options.verbose_stats else None,
+        )
     )
+
+
+def parse_lines_with_summary(
+    lines: Iterable[str], options: ParseOptions | None = None
+) -> tuple[list[LogEvent], dict[str, Any]]:
+    summary: dict[str, Any] = {}
+    events = list(iter_events_with_summary(lines, summary, options))
     return events, summary
 
 
-def _iter_file_lines(path: Path) -> Iterator[str]:
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
+def _iter_file_lines(path: Path, compression: dict[str, Any] | None = None) -> Iterator[str]:
+    """Yield lines without their newline, decompressing gzip/bz2/xz/zstd input on the fly.
+
+    For compressed input, ``compression`` receives the format and byte counts at the end.
+    """
+    compression_format = detect_compression(path)
+    if compression_format is None:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                yield line.rstrip("\n")
+        return
+
+    with DecompressedInput(path, compression_format) as source:
+        for line in source.text:
             yield line.rstrip("\n")
+    if compression is not None:
+        compression.update(
+            {
+                "format": compression_format,
+                "compressed_bytes": source.compressed_bytes,
+                "uncompressed_bytes": source.uncompressed_bytes,
+            }
+        )
+
+
+def _has_blank_line(data: bytes) -> bool:
+    if _BYTES_BLANK_GAP_RE.search(data):
+        return True
+    first_end = data.find(b"\n")
+    first = data if first_end == -1 else data[:first_end]
+    if not first or first.isspace():
+        return True
+    tail = data[data.rfind(b"\n") + 1 :]
+    return tail.isspace()
+
+
+def _decode_block_lines(data: bytes, dropped: Counter[str]) -> list[str]:
+    """Split a newline-aligned block into lines, counting blank lines without decoding them."""
+    if not data:
+        return []
+    if b"\r" in data:
+        # Universal newlines also break on a lone \r; let TextIOWrapper apply the exact rules.
+        with io.TextIOWrapper(io.BytesIO(data), encoding="utf-8") as text:
+            return [line.rstrip("\n") for line in text]
+
+    if _has_blank_line(data):
+        lines = data.split(b"\n")
+        if not lines[-1]:
+            lines.pop()
+        kept = [line for line in lines if line and not line.isspace()]
+        dropped[_DROP_BLANK_LINE] += len(lines) - len(kept)
+        if not kept:
+            return []
+        data = b"\n".join(kept)
+
+    lines = data.decode("utf-8").split("\n")
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _scan_blocks(view: bytes | mmap.mmap, start: int, end: int) -> Iterator[tuple[int, int]]:
+    # Blocks end just after a b"\n", so no line, CRLF pair or UTF-8 sequence is split.
+    while start < end:
+        stop = end
+        if start + _SCAN_BLOCK_BYTES < end:
+            stop = view.rfind(b"\n", start, start + _SCAN_BLOCK_BYTES) + 1
+            if stop <= start:
+                stop = view.find(b"\n", start + _SCAN_BLOCK_BYTES, end) + 1 or end
+        yield start, stop
+        start = stop
+
+
+def _iter_scanned_lines(
+    view: bytes | mmap.mmap, start: int, end: int, dropped: Counter[str]
+) -> Iterator[str]:
+    for block_start, block_stop in _scan_blocks(view, start, end):
+        yield from _decode_block_lines(view[block_start:block_stop], dropped)
+
+
+def _iter_mmap_lines(
+    path: Path, dropped: Counter[str], start: int = 0, end: int | None = None
+) -> Iterator[str]:
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield from _iter_scanned_lines(view, start, end, dropped)
+
+
+def _use_mmap_reader(path: Path, options: ParseOptions) -> bool:
+    if options.reader == "text":
+        return False
+    file_stat = path.stat()
+    if not stat.S_ISREG(file_stat.st_mode):
+        return False
+    # Windowed parses always scan blocks so that they can build and use a TimeIndex.
+    if (
+        options.reader == "auto"
+        and not options.windowed
+        and file_stat.st_size < DEFAULT_MMAP_THRESHOLD_BYTES
+    ):
+        return False
+    return detect_compression(path) is None
+
+
+def _window_us(options: ParseOptions) -> tuple[int | None, int | None]:
+    since, until = options.since, options.until
+    return (
+        to_epoch_us(since) if since is not None else None,
+        to_epoch_us(until) if until is not None else None,
+    )
+
+
+def _iter_events_building_index(
+    path: Path, summary: dict[str, Any], options: ParseOptions
+) -> Iterator[LogEvent]:
+    """Scan a plain file block by block and save its :class:`TimeIndex` once fully read.
+
+    The window still applies while the index is built: lines outside it only have their
+    timestamp parsed. Counts match :func:`iter_events_with_summary` over the same lines.
+    """
+    context = ParseContext(options)
+    dropped_reasons: Counter[str] = Counter()
+    total_lines = 0
+    parsed_lines = 0
+    with path.open("rb") as handle:
+        file_stat = os.fstat(handle.fileno())
+        index = TimeIndex(file_stat.st_size, file_stat.st_mtime_ns)
+        view = (
+            mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if file_stat.st_size else b""
+        )
+        try:
+            for start, stop in _scan_blocks(view, 0, file_stat.st_size):
+                # Only lines without a usable timestamp go into the block's drop reasons.
+                block_dropped: Counter[str] = Counter()
+                lines = _decode_block_lines(view[start:stop], block_dropped)
+                block_lines = len(lines) + sum(block_dropped.values())
+                lowest: datetime | None = None
+                highest: datetime | None = None
+                for line in lines:
+                    context.last_timestamp = None
+                    event, drop_reason = parse_line_with_reason(line, context)
+                    timestamp = context.last_timestamp
+                    if timestamp is not None:
+                        if lowest is None or timestamp < lowest:
+                            lowest = timestamp
+                        if highest is None or timestamp > highest:
+                            highest = timestamp
+                    if event:
+                        parsed_lines += 1
+                        yield event
+                    elif drop_reason == _SKIPPED:
+                        dropped_reasons[drop_reason] += 1
+                    else:
+                        block_dropped[drop_reason or _DROP_UNKNOWN] += 1
+                index.add_block(
+                    start,
+                    block_lines,
+                    to_epoch_us(lowest) if lowest else None,
+                    to_epoch_us(highest) if highest else None,
+                    block_dropped,
+                )
+                total_lines += block_lines
+                dropped_reasons.update(block_dropped)
+        finally:
+            if isinstance(view, mmap.mmap):
+                view.close()
+
+    save_time_index(path, index)
+    summary.update(
+        _build_parse_summary(
+            total_lines=total_lines,
+            parsed_lines=parsed_lines,
+            dropped_reasons=dropped_reasons,
+            stats=context.stats() if options.verbose_stats else None,
+        )
+    )
 
 
-def parse_file_with_summary(path: str | Path) -> tuple[list[LogEvent], dict[str, Any]]:
+def _outside_window_counts(index: TimeIndex, first: int, stop: int) -> Counter[str]:
+    timestamped, dropped = index.outside_counts(first, stop)
+    if timestamped:
+        dropped[_SKIPPED] += timestamped
+    return dropped
+
+
+def _indexed_read_blocks(index: TimeIndex, options: ParseOptions) -> tuple[int, int]:
+    """Blocks ``[first, stop)`` to read; the index accounts for every other block."""
+    first, stop = index.window_blocks(*_window_us(options))
+    if options.event_filter is not None:
+        # A filter rejects lines before their timestamp is parsed, so a line the index
+        # counts as an invalid timestamp may be skipped instead. Read every block that has
+        # one; the other drop reasons are decided before any filter runs.
+        invalid = [
+            block
+            for block, reasons in enumerate(index.dropped)
+            if reasons.get(_DROP_INVALID_TIMESTAMP)
+        ]
+        if invalid:
+            first, stop = min(first, invalid[0]), max(stop, invalid[-1] + 1)
+    return first, stop
+
+
+def _iter_indexed_events(
+    path: Path, index: TimeIndex, summary: dict[str, Any], options: ParseOptions
+) -> Iterator[LogEvent]:
+    """Read only the blocks ``index`` places in the window; the rest count from the index."""
+    first, stop = _indexed_read_blocks(index, options)
+    dropped = _outside_window_counts(index, first, stop)
+    lines = _iter_mmap_lines(path, dropped, index.block_offset(first), index.block_offset(stop))
+    yield from iter_events_with_summary(lines, summary, options, dropped=dropped)
+
+
+def build_time_index(path: str | Path) -> TimeIndex | None:
+    """Parse a plain file once and save its :class:`TimeIndex` for later windowed parses.
+
+    Returns the saved index, or ``None`` if it could not be saved because the file changed
+    while it was read or the cache directory is not writable.
+    """
     path = Path(path)
-    return parse_lines_with_summary(_iter_file_lines(path))
+    if detect_compression(path) is not None:
+        raise ValueError(f"Compressed inputs cannot be indexed: {path}")
+    summary: dict[str, Any] = {}
+    for _ in _iter_events_building_index(path, summary, ParseOptions(keep_raw=False)):
+        pass
+    return load_time_index(path)
+
+
+def iter_file_events_with_summary(
+    path: str | Path,
+    summary: dict[str, Any],
+    options: ParseOptions | None = None,
+) -> Iterator[LogEvent]:
+    """Stream events from one file; see :func:`iter_events_with_summary`.
+
+    Compressed inputs add a ``compression`` block with compressed and uncompressed sizes.
+    """
+    path = Path(path)
+    options = options or ParseOptions()
+    compression: dict[str, Any] = {}
+    dropped: Counter[str] = Counter()
+    if _use_mmap_reader(path, options):
+        index = load_time_index(path) if options.time_index else None
+        # Filtered lines never have their timestamp parsed, so they cannot build an index.
+        if index is None and options.time_index and options.event_filter is None:
+            yield from _iter_events_building_index(path, summary, options)
+            return
+        if index is not None and options.windowed:
+            yield from _iter_indexed_events(path, index, summary, options)
+            return
+        lines = _iter_mmap_lines(path, dropped)
+    else:
+        lines = _iter_file_lines(path, compression)
+    yield from iter_events_with_summary(lines, summary, options, dropped=dropped)
+    if compression:
+        summary["compression"] = compression
+
+
+def parse_file_with_summary(
+    path: str | Path,
+    *,
+    workers: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    options: ParseOptions | None = None,
+) -> tuple[list[LogEvent], dict[str, Any]]:
+    """Parse one file; with ``workers > 1`` large files are split into byte ranges."""
+    path = Path(path)
+    if workers > 1:
+        return next(
+            parse_files_with_summary(
+                [path], jobs=workers, chunk_bytes=chunk_bytes, options=options
+            )
+        )
+    summary: dict[str, Any] = {}
+    events = list(iter_file_events_with_summary(path, summary, options))
+    return events, summary
 
 
 def parse_file(path: str | Path) -> list[LogEvent]:
     events, _ = parse_file_with_summary(path)
     return events
+
+
+def first_error_timestamp(path: str | Path) -> datetime | None:
+    """Earliest timestamp of an :func:`~triage_toolkit.aggregate.is_error` event in ``path``.
+
+    Only lines mentioning error, critical or fatal (in any case) are parsed, which covers
+    every error event, so the scan costs little more than reading the file.
+    """
+    first: datetime | None = None
+    context = ParseContext(ParseOptions(keep_raw=False))
+    for line in _iter_file_lines(Path(path)):
+        if not _ERROR_HINT_RE.search(line):
+            continue
+        event, _ = parse_line_with_reason(line, context)
+        if event and is_error(event) and (first is None or event.timestamp < first):
+            first = event.timestamp
+    return first
+
+
+def _plan_byte_ranges(
+    path: Path, chunk_bytes: int, start: int = 0, stop: int | None = None
+) -> list[tuple[int, int]]:
+    # Every range ends just after a b"\n", which is always a line boundary in universal
+    # newline mode and never splits a multi-byte UTF-8 sequence. ``start`` and ``stop``
+    # must be line boundaries too.
+    ranges: list[tuple[int, int]] = []
+    with path.open("rb") as handle:
+        size = handle.seek(0, io.SEEK_END)
+        if stop is not None:
+            size = min(size, stop)
+        while start < size:
+            end = start + max(chunk_bytes, 1)
+            if end < size:
+                handle.seek(end - 1)
+                handle.readline()
+                end = handle.tell()
+            end = min(end, size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _plan_window_ranges(
+    path: Path, chunk_bytes: int, options: ParseOptions
+) -> tuple[list[tuple[int, int]], dict[str, Any] | None]:
+    """Byte ranges to parse, plus a summary of the lines an existing index lets us skip."""
+    index = load_time_index(path) if options.windowed and options.time_index else None
+    if index is None:
+        return _plan_byte_ranges(path, chunk_bytes), None
+    first, stop = _indexed_read_blocks(index, options)
+    dropped = _outside_window_counts(index, first, stop)
+    outside = _build_parse_summary(
+        total_lines=sum(dropped.values()),
+        parsed_lines=0,
+        dropped_reasons=dropped,
+        stats=merge_parse_stats([]) if options.verbose_stats else None,
+    )
+    ranges = _plan_byte_ranges(
+        path, chunk_bytes, index.block_offset(first), index.block_offset(stop)
+    )
+    return ranges, outside
+
+
+def _read_byte_range(path: Path, start: int, end: int) -> bytes:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        return handle.read(end - start)
+
+
+def parse_byte_range(
+    path: str | Path, start: int, end: int, options: ParseOptions | None = None
+) -> tuple[EventBatch, dict[str, Any]]:
+    """Parse bytes ``[start, end)`` of a plain file; both ends must be line boundaries."""
+    # Columnar batches pickle far smaller than LogEvent objects on the way back from workers.
+    summary: dict[str, Any] = {}
+    data = _read_byte_range(Path(path), start, end)
+    dropped: Counter[str] = Counter()
+    lines = _iter_scanned_lines(data, 0, len(data), dropped)
+    events = iter_events_with_summary(lines, summary, options, dropped=dropped)
+    batch = EventBatch.from_events(events)
+    return batch, summary
+
+
+def _parse_whole_file(path: str, options: ParseOptions) -> tuple[EventBatch, dict[str, Any]]:
+    summary: dict[str, Any] = {}
+    batch = EventBatch.from_events(iter_file_events_with_summary(path, summary, options))
+    return batch, summary
+
+
+def _stitch_ranges(
+    results: list[tuple[EventBatch, dict[str, Any]]],
+    options: ParseOptions,
+) -> tuple[list[LogEvent], dict[str, Any]]:
+    events: list[LogEvent] = []
+    dropped_reasons: Counter[str] = Counter()
+    total_lines = 0
+    for batch, summary in results:
+        events.extend(batch)
+        total_lines += summary["total_lines"]
+        dropped_reasons.update(_unparsed_line_counts(summary))
+    stats = None
+    if options.verbose_stats:
+        stats = merge_parse_stats(summary["stats"] for _, summary in results)
+    summary = _build_parse_summary(
+        total_lines=total_lines,
+        parsed_lines=len(events),
+        dropped_reasons=dropped_reasons,
+        stats=stats,
+    )
+    return events, summary
+
+
+def parse_files_with_summary(
+    paths: Sequence[str | Path],
+    *,
+    jobs: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    options: ParseOptions | None = None,
+) -> Iterator[tuple[list[LogEvent], dict[str, Any]]]:
+    """Parse several files with up to ``jobs`` worker processes, yielding in input order.
+
+    Files are split into newline-aligned byte ranges of about ``chunk_bytes`` so that one
+    large file can keep every worker busy; ranges are stitched back in line order and the
+    summary matches a serial parse exactly. Windowed parses of files with a saved
+    :class:`TimeIndex` only plan ranges for the blocks in the window. Compressed files
+    cannot be split and are parsed by a single worker. Errors surface when their file's
+    turn comes.
+    """
+    options = options or ParseOptions()
+    if jobs <= 1:
+        for path in paths:
+            yield parse_file_with_summary(path, options=options)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending: list[tuple[list[Future], dict[str, Any] | None] | Future | OSError] = []
+        for path in paths:
+            try:
+                if detect_compression(Path(path)) is not None:
+                    pending.append(executor.submit(_parse_whole_file, str(path), options))
+                    continue
+                ranges, outside = _plan_window_ranges(Path(path), chunk_bytes, options)
+            except OSError as exc:
+                pending.append(exc)
+                continue
+            futures = [
+                executor.submit(parse_byte_range, str(path), start, end, options)
+                for start, end in ranges
+            ]
+            pending.append((futures, outside))
+
+        for item in pending:
+            if isinstance(item, OSError):
+                raise item
+            if isinstance(item, Future):
+                batch, summary = item.result()
+                yield list(batch), summary
+                continue
+            futures, outside = item
+            results = [future.result() for future in futures]
+            if outside is not None:
+                results.append((EventBatch(), outside))
+            yield _stitch_ranges(results, options)
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from math import sqrt
+from statistics import median_low
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised when the optional extra is absent
+    numpy = None
+
+from .aggregate import error_mask
+from .batch import EventBatch
+
+DEFAULT_BUCKET_US = 60 * 1_000_000
+# Long incidents get wider buckets so the rate view never exceeds this many rows.
+MAX_BUCKETS = 1440
+DEFAULT_BURST_Z = 3.0
+DEFAULT_MIN_BURST_ERRORS = 3
+_EWMA_ALPHA = 0.3
+# The baseline starts from the median of this many leading buckets rather than from zero.
+_WARMUP_BUCKETS = 10
+# After this many buckets a burst feeds the baseline again, so a lasting shift ends it.
+_MAX_FROZEN_BUCKETS = 5
+# Scales a median absolute deviation to a standard deviation for normal data.
+_MAD_SCALE = 1.4826
+
+
+@dataclass(frozen=True)
+class Burst:
+    """Consecutive buckets ``first..last`` whose error counts jumped above the baseline.
+
+    ``baseline`` and ``z_score`` describe the first bucket: the EWMA of the error counts
+    before it and how many standard deviations above that it was.
+    """
+
+    first: int
+    last: int
+    errors: int
+    peak_errors: int
+    baseline: float
+    z_score: float
+
+
+@dataclass
+class RateHistogram:
+    """Event counts per fixed-width time bucket, in total and by error, level and component.
+
+    Bucket ``i`` covers ``[start_us + i * bucket_us, start_us + (i + 1) * bucket_us)``;
+    ``start_us`` is aligned to a multiple of ``bucket_us``.
+    """
+
+    start_us: int
+    bucket_us: int
+    totals: list[int]
+    errors: list[int]
+    levels: dict[str, list[int]]
+    components: dict[str, list[int]]
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def bucket_start_us(self, bucket: int) -> int:
+        return self.start_us + bucket * self.bucket_us
+
+
+def _bucket_layout(lowest: int, highest: int, bucket_us: int) -> tuple[int, int, int]:
+    """``(start_us, bucket_us, count)`` with ``bucket_us`` widened to fit :data:`MAX_BUCKETS`."""
+    while True:
+        start = lowest - lowest % bucket_us
+        count = (highest - start) // bucket_us + 1
+        if count <= MAX_BUCKETS:
+            return start, bucket_us, count
+        bucket_us *= -(-count // MAX_BUCKETS)
+
+
+def rate_histogram(batch: EventBatch, bucket_us: int = DEFAULT_BUCKET_US) -> RateHistogram:
+    """Bucket every row of ``batch`` by timestamp; uses NumPy when it is installed.
+
+    Errors are :func:`~triage_toolkit.aggregate.is_error` events. Levels and components
+    with no events are left out.
+    """
+    if bucket_us < 1:
+        raise ValueError("bucket width must be at least one microsecond")
+    if not len(batch):
+        return RateHistogram(0, bucket_us, [], [], {}, {})
+    timestamps = batch.timestamps
+    start, bucket_us, count = _bucket_layout(min(timestamps), max(timestamps), bucket_us)
+    count_buckets = _numpy_counts if numpy is not None else _python_counts
+    totals, errors, levels, components = count_buckets(batch, start, bucket_us, count)
+    return RateHistogram(
+        start,
+        bucket_us,
+        totals,
+        errors,
+        _by_name(batch.levels, levels),
+        _by_name(batch.components, components),
+    )
+
+
+def _by_name(names: list[str], rows: list[list[int]]) -> dict[str, list[int]]:
+    return {name: counts for name, counts in zip(names, rows) if any(counts)}
+
+
+def _numpy_counts(
+    batch: EventBatch, start: int, bucket_us: int, count: int
+) -> tuple[list[int], list[int], list[list[int]], list[list[int]]]:
+    buckets = (numpy.frombuffer(batch.timestamps, dtype=numpy.int64) - start) // bucket_us
+    totals = numpy.bincount(buckets, minlength=count)
+    is_error_row = numpy.frombuffer(error_mask(batch), dtype=bool)
+    errors = numpy.bincount(buckets[is_error_row], minlength=count)
+
+    def by_code(codes: array[int], code_count: int) -> list[list[int]]:
+        # One bincount over code * count + bucket fills a (code, bucket) matrix.
+        keys = numpy.frombuffer(codes, dtype=f"u{codes.itemsize}").astype(numpy.int64) * count
+        flat = numpy.bincount(keys + buckets, minlength=code_count * count)
+        return flat.reshape(code_count, count).tolist()
+
+    return (
+        totals.tolist(),
+        errors.tolist(),
+        by_code(batch.level_codes, len(batch.levels)),
+        by_code(batch.component_codes, len(batch.components)),
+    )
+
+
+def _python_counts(
+    batch: EventBatch, start: int, bucket_us: int, count: int
+) -> tuple[list[int], list[int], list[list[int]], list[list[int]]]:
+    totals = [0] * count
+    errors = [0] * count
+    levels = [[0] * count for _ in batch.levels]
+    components = [[0] * count for _ in batch.components]
+    rows = zip(batch.timestamps, batch.level_codes, batch.component_codes, error_mask(batch))
+    for timestamp, level, component, error in rows:
+        bucket = (timestamp - start) // bucket_us
+        totals[bucket] += 1
+        levels[level][bucket] += 1
+        components[component][bucket] += 1
+        if error:
+            errors[bucket] += 1
+    return totals, errors, levels, components
+
+
+def detect_bursts(
+    counts: list[int],
+    z_threshold: float = DEFAULT_BURST_Z,
+    min_count: int = DEFAULT_MIN_BURST_ERRORS,
+) -> list[Burst]:
+    """Runs of buckets whose count is ``z_threshold`` deviations above an EWMA baseline.
+
+    The baseline is an exponentially weighted mean and variance of the earlier buckets. It
+    is seeded with the median and median absolute deviation of the first ten buckets, so
+    steady background errors are not a burst while a short spike inside that warm-up, or a
+    jump from silence, still is. The deviation is floored at one event so near-constant
+    baselines do not flag tiny wobbles. A burst freezes the baseline for its first five
+    buckets and feeds it after that, so it runs until a bucket falls back under the
+    threshold or below ``min_count``, or until a lasting shift has become the new baseline.
+    """
+    bursts: list[Burst] = []
+    mean, variance = _warmup_baseline(counts[:_WARMUP_BUCKETS])
+    burst: list[int] | None = None  # [first, last, errors, peak]
+    burst_baseline = burst_z = 0.0
+    for bucket, value in enumerate(counts):
+        z_score = (value - mean) / max(sqrt(variance), 1.0)
+        if value >= min_count and z_score >= z_threshold:
+            if burst is None:
+                burst = [bucket, bucket, value, value]
+                burst_baseline, burst_z = mean, z_score
+            else:
+                burst[1] = bucket
+                burst[2] += value
+                burst[3] = max(burst[3], value)
+            if bucket - burst[0] < _MAX_FROZEN_BUCKETS:
+                continue
+        elif burst is not None:
+            bursts.append(Burst(*burst, burst_baseline, burst_z))
+            burst = None
+        difference = value - mean
+        increment = _EWMA_ALPHA * difference
+        mean += increment
+        variance = (1 - _EWMA_ALPHA) * (variance + difference * increment)
+    if burst is not None:
+        bursts.append(Burst(*burst, burst_baseline, burst_z))
+    return bursts
+
+
+def _warmup_baseline(counts: list[int]) -> tuple[float, float]:
+    """Robust ``(mean, variance)`` seed: the low median and the squared scaled MAD."""
+    if not counts:
+        return 0.0, 0.0
+    center = median_low(counts)
+    spread = _MAD_SCALE * median_low([abs(value - center) for value in counts])
+    return float(center), spread * spread
@@ -1,26 +1,29 @@
 ﻿from __future__ import annotations
 
-from collections import Counter
-
+from .aggregate import IncidentAggregator
+from .batch import EventBatch, from_epoch_us
 from .models import LogEvent
-from .timeline import is_error
+from .timeline import analyze_incident
+
+
+def build_runbook(events: list[LogEvent] | EventBatch, title: str) -> str:
+    return render_runbook(analyze_incident(events).aggregator, title)
 
 
-def build_runbook(events: list[LogEvent], title: str) -> str:
-    ordered = sorted(events, key=lambda event: event.timestamp)
-    t0 = ordered[0].timestamp if ordered else None
-    errors = [event for event in ordered if is_error(event)]
-    component_counts = Counter(event.component for event in errors)
-    top_components = [component for component, _ in component_counts.most_common(3)]
+def render_runbook(aggregator: IncidentAggregator, title: str) -> str:
+    """The runbook for the events ``aggregator`` has seen; it needs no events itself."""
+    t0 = from_epoch_us(aggregator.start_us) if aggregator.start_us is not None else None
+    errors = aggregator.error_count
+    top_components = [component for component, _ in aggregator.top_error_components(3)]
 
     lines: list[str] = [f"# {title}", "", "## Symptoms"]
     if t0:
         lines.append(f"- First observed: `{t0.isoformat()}`")
     if errors:
-        lines.append(f"- Error events: {len(errors)} of {len(events)} total")
+        lines.append(f"- Error events: {errors} of {aggregator.event_count} total")
     if top_components:
         lines.append(f"- Suspected components: {', '.join(top_components)}")
-    if not events:
+    if not aggregator.event_count:
         lines.append("- No events parsed from input.")
 
     lines.extend(
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from re import Match
+from typing import Any
+
+from .utils import cache_hit_stats
+
+DEFAULT_SIGNATURE_CACHE_SIZE = 8192
+
+_DIGIT_RE = re.compile(r"\d+")
+# Correlation IDs and digit runs in one scan. IGNORECASE keeps matching identical to the
+# former two-pass version for the few non-ASCII letters that still case-fold to ASCII.
+_SIGNATURE_RE = re.compile(r"(?P<cid>(?:correlation_id|cid)=[A-Za-z0-9-]+)|\d+", re.IGNORECASE)
+
+
+def _replace_token(match: Match[str]) -> str:
+    return "cid=<id>" if match.lastgroup else "#"
+
+
+def normalize_message(message: str) -> str:
+    """Lower-case ``message``, mask correlation IDs as ``cid=<id>`` and digit runs as ``#``."""
+    text = message.lower().strip()
+    if "=" not in text:
+        # No correlation ID can match, so a plain substitution covers the digits.
+        return _DIGIT_RE.sub("#", text)
+    return _SIGNATURE_RE.sub(_replace_token, text)
+
+
+class SignatureNormalizer:
+    """:func:`normalize_message` with a bounded LRU keyed on the raw message.
+
+    Incidents repeat a small set of messages many times, so most lookups are one
+    dictionary hit instead of a lower-case and regex pass.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_SIGNATURE_CACHE_SIZE) -> None:
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, message: str) -> str:
+        cache = self._cache
+        signature = cache.get(message)
+        if signature is not None:
+            self.cache_hits += 1
+            cache.move_to_end(message)
+            return signature
+
+        self.cache_misses += 1
+        signature = cache[message] = normalize_message(message)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return signature
+
+    def signature(self, key: str) -> str:
+        """Signature text for a key returned by a call; for this normalizer they are equal."""
+        return key
+
+    def cache_stats(self) -> dict[str, Any]:
+        return cache_hit_stats(self.cache_hits, self.cache_misses)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping
+from heapq import heappop, heappush, heapreplace, nsmallest
+
+DEFAULT_SKETCH_CAPACITY = 1024
+
+
+class SpaceSaving:
+    """Approximate heavy-hitter counts in bounded memory (the Space-Saving algorithm).
+
+    At most ``capacity`` items are monitored. An unmonitored item takes the place of the
+    one with the smallest count and inherits that count as its possible overcount, so a
+    reported ``(count, error)`` brackets the true count as ``count - error <= true <=
+    count``, and an item that is not monitored occurred at most :attr:`max_error` times.
+    Any item seen more than ``total / capacity`` times is always monitored. Until the first
+    eviction, counts are exact.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_SKETCH_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.evictions = 0
+        # item -> [count, error]
+        self._counts: dict[Hashable, list[int]] = {}
+        # One (count, item) entry per monitored item. Counts only grow, so an entry may lag
+        # behind its item; stale entries are refreshed when they reach the top.
+        self._heap: list[tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, item: Hashable, count: int = 1) -> Hashable | None:
+        """Count ``item``; returns the item it evicted to make room, if any."""
+        self.total += count
+        entry = self._counts.get(item)
+        if entry is not None:
+            entry[0] += count
+            return None
+        error = 0
+        evicted = None
+        if len(self._counts) >= self.capacity:
+            self._refresh_min()
+            error, evicted = heappop(self._heap)
+            del self._counts[evicted]
+            self.evictions += 1
+        self._counts[item] = [error + count, error]
+        heappush(self._heap, (error + count, item))
+        return evicted
+
+    def estimate(self, item: Hashable) -> tuple[int, int]:
+        """``(count, error)`` for a monitored ``item``; ``(0, 0)`` if it is not monitored."""
+        count, error = self._counts.get(item, (0, 0))
+        return count, error
+
+    def update(self, items: Iterable[str] | Mapping[str, int]) -> None:
+        """Count ``items`` like ``Counter.update``: an iterable of items or item -> count."""
+        if isinstance(items, Mapping):
+            for item, count in items.items():
+                self.add(item, count)
+        else:
+            for item in items:
+                self.add(item)
+
+    @property
+    def max_error(self) -> int:
+        """Upper bound on the true count of any item that is not monitored."""
+        if not self.evictions:
+            return 0
+        self._refresh_min()
+        return self._heap[0][0]
+
+    def top(self, limit: int) -> list[tuple[str, int, int]]:
+        """``(item, count, error)`` for the ``limit`` largest counts.
+
+        Ties go to the smaller error (the larger guaranteed count), then to the item.
+        """
+        ranked = nsmallest(
+            limit, self._counts.items(), key=lambda item: (-item[1][0], item[1][1], item[0])
+        )
+        return [(item, count, error) for item, (count, error) in ranked]
+
+    def _refresh_min(self) -> None:
+        # Re-push stale entries until the top of the heap holds a current count.
+        heap = self._heap
+        counts = self._counts
+        while True:
+            count, item = heap[0]
+            current = counts[item][0]
+            if current == count:
+                return
+            heapreplace(heap, (current, item))
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .signatures import DEFAULT_SIGNATURE_CACHE_SIZE
+from .utils import cache_dir, cache_hit_stats, write_atomically
+
+WILDCARD = "<*>"
+DEFAULT_TREE_DEPTH = 4
+DEFAULT_SIMILARITY = 0.5
+DEFAULT_MAX_CHILDREN = 100
+DEFAULT_MAX_CLUSTERS = 10_000
+
+_STATE_VERSION = 1
+_STATE_FILE = "drain-templates.json"
+
+# Variable parts masked before tokenizing, most specific first.
+_MASKS = [
+    (re.compile(r"\b(correlation_id|cid)=\S+"), r"\1=" + WILDCARD),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), WILDCARD),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), WILDCARD),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b(?=[a-f]*\d)[0-9a-f]{8,}\b"), WILDCARD),
+    (re.compile(r"(?:/[\w.@%+-]+){2,}/?"), WILDCARD),
+    (re.compile(r"\b\d+(?:\.\d+)?(?:ns|us|µs|ms|s|m|h)\b"), WILDCARD),
+    (re.compile(r"\d+(?:\.\d+)?"), WILDCARD),
+]
+
+
+def template_state_path() -> Path:
+    return cache_dir() / _STATE_FILE
+
+
+def mask_message(message: str) -> list[str]:
+    """Lower-case ``message``, mask IDs, addresses, paths, durations and numbers, and split it."""
+    text = message.lower()
+    for pattern, replacement in _MASKS:
+        text = pattern.sub(replacement, text)
+    return text.split()
+
+
+class _Cluster:
+    __slots__ = ("cluster_id", "tokens", "size", "path", "last_used")
+
+    def __init__(self, cluster_id: int, tokens: list[str], size: int, path: list[str]) -> None:
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.size = size
+        self.path = path
+        self.last_used = cluster_id
+
+
+class TemplateMiner:
+    """Online log template mining with a fixed-depth parse tree, in the style of Drain.
+
+    Masked messages are routed by token count and their first ``depth - 2`` tokens to a
+    leaf holding a few clusters. The message joins the most similar cluster there (the
+    template's differing positions become ``<*>``) or starts a new one, so each event costs
+    a constant number of dictionary steps plus a scan of one small leaf. Calling the miner
+    returns a cluster id; :meth:`signature` gives the cluster's current template. Raw
+    messages are memoized in a bounded LRU, and :meth:`to_dict` / :meth:`from_dict` let
+    later runs start from the templates already learned; only the ``max_clusters`` most
+    recently used clusters are kept, so the saved state stays bounded across incidents.
+    A tree node has at most ``max_children`` children, the ``<*>`` child included.
+    """
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_TREE_DEPTH,
+        similarity: float = DEFAULT_SIMILARITY,
+        max_children: int = DEFAULT_MAX_CHILDREN,
+        cache_size: int = DEFAULT_SIGNATURE_CACHE_SIZE,
+        max_clusters: int = DEFAULT_MAX_CLUSTERS,
+    ) -> None:
+        if depth < 3:
+            raise ValueError("depth must be at least 3")
+        if max_children < 1 or max_clusters < 1:
+            raise ValueError("max_children and max_clusters must be at least 1")
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self._root: dict[str, Any] = {}
+        self._clusters: list[_Cluster] = []
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Bumped on every use; clusters with the oldest stamps are dropped on save.
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def __call__(self, message: str) -> int:
+        cache = self._cache
+        cluster_id = cache.get(message)
+        if cluster_id is not None:
+            self.cache_hits += 1
+            cache.move_to_end(message)
+            self._touch(self._clusters[cluster_id])
+            return cluster_id
+
+        self.cache_misses += 1
+        cluster_id = cache[message] = self.add(message)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return cluster_id
+
+    def add(self, message: str) -> int:
+        """Cluster ``message`` without the LRU and return its cluster id."""
+        tokens = mask_message(message)
+        path = self._route(tokens)
+        leaf = self._leaf(path)
+        cluster = self._best_match(leaf, tokens)
+        if cluster is None:
+            cluster = _Cluster(len(self._clusters), tokens, 0, path)
+            self._clusters.append(cluster)
+            leaf.append(cluster.cluster_id)
+        else:
+            cluster.tokens = [
+                known if known == token else WILDCARD
+                for known, token in zip(cluster.tokens, tokens)
+            ]
+        cluster.size += 1
+        self._touch(cluster)
+        return cluster.cluster_id
+
+    def signature(self, cluster_id: int) -> str:
+        return " ".join(self._clusters[cluster_id].tokens)
+
+    def cache_stats(self) -> dict[str, Any]:
+        return cache_hit_stats(self.cache_hits, self.cache_misses)
+
+    def _touch(self, cluster: _Cluster) -> None:
+        self._clock += 1
+        cluster.last_used = self._clock
+
+    def _route(self, tokens: list[str]) -> list[str]:
+        path = [str(len(tokens))]
+        node = self._root.get(path[0], {})
+        for token in tokens[: self.depth - 2]:
+            # A new literal child must leave room for the <*> child.
+            if token not in node and (
+                _is_variable(token) or len(node) + (WILDCARD not in node) >= self.max_children
+            ):
+                token = WILDCARD
+            path.append(token)
+            node = node.get(token, {})
+        return path
+
+    def _leaf(self, path: list[str]) -> list[int]:
+        node = self._root
+        for token in path[:-1]:
+            node = node.setdefault(token, {})
+        return node.setdefault(path[-1], [])
+
+    def _best_match(self, leaf: list[int], tokens: list[str]) -> _Cluster | None:
+        best: _Cluster | None = None
+        best_score = (-1.0, -1)
+        for cluster_id in leaf:
+            cluster = self._clusters[cluster_id]
+            same = sum(known == token for known, token in zip(cluster.tokens, tokens))
+            similarity = same / len(tokens) if tokens else 1.0
+            score = (similarity, cluster.tokens.count(WILDCARD))
+            if score > best_score:
+                best, best_score = cluster, score
+        if best is None or best_score[0] < self.similarity:
+            return None
+        return best
+
+    def to_dict(self) -> dict[str, Any]:
+        """The ``max_clusters`` most recently used clusters, least recent first."""
+        recent = sorted(self._clusters, key=lambda cluster: cluster.last_used)
+        return {
+            "version": _STATE_VERSION,
+            "depth": self.depth,
+            "similarity": self.similarity,
+            "max_children": self.max_children,
+            "clusters": [
+                {"path": cluster.path, "tokens": cluster.tokens, "size": cluster.size}
+                for cluster in recent[-self.max_clusters :]
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> TemplateMiner:
+        """Rebuild a miner from :meth:`to_dict` output; raises ``ValueError`` if malformed."""
+        if state.get("version") != _STATE_VERSION:
+            raise ValueError(f"unsupported template state version: {state.get('version')}")
+        try:
+            miner = cls(state["depth"], state["similarity"], state["max_children"])
+            for entry in state["clusters"]:
+                cluster = _Cluster(
+                    len(miner._clusters),
+                    list(entry["tokens"]),
+                    int(entry["size"]),
+                    list(entry["path"]),
+                )
+                miner._clusters.append(cluster)
+                miner._leaf(cluster.path).append(cluster.cluster_id)
+            miner._clock = len(miner._clusters)
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"malformed template state: {exc}") from exc
+        return miner
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> TemplateMiner:
+        """Load learned templates, or start empty if there are none or they are unreadable."""
+        try:
+            return cls.from_dict(json.loads((path or template_state_path()).read_text("utf-8")))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path: Path | None = None) -> None:
+        """Persist the learned templates; failures are ignored like other cache writes."""
+        target = path or template_state_path()
+        encoded = json.dumps(self.to_dict()).encode("utf-8")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(target, lambda handle: handle.write(encoded))
+        except OSError:
+            pass
+
+
+def _is_variable(token: str) -> bool:
+    return token == WILDCARD or any(character.isdigit() for character in token)
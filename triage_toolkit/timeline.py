@@ -1,81 +1,307 @@
 ﻿from __future__ import annotations
 
-from collections import Counter, defaultdict
-import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
 
+from .aggregate import IncidentAggregator, SignatureEngine, error_mask, is_error
+from .batch import EventBatch, from_epoch_us, to_epoch_us
+from .filters import LEVEL_RANKS
 from .models import LogEvent
+from .rates import DEFAULT_BUCKET_US, RateHistogram, detect_bursts, rate_histogram
 
-_ERROR_LEVELS = {"ERROR", "CRITICAL", "FATAL"}
-_DIGIT_RE = re.compile(r"\d+")
-_CORR_RE = re.compile(r"(?:correlation_id|cid)=[A-Za-z0-9-]+", re.IGNORECASE)
+__all__ = [
+    "IncidentAnalysis",
+    "TimelineAccumulator",
+    "TimelineWriter",
+    "analyze_incident",
+    "as_batch",
+    "build_timeline",
+    "error_mask",
+    "is_error",
+    "render_rate_timeline",
+    "render_timeline",
+]
 
+_EMPTY_TIMELINE = (
+    "# Incident Timeline\n\nT0: `n/a`\n\n## Events\n\n_No events parsed._\n\n"
+    "## Notable Errors\n\n- None detected in parsed input.\n\n"
+    "## Suspected Components\n\n- No components inferred.\n"
+)
+_RATE_COMPONENT_COLUMNS = 5
+_LISTED_BURSTS = 10
+_EVENTS_HEADER = [
+    "## Events",
+    "",
+    "| Time (UTC) | Level | Component | Message |",
+    "| --- | --- | --- | --- |",
+]
 
-def is_error(event: LogEvent) -> bool:
-    if event.level.upper() in _ERROR_LEVELS:
-        return True
-    return "error" in event.message.lower()
 
+def _escape_markdown(text: str) -> str:
+    return text.replace("|", "\\|")
 
-def _normalize_message(message: str) -> str:
-    text = message.lower().strip()
-    text = _CORR_RE.sub("cid=<id>", text)
-    text = _DIGIT_RE.sub("#", text)
-    return text
 
+def _event_row(timestamp: str, level: str, component: str, message: str) -> str:
+    text = _escape_markdown(message.replace("\n", " "))
+    return f"| {timestamp} | {level} | {component} | {text} |"
 
-def _escape_markdown(text: str) -> str:
-    return text.replace("|", "\\|")
 
+def as_batch(events: list[LogEvent] | EventBatch) -> EventBatch:
+    return events if isinstance(events, EventBatch) else EventBatch.from_events(events)
 
-def build_timeline(events: list[LogEvent]) -> str:
-    if not events:
-        return """# Incident Timeline\n\nT0: `n/a`\n\n## Events\n\n_No events parsed._\n\n## Notable Errors\n\n- None detected in parsed input.\n\n## Suspected Components\n\n- No components inferred.\n"""
 
-    ordered = sorted(events, key=lambda event: event.timestamp)
-    t0 = ordered[0].timestamp
+@dataclass
+class IncidentAnalysis:
+    """What the timeline and runbook renderers need, computed once per batch.
+
+    ``order`` lists batch rows in timeline order; ``aggregator`` holds the error
+    signature groups, component counters and summary statistics.
+    """
+
+    batch: EventBatch
+    order: list[int]
+    aggregator: IncidentAggregator
+
+
+def analyze_incident(
+    events: list[LogEvent] | EventBatch,
+    signatures: SignatureEngine | None = None,
+    approx_capacity: int | None = None,
+) -> IncidentAnalysis:
+    """Sort once and aggregate the incident statistics in one pass."""
+    batch = as_batch(events)
+    aggregator = IncidentAggregator(signatures, approx_capacity)
+    aggregator.add_batch(batch)
+    return IncidentAnalysis(batch, batch.sorted_indices(), aggregator)
+
+
+def build_timeline(
+    events: list[LogEvent] | EventBatch,
+    signatures: SignatureEngine | None = None,
+    approx_capacity: int | None = None,
+) -> str:
+    return render_timeline(analyze_incident(events, signatures, approx_capacity))
 
-    lines: list[str] = [
-        "# Incident Timeline",
-        "",
-        f"T0: `{t0.isoformat()}`",
-        "",
-        "## Events",
-        "",
-        "| Time (UTC) | Level | Component | Message |",
-        "| --- | --- | --- | --- |",
-    ]
 
-    for event in ordered:
+def render_timeline(analysis: IncidentAnalysis) -> str:
+    batch = analysis.batch
+    order = analysis.order
+    if not order:
+        return _EMPTY_TIMELINE
+
+    lines = _timeline_header(batch.timestamps[order[0]])
+    for row in order:
         lines.append(
-            "| {} | {} | {} | {} |".format(
-                event.timestamp.isoformat(),
-                event.level,
-                event.component,
-                _escape_markdown(event.message.replace("\n", " ")),
+            _event_row(
+                batch.timestamp(row).isoformat(),
+                batch.level(row),
+                batch.component(row),
+                batch.message(row),
             )
         )
+    return _finish_timeline(lines, analysis.aggregator)
+
+
+def render_rate_timeline(analysis: IncidentAnalysis, bucket_us: int = DEFAULT_BUCKET_US) -> str:
+    """The timeline with per-bucket rate tables in place of the event table.
+
+    Its size depends on the number of buckets, levels and components, not on the number of
+    events. An ``Incident Onset`` section names the first error burst found by
+    :func:`~triage_toolkit.rates.detect_bursts` as the probable incident start.
+    """
+    if not analysis.order:
+        return _EMPTY_TIMELINE
+    histogram = rate_histogram(analysis.batch, bucket_us)
+    lines = _timeline_title(analysis.batch.timestamps[analysis.order[0]])
+    lines.extend(_onset_section(histogram))
+    lines.extend(["", *_rate_table("Event Rates", histogram, _level_columns(histogram))])
+    lines.extend(["", *_rate_table("Component Rates", histogram, _component_columns(histogram))])
+    return _finish_timeline(lines, analysis.aggregator)
+
+
+def _bucket_time(histogram: RateHistogram, bucket: int) -> str:
+    return from_epoch_us(histogram.bucket_start_us(bucket)).isoformat()
+
+
+def _onset_section(histogram: RateHistogram) -> list[str]:
+    lines = ["## Incident Onset", ""]
+    bursts = detect_bursts(histogram.errors)
+    if not bursts:
+        return [*lines, "- No error burst detected."]
+    onset = bursts[0]
+    lines.append(
+        f"Probable start: `{_bucket_time(histogram, onset.first)}` ({onset.peak_errors} errors "
+        f"at peak vs. a baseline of {onset.baseline:.1f} per bucket, z={onset.z_score:.1f})"
+    )
+    lines.extend(["", "Error bursts:"])
+    for burst in bursts[:_LISTED_BURSTS]:
+        lines.append(
+            f"- {_bucket_time(histogram, burst.first)} to "
+            f"{_bucket_time(histogram, burst.last + 1)} (errors: {burst.errors}, "
+            f"peak per bucket: {burst.peak_errors})"
+        )
+    if len(bursts) > _LISTED_BURSTS:
+        lines.append(f"- ... {len(bursts) - _LISTED_BURSTS} more")
+    return lines
+
+
+def _level_columns(histogram: RateHistogram) -> list[tuple[str, list[int]]]:
+    default_rank = LEVEL_RANKS["INFO"]
+    levels = sorted(
+        histogram.levels.items(),
+        key=lambda item: (-LEVEL_RANKS.get(item[0], default_rank), item[0]),
+    )
+    return [("Events", histogram.totals), ("Errors", histogram.errors), *levels]
+
+
+def _component_columns(histogram: RateHistogram) -> list[tuple[str, list[int]]]:
+    ranked = sorted(histogram.components.items(), key=lambda item: (-sum(item[1]), item[0]))
+    columns = ranked[:_RATE_COMPONENT_COLUMNS]
+    if len(ranked) > _RATE_COMPONENT_COLUMNS:
+        other = [sum(counts) for counts in zip(*(counts for _, counts in ranked[len(columns) :]))]
+        columns.append(("(other)", other))
+    return columns
 
-    errors = [event for event in ordered if is_error(event)]
+
+def _rate_table(
+    title: str, histogram: RateHistogram, columns: list[tuple[str, list[int]]]
+) -> list[str]:
+    names = [_escape_markdown(name) for name, _ in columns]
+    lines = [
+        f"## {title}",
+        "",
+        f"Bucket width: {histogram.bucket_us / 1_000_000:g}s",
+        "",
+        "| Bucket (UTC) | " + " | ".join(names) + " |",
+        "| --- |" + " ---: |" * len(names),
+    ]
+    for bucket, counts in enumerate(zip(*(counts for _, counts in columns))):
+        cells = " | ".join(map(str, counts))
+        lines.append(f"| {_bucket_time(histogram, bucket)} | {cells} |")
+    return lines
+
+
+def _timeline_title(t0_us: int) -> list[str]:
+    return ["# Incident Timeline", "", f"T0: `{from_epoch_us(t0_us).isoformat()}`", ""]
+
+
+def _timeline_header(t0_us: int) -> list[str]:
+    return [*_timeline_title(t0_us), *_EVENTS_HEADER]
+
+
+def _finish_timeline(lines: list[str], aggregator: IncidentAggregator) -> str:
     lines.extend(["", "## Notable Errors"])
-    if not errors:
+    sketch = aggregator.signature_counts
+    if sketch is not None and sketch.evictions:
+        lines.append(
+            f"- Approximate (Space-Saving, capacity {sketch.capacity}): counts may overstate "
+            f"by up to {sketch.max_error}, and first/last cover the events since a group was "
+            "last tracked."
+        )
+    signatures = aggregator.error_signatures()
+    if not signatures:
         lines.append("- None detected in parsed input.")
-    else:
-        grouped: dict[str, list[LogEvent]] = defaultdict(list)
-        for event in errors:
-            grouped[_normalize_message(event.message)].append(event)
-        for signature, items in sorted(grouped.items(), key=lambda item: len(item[1]), reverse=True):
-            first_seen = min(items, key=lambda event: event.timestamp).timestamp
-            last_seen = max(items, key=lambda event: event.timestamp).timestamp
-            lines.append(
-                f"- {signature} (count: {len(items)}, first: {first_seen.isoformat()}, last: {last_seen.isoformat()})"
-            )
+    for signature, count, first_us, last_us in signatures:
+        first = from_epoch_us(first_us).isoformat()
+        last = from_epoch_us(last_us).isoformat()
+        lines.append(f"- {signature} (count: {count}, first: {first}, last: {last})")
 
     lines.extend(["", "## Suspected Components"])
-    if not errors:
+    components = aggregator.top_error_components(5)
+    if not components:
         lines.append("- No components inferred.")
-    else:
-        counts = Counter(event.component for event in errors)
-        for component, count in counts.most_common(5):
-            lines.append(f"- {component} (errors: {count})")
+    for component, count in components:
+        lines.append(f"- {component} (errors: {count})")
 
     return "\n".join(lines) + "\n"
+
+
+class TimelineAccumulator:
+    """Keep :func:`build_timeline` output current while events arrive in any order.
+
+    Events are keyed by ``(timestamp, source_index, event_index)``, the order the CLI merge
+    produces, so :meth:`render` equals ``build_timeline`` over the merged events. Adding an
+    event renders its table row once and feeds :attr:`aggregator`; nothing already added
+    is revisited.
+    """
+
+    def __init__(
+        self, signatures: SignatureEngine | None = None, approx_capacity: int | None = None
+    ) -> None:
+        self.aggregator = IncidentAggregator(signatures, approx_capacity)
+        self._keys: list[tuple[int, int, int]] = []
+        self._rows: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, event: LogEvent, source_index: int = 0, event_index: int = 0) -> None:
+        key = (to_epoch_us(event.timestamp), source_index, event_index)
+        row = _event_row(event.timestamp.isoformat(), event.level, event.component, event.message)
+        if not self._keys or key > self._keys[-1]:
+            self._keys.append(key)
+            self._rows.append(row)
+        else:
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._rows.insert(position, row)
+        self.aggregator.add(event, source_index, event_index)
+
+    def render(self) -> str:
+        if not self._keys:
+            return _EMPTY_TIMELINE
+        lines = _timeline_header(self._keys[0][0])
+        lines.extend(self._rows)
+        return _finish_timeline(lines, self.aggregator)
+
+
+class TimelineWriter:
+    """Write the :func:`build_timeline` document for events that arrive in timeline order.
+
+    Each table row is written as its event passes and :attr:`aggregator` adds the events a
+    chunk at a time (see :meth:`IncidentAggregator.add_stream`), so memory does not grow
+    with the number of events. The bytes equal ``build_timeline`` over the same events.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        signatures: SignatureEngine | None = None,
+        approx_capacity: int | None = None,
+    ) -> None:
+        self._stream = stream
+        self._signatures = signatures
+        self._approx_capacity = approx_capacity
+        self._started = False
+        self.aggregator = IncidentAggregator(signatures, approx_capacity)
+
+    def passing(self, events: Iterable[LogEvent]) -> Iterator[LogEvent]:
+        """Yield ``events`` while writing their timeline; calling again rewinds and starts over.
+
+        The closing sections are written once the returned iterator is exhausted.
+        """
+        stream = self._stream
+        # Only rewind a stream already written to: a fresh one may be stdout.
+        if self._started:
+            stream.seek(0)
+            stream.truncate()
+        self._started = True
+        self.aggregator = aggregator = IncidentAggregator(self._signatures, self._approx_capacity)
+        empty = True
+        for event in aggregator.add_stream(events):
+            if empty:
+                stream.write("\n".join(_timeline_header(to_epoch_us(event.timestamp))) + "\n")
+                empty = False
+            row = _event_row(
+                event.timestamp.isoformat(), event.level, event.component, event.message
+            )
+            stream.write(row + "\n")
+            yield event
+        stream.write(_EMPTY_TIMELINE if empty else _finish_timeline([], aggregator))
+
+    def write_events(self, events: Iterable[LogEvent]) -> int:
+        """Write the whole timeline of ``events`` and return how many there were."""
+        for _ in self.passing(events):
+            pass
+        return self.aggregator.event_count
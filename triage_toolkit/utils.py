@@ -1,10 +1,18 @@
 ﻿from __future__ import annotations
 
+from collections import OrderedDict
 from datetime import datetime, timezone
+import hashlib
+import os
+from pathlib import Path
 import re
+from typing import Any, BinaryIO, Callable
 
 _CORR_RE = re.compile(r"(?:correlation_id|cid)=([A-Za-z0-9-]+)")
 
+DEFAULT_TIMESTAMP_CACHE_SIZE = 4096
+CACHE_DIR_ENV = "TRIAGE_CACHE_DIR"
+
 _TS_FORMATS = [
     "%Y-%m-%dT%H:%M:%SZ",
     "%Y-%m-%dT%H:%M:%S.%fZ",
@@ -43,8 +51,164 @@ def parse_timestamp(value: str) -> datetime | None:
     return _normalize_utc(dt)
 
 
+def _is_fixed_width_iso(value: str) -> bool:
+    """Check the ``YYYY-MM-DD[T ]HH:MM:SS[.fff|.ffffff][Z|+HH:MM|-HH:MM]`` shape by slicing."""
+    if len(value) < 19 or not value.isascii():
+        return False
+    if (
+        value[4] != "-"
+        or value[7] != "-"
+        or value[10] not in "T "
+        or value[13] != ":"
+        or value[16] != ":"
+    ):
+        return False
+    digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+    if not digits.isdigit():
+        return False
+
+    tail = value[19:]
+    if tail[:1] == ".":
+        rest = tail[1:].lstrip("0123456789")
+        if len(tail) - 1 - len(rest) not in (3, 6):
+            return False
+        tail = rest
+    if tail in ("", "Z"):
+        return True
+    return (
+        len(tail) == 6
+        and tail[0] in "+-"
+        and tail[3] == ":"
+        and (tail[1:3] + tail[4:6]).isdigit()
+    )
+
+
+def _parse_isoformat(value: str) -> datetime | None:
+    # Whenever fromisoformat accepts a value, the full cascade returns the same instant, so
+    # the C parser is a safe fast path once a source is known to use ISO-8601.
+    try:
+        return _normalize_utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _strptime_parser(fmt: str) -> Callable[[str], datetime | None]:
+    def _parse(value: str) -> datetime | None:
+        try:
+            return _normalize_utc(datetime.strptime(value, fmt))
+        except ValueError:
+            return None
+
+    return _parse
+
+
+def _sniff_timestamp_parser(value: str) -> Callable[[str], datetime | None]:
+    if _is_fixed_width_iso(value) and _parse_isoformat(value) is not None:
+        return _parse_isoformat
+    for fmt in _TS_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return _strptime_parser(fmt)
+    return parse_timestamp
+
+
+class TimestampParser:
+    """Per-source timestamp parser that remembers the format its first timestamp used.
+
+    The sniffed parser is tried first on every later value; only when it misses does the
+    full :func:`parse_timestamp` cascade run, so results are always identical to it.
+
+    Second-resolution values are memoized in a bounded LRU keyed on the raw string, so the
+    many lines a busy service logs within the same second share one UTC conversion.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_TIMESTAMP_CACHE_SIZE) -> None:
+        self._parser: Callable[[str], datetime | None] | None = None
+        self._cache: OrderedDict[str, datetime | None] = OrderedDict()
+        self._cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, value: str) -> datetime | None:
+        value = value.strip()
+        if not value:
+            return None
+
+        if value[19:20] == ".":
+            # Sub-second values almost never repeat; caching them only churns the LRU.
+            return self._parse(value)
+
+        cache = self._cache
+        if value in cache:
+            self.cache_hits += 1
+            cache.move_to_end(value)
+            return cache[value]
+
+        self.cache_misses += 1
+        parsed = self._parse(value)
+        cache[value] = parsed
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return parsed
+
+    def _parse(self, value: str) -> datetime | None:
+        if self._parser is None:
+            self._parser = _sniff_timestamp_parser(value)
+        parsed = self._parser(value)
+        if parsed is None and self._parser is not parse_timestamp:
+            parsed = parse_timestamp(value)
+        return parsed
+
+    def cache_stats(self) -> dict[str, Any]:
+        return cache_hit_stats(self.cache_hits, self.cache_misses)
+
+
+def cache_hit_stats(hits: int, misses: int) -> dict[str, Any]:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 6) if lookups else 0.0,
+    }
+
+
 def extract_correlation_id(message: str) -> str | None:
     match = _CORR_RE.search(message or "")
     if not match:
         return None
     return match.group(1)
+
+
+def cache_dir() -> Path:
+    """Directory for persisted parse state: ``$TRIAGE_CACHE_DIR`` or the user cache dir."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "incident-triage-toolkit"
+
+
+def sampled_digests(handle: BinaryIO, end: int, sample_bytes: int = 4096) -> list[str]:
+    """Digests of the first and last ``sample_bytes`` before ``end``.
+
+    A cheap fingerprint that, together with size and mtime, catches files rewritten in
+    place without reading them in full.
+    """
+    digests = []
+    for start in (0, max(0, end - sample_bytes)):
+        handle.seek(start)
+        digests.append(hashlib.sha256(handle.read(min(end, sample_bytes))).hexdigest())
+    return digests
+
+
+def write_atomically(target: Path, write: Callable[[BinaryIO], Any]) -> None:
+    """Write ``target`` through a sibling staging file that is renamed into place."""
+    staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        with staging.open("wb") as handle:
+            write(handle)
+        os.replace(staging, target)
+    finally:
+        staging.unlink(missing_ok=True)